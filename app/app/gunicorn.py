@@ -0,0 +1,75 @@
+"""
+Gunicorn configuration, used with 'gunicorn -c app/gunicorn.py app.wsgi'.
+Every setting can be overridden with the GUNICORN_* environment variables.
+"""
+import multiprocessing
+import os
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+cores = multiprocessing.cpu_count()
+
+# Threaded workers: a request waiting on Postgres, Stripe, SendGrid or a
+# live results long-poll blocks only its own thread. Threads outlive their
+# requests, so each keeps its database connection for CONN_MAX_AGE and
+# later requests reuse it. Set GUNICORN_WORKER_CLASS=gevent for greenlets,
+# which cannot reuse connections without a pooler; see below.
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread')
+if worker_class == 'gevent':
+    # Greenlets give the concurrency, so one worker per core is enough.
+    default_workers = cores + 1
+else:
+    default_workers = cores * 2 + 1
+workers = int(os.environ.get('GUNICORN_WORKERS', default_workers))
+# Postgres connections this service may open, out of max_connections (100
+# by default) less what the other services and admin sessions need.
+db_connections = int(os.environ.get('DB_MAX_CONNECTIONS', 80))
+# Every thread may hold a persistent connection, so by default the threads
+# of all workers fit within DB_MAX_CONNECTIONS.
+threads = int(os.environ.get(
+    'GUNICORN_THREADS', min(max(db_connections // workers, 1), 4)
+))
+# Concurrent requests per gevent worker. Under gevent every request may
+# hold its own Postgres connection, so by default the workers share out
+# DB_MAX_CONNECTIONS between them. GUNICORN_WORKER_CONNECTIONS wins when
+# set; raise it only with a pooler such as pgbouncer in front of Postgres.
+worker_connections = int(os.environ.get(
+    'GUNICORN_WORKER_CONNECTIONS', max(db_connections // workers, 1)
+))
+
+# Import the app once in the master so workers fork with it loaded.
+preload_app = True
+# Recycle workers now and then so slow leaks can't build up. The jitter
+# keeps them from all restarting at once.
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 2000))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', 200))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', 30))
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', 5))
+
+if worker_class == 'gevent':
+    # The app is preloaded, so patch before it is imported rather than
+    # when each worker starts.
+    from gevent import monkey
+    monkey.patch_all()
+    from psycogreen.gevent import patch_psycopg
+    patch_psycopg()
+    # Each request runs in its own greenlet, and Django keeps connections
+    # per greenlet, so a persistent connection would never be reused and
+    # would stay open after its greenlet has gone. Under gevent this wins
+    # over the 60 second default in settings, but not over DB_CONN_MAX_AGE
+    # set in the environment; reuse connections through pgbouncer instead,
+    # or use the default gthread workers.
+    os.environ.setdefault('DB_CONN_MAX_AGE', '0')
+
+
+def post_worker_init(worker):
+    """Warm each worker up before it accepts requests; see /readyz."""
+    from django.db import DatabaseError
+    from core.health import warm_up
+    try:
+        info = warm_up()
+    except DatabaseError as e:
+        # /readyz retries, and reports 503 until it succeeds.
+        worker.log.warning('Worker warm up failed: %s', e)
+    else:
+        worker.log.info('Worker warmed up in %ss', info['seconds'])
@@ -8,6 +8,7 @@ https://docs.djangoproject.com/en/2.2/ref/settings/
 """
 
 import os
+import tempfile
 
 from .keys import SECRET_KEY
 
@@ -44,6 +45,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'django_filters',
     'rest_framework',
     'rest_framework.authtoken',
@@ -69,7 +71,8 @@ MIDDLEWARE = [
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
-    'django.middleware.clickjacking.XFrameOptionsMiddleware'
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'core.routers.ReplicaMiddleware',
 ]
 
 REST_FRAMEWORK = {
@@ -114,6 +117,48 @@ else:
             'NAME': os.environ.get('DB_NAME'),
             'USER': os.environ.get('DB_USER'),
             'PASSWORD': os.environ.get('DB_PASS'),
+            # Seconds a connection is kept for reuse by later requests.
+            # Gunicorn's opt-in gevent workers default it to 0; see
+            # gunicorn.py.
+            'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', 60)),
+        }
+    }
+
+# Read replica for public read views (see core.routers). In development,
+# point DB_REPLICA_NAME at a copy of db.sqlite3 to try it out.
+if os.environ.get('DEV_ENV') and os.environ.get('DB_REPLICA_NAME'):
+    DATABASES['replica'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.path.join(BASE_DIR, os.environ.get('DB_REPLICA_NAME')),
+        'TEST': {'MIRROR': 'default'},
+    }
+elif not os.environ.get('DEV_ENV') and os.environ.get('DB_REPLICA_HOST'):
+    DATABASES['replica'] = dict(
+        DATABASES['default'],
+        HOST=os.environ.get('DB_REPLICA_HOST'),
+        TEST={'MIRROR': 'default'},
+    )
+DATABASE_ROUTERS = ['core.routers.ReplicaRouter']
+# Seconds a client reads from the primary after writing.
+REPLICA_PIN_DURATION = 10
+# Seconds the replica may fall behind before reads go to the primary.
+REPLICA_MAX_LAG = 5
+# Seconds between replica lag checks.
+REPLICA_LAG_CHECK_INTERVAL = 5
+
+# Cache
+# https://docs.djangoproject.com/en/2.2/topics/cache/
+if os.environ.get('DEV_ENV'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.memcached.MemcachedCache',
+            'LOCATION': os.environ.get('CACHE_LOCATION', 'cache:11211'),
         }
     }
 
@@ -167,6 +212,35 @@ MEDIA_URL = '/media/'
 STATIC_ROOT = '../static'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# Internal nginx location that media is handed to after Django has
+# authorized it (see core.views.serve_media). Empty to stream files from
+# Django instead, as in development.
+MEDIA_ACCEL_REDIRECT = os.environ.get(
+    'MEDIA_ACCEL_REDIRECT', '' if os.environ.get('DEV_ENV') else
+    '/protected-media/'
+)
+# Seconds a signed link to a private file stays valid.
+MEDIA_SIGNATURE_MAX_AGE = 60 * 60 * 24
+# Emailed ticket links have to last until the event.
+TICKET_LINK_MAX_AGE = 60 * 60 * 24 * 365
+
+# Public address of the API, for links sent by email.
+API_URL = os.environ.get('API_URL', 'https://api.liveleague.co.uk')
+
+# Hash uploads as they arrive, for ContentAddressedStorage.
+FILE_UPLOAD_HANDLERS = [
+    'core.storage.HashingMemoryFileUploadHandler',
+    'core.storage.HashingTemporaryFileUploadHandler',
+]
+# Seconds a stored image is kept after an upload reused it, even when no
+# row refers to it yet. The sweep_media command deletes it after that.
+MEDIA_RELEASE_GRACE = 60 * 60
+
+# Written by the build_schema command at release time.
+OPENAPI_SCHEMA_DIR = os.environ.get(
+    'OPENAPI_SCHEMA_DIR', os.path.join(STATIC_ROOT, 'schema')
+)
+
 '''
 STATICFILES_DIRS = (
     os.path.join(BASE_DIR, 'static'),
@@ -179,3 +253,35 @@ AUTH_USER_MODEL = 'core.User'
 # Stripe
 STRIPE_SECRET_KEY = 'sk_test_0fUt8V7Fw8sbW7mgBkt5e3Gl'
 STRIPE_PUBLISHABLE_KEY = 'pk_test_4QJqyITTSyRkqahvU1EQ3idM'
+
+# Authentication
+# Seconds a token's user is cached for between requests.
+AUTH_CACHE_TIMEOUT = 60
+
+# Ticket queue
+# Seconds an admitted queue token may be used to reserve tickets.
+QUEUE_ADMISSION_WINDOW = 600
+
+# Days ahead that the events of a recurring series are created.
+EVENT_SERIES_HORIZON = 90
+
+# Door lists
+# Seconds of overlap when serving door list changes since a version.
+DOOR_LIST_OVERLAP = 5
+
+# Live results
+# Seconds between cache checks while a watcher waits for new results.
+LIVE_RESULTS_POLL_INTERVAL = 0.5
+# Longest a long-poll request waits before answering unchanged.
+LIVE_RESULTS_MAX_WAIT = 25
+# Seconds an event stream stays open before the client reconnects.
+LIVE_RESULTS_STREAM_DURATION = 300
+
+# Typeahead
+# Snapshot file of the suggestion index, shared by every worker on the host.
+SUGGEST_INDEX_PATH = os.environ.get(
+    'SUGGEST_INDEX_PATH', os.path.join(tempfile.gettempdir(), 'suggest.idx')
+)
+# Changes appended to the index before a request merges them into the
+# snapshot.
+SUGGEST_DELTA_MAX = 1000
@@ -15,14 +15,14 @@ Including another URLconf
 """
 from django.contrib import admin
 from django.urls import path, include
-from django.conf.urls.static import static
-from django.conf import settings
 
 from rest_framework import permissions
-from drf_yasg.views import get_schema_view
 from drf_yasg import openapi
 
-schema_view = get_schema_view(
+from core import views as core_views
+from core.schema import get_cached_schema_view
+
+schema_view = get_cached_schema_view(
     openapi.Info(
         title='Live League API',
         default_version='v1',
@@ -41,6 +41,9 @@ schema_view = get_schema_view(
 )
 
 urlpatterns = [
+    path('healthz', core_views.healthz, name='healthz'),
+    path('readyz', core_views.readyz, name='readyz'),
+    path('media/<path:path>', core_views.serve_media, name='media'),
     path('admin/', admin.site.urls),
     path('<version>/league/', include('league.urls')),
     path('<version>/user/', include('user.urls')),
@@ -51,4 +54,4 @@ urlpatterns = [
     path('docs/', schema_view.with_ui(
         'redoc', cache_timeout=0
     ), name='schema-redoc'),  
-] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+]
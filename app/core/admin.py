@@ -1,14 +1,19 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
+from django.db import transaction
 from django.utils.translation import gettext as _
 
 from core import models
+from core.authentication import invalidate_cached_users
 from core.email import Email
 
 
 def verify(modeladmin, request, queryset):
     """Mark promoters as 'verified'."""
     queryset.update(is_verified=True)
+    # update() sends no signals, so drop cached users here.
+    user_pks = list(queryset.values_list('pk', flat=True))
+    transaction.on_commit(lambda: invalidate_cached_users(user_pks))
     email_addresses = list(queryset.values_list('email', flat=True))
     Email('verified_promoter', email_addresses).send()
 
@@ -18,6 +23,7 @@ verify.short_description = "Mark promoters as 'verified'"
 class UserAdmin(BaseUserAdmin):
     ordering = ['id']
     list_display = ['id', 'email', 'name', 'slug', 'credit']
+    readonly_fields = ['credit']
     list_filter = [
         'is_active', 'is_staff', 'is_superuser', 'is_artist', 'is_promoter',
         'is_temporary'
@@ -69,6 +75,7 @@ class ArtistAdmin(admin.ModelAdmin):
     list_display = [
         'id', 'name', 'email', 'total_events', 'total_points', 'slug', 'credit'
     ]
+    readonly_fields = ['credit']
 
     def total_events(self, obj):
         return obj.total_events()
@@ -80,11 +87,12 @@ class ArtistAdmin(admin.ModelAdmin):
 class PromoterAdmin(admin.ModelAdmin):
     ordering = ['id']
     list_display = ['id', 'name', 'email', 'is_verified', 'slug', 'credit']
+    readonly_fields = ['credit']
     actions = [verify]
 
 
 class MessageAdmin(admin.ModelAdmin):
-    list_display = ['pk', 'created_date', 'created_time', 'sender', 'subject']
+    list_display = ['pk', 'created_at', 'sender', 'subject']
 
 
 class ReadFlagAdmin(admin.ModelAdmin):
@@ -98,20 +106,48 @@ class EventAdmin(admin.ModelAdmin):
     ]
 
 
+class SeriesTicketTypeInline(admin.TabularInline):
+    model = models.SeriesTicketType
+    extra = 0
+
+
+class EventSeriesAdmin(admin.ModelAdmin):
+    list_display = [
+        'pk', 'name', 'frequency', 'interval', 'starts_on', 'ends_on',
+        'materialized_until', 'venue', 'promoter'
+    ]
+    inlines = [SeriesTicketTypeInline]
+
+
 class TallyAdmin(admin.ModelAdmin):
     list_display = ['pk', 'slug', 'artist', 'event']
 
 
 class TicketTypeAdmin(admin.ModelAdmin):
     list_display = [
-        'pk', 'slug', 'event', 'name', 'price', 'tickets_remaining'
+        'pk', 'slug', 'event', 'name', 'price', 'tickets_remaining',
+        'queue_enabled'
+    ]
+
+
+class CreditEntryAdmin(admin.ModelAdmin):
+    list_display = [
+        'pk', 'created_at', 'user', 'kind', 'amount', 'ticket', 'description'
+    ]
+    list_filter = ['kind']
+
+
+class QueueTokenAdmin(admin.ModelAdmin):
+    list_display = [
+        'pk', 'token', 'ticket_type', 'owner', 'position', 'admitted_at',
+        'used_at'
     ]
 
 
 class TicketAdmin(admin.ModelAdmin):
     list_display = [
-        'pk', 'code', 'created_date', 'created_time', 'owner', 'ticket_type',
-        'vote'
+        'pk', 'code', 'created_at', 'owner', 'ticket_type', 'vote',
+        'checked_in_at'
     ]
 
 
@@ -122,6 +158,9 @@ admin.site.register(models.Message, MessageAdmin)
 admin.site.register(models.ReadFlag, ReadFlagAdmin)
 admin.site.register(models.Venue)
 admin.site.register(models.Event, EventAdmin)
+admin.site.register(models.EventSeries, EventSeriesAdmin)
 admin.site.register(models.Tally, TallyAdmin)
 admin.site.register(models.Ticket, TicketAdmin)
 admin.site.register(models.TicketType, TicketTypeAdmin)
+admin.site.register(models.QueueToken, QueueTokenAdmin)
+admin.site.register(models.CreditEntry, CreditEntryAdmin)
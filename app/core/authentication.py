@@ -0,0 +1,102 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+
+from rest_framework import authentication, exceptions
+
+
+def auth_token_key(key):
+    return f'auth:token:{key}'
+
+
+def auth_user_key(user_pk):
+    return f'auth:user:{user_pk}'
+
+
+# The user fields authentication and permission checks need. Only these are
+# cached; any other field is loaded from the database when first used.
+AUTH_USER_FIELDS = (
+    'id', 'is_active', 'is_staff', 'is_superuser', 'is_artist',
+    'is_promoter', 'is_temporary'
+)
+# The same for each profile, or None when the user has no such profile.
+AUTH_PROFILE_FIELDS = {
+    'artist': ('user_ptr_id',),
+    'promoter': ('user_ptr_id', 'is_verified'),
+}
+
+
+def cached_fields(user):
+    """The fields of a user and their profiles that are cached."""
+    fields = {'user': {name: getattr(user, name) for name in AUTH_USER_FIELDS}}
+    for profile, names in AUTH_PROFILE_FIELDS.items():
+        instance = getattr(user, profile, None)
+        fields[profile] = None if instance is None else {
+            name: getattr(instance, name) for name in names
+        }
+    return fields
+
+
+def from_fields(model, fields):
+    """An instance of 'model' with only 'fields' loaded."""
+    names = [
+        f.attname for f in model._meta.concrete_fields if f.attname in fields
+    ]
+    return model.from_db(None, names, [fields[name] for name in names])
+
+
+def load_user(fields):
+    """Rebuilds a user and their profiles from cached_fields()."""
+    user = from_fields(get_user_model(), fields['user'])
+    for profile in AUTH_PROFILE_FIELDS:
+        related = getattr(type(user), profile).related
+        instance = None
+        if fields[profile] is not None:
+            instance = from_fields(
+                related.related_model, {**fields['user'], **fields[profile]}
+            )
+        related.set_cached_value(user, instance)
+    return user
+
+
+def invalidate_cached_users(user_pks):
+    """Drops cached users so their next request reloads them."""
+    cache.delete_many([auth_user_key(pk) for pk in user_pks])
+
+
+class CachedTokenAuthentication(authentication.TokenAuthentication):
+    """
+    Token authentication that caches the user's AUTH_USER_FIELDS for
+    AUTH_CACHE_TIMEOUT seconds, with their 'artist' and 'promoter' profiles
+    already resolved, so a warm request makes no authentication queries.
+    Cached users are dropped by signals whenever they are saved, and by
+    invalidate_cached_users() after bulk updates.
+    """
+
+    def authenticate_credentials(self, key):
+        model = self.get_model()
+        user_pk = cache.get(auth_token_key(key))
+        fields = cache.get(auth_user_key(user_pk)) if user_pk else None
+        if fields is None:
+            try:
+                token = model.objects.select_related(
+                    'user__artist', 'user__promoter'
+                ).get(key=key)
+            except model.DoesNotExist:
+                raise exceptions.AuthenticationFailed(_('Invalid token.'))
+            user = token.user
+            cache.set_many({
+                auth_token_key(key): user.pk,
+                auth_user_key(user.pk): cached_fields(user),
+            }, timeout=settings.AUTH_CACHE_TIMEOUT)
+        else:
+            user = load_user(fields)
+            token = model(key=key, user=user)
+
+        if not user.is_active:
+            raise exceptions.AuthenticationFailed(
+                _('User inactive or deleted.')
+            )
+
+        return (user, token)
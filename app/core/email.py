@@ -3,16 +3,13 @@ import os
 from django.contrib.auth import get_user_model
 from django.apps import apps
 
-from sendgrid import SendGridAPIClient
-from sendgrid.helpers.mail import Mail
-
 from app.keys import SENDGRID_KEY
 
 
 class Email(object):
     """
     Constructs a transaction email and message
-    to one user based on system events.
+    to one or more users based on system events.
     """
     def __init__(self, template_name, to_emails, dynamic_template_data=None):
         self.api_key = SENDGRID_KEY
@@ -170,6 +167,10 @@ class Email(object):
 
     def send(self):
         """Sends an email and creates a message and read flag."""
+        # Imported here so processes that never send email don't load it.
+        from sendgrid import SendGridAPIClient
+        from sendgrid.helpers.mail import Mail
+
         for address in self.to_emails:
             email = Mail(
                 from_email=self.from_email,
@@ -190,3 +191,39 @@ class Email(object):
             readflag = self.ReadFlag.objects.create_readflag(
                 message, recipient
             )
+
+    def send_bulk(self):
+        """
+        Sends the email to every address in one request, and creates one
+        message with a read flag for each recipient.
+        """
+        from sendgrid import SendGridAPIClient
+        from sendgrid.helpers.mail import Mail
+
+        # Each address gets its own personalization, so recipients don't
+        # see each other.
+        email = Mail(
+            from_email=self.from_email,
+            to_emails=self.to_emails,
+            is_multiple=True
+        )
+        email.template_id = self.template_id
+        if self.dynamic_template_data:
+            for personalization in email.personalizations:
+                personalization.dynamic_template_data = \
+                    self.dynamic_template_data
+        try:
+            SendGridAPIClient(self.api_key).send(email)
+            print('Email(s) sent to:', self.to_emails)
+        except Exception as e:
+            print('Email(s) failed:', str(e))
+        message = self.Message.objects.create_message(
+            self.subject, self.text
+        )
+        recipients = get_user_model().objects.filter(
+            email__in=self.to_emails
+        )
+        self.ReadFlag.objects.bulk_create([
+            self.ReadFlag(message=message, recipient=recipient)
+            for recipient in recipients
+        ])
@@ -0,0 +1,57 @@
+import os
+import time
+
+from django.db import connections
+from django.db.migrations.executor import MigrationExecutor
+from django.urls import get_resolver
+
+started_at = time.time()
+# Set once this worker has run warm_up().
+warmed_up = None
+# Set once every migration has been found applied.
+migrated = False
+
+
+def check_database(alias='default'):
+    """
+    Opens a connection if needed and runs a query.
+    Returns the round trip in milliseconds; raises DatabaseError if the
+    database can't be reached.
+    """
+    start = time.perf_counter()
+    with connections[alias].cursor() as cursor:
+        cursor.execute('SELECT 1')
+        cursor.fetchone()
+    return round((time.perf_counter() - start) * 1000, 2)
+
+
+def pending_migrations(alias='default'):
+    """Number of migrations not yet applied to the database."""
+    global migrated
+    if migrated:
+        return 0
+    executor = MigrationExecutor(connections[alias])
+    count = len(executor.migration_plan(executor.loader.graph.leaf_nodes()))
+    migrated = count == 0
+    return count
+
+
+def warm_up():
+    """
+    Does the first-request work up front: imports every view through the
+    URLconf, connects to the database and maps the typeahead index.
+    Run by gunicorn in each worker before it accepts requests.
+    """
+    global warmed_up
+    from core.suggest import get_index
+
+    start = time.perf_counter()
+    get_resolver().url_patterns
+    check_database()
+    pending_migrations()
+    get_index()
+    warmed_up = {
+        'pid': os.getpid(),
+        'seconds': round(time.perf_counter() - start, 3),
+    }
+    return warmed_up
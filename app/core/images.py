@@ -0,0 +1,130 @@
+import io
+import os
+
+from django.apps import apps
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+
+from PIL import Image, ImageOps
+from rest_framework import serializers
+
+# Models with an 'image' field that gets variants. PublicProfile mirrors
+# its user's image and shares its variants.
+IMAGE_MODELS = ('User', 'Venue', 'Event')
+# Longest side in pixels of each variant. Images are never enlarged.
+IMAGE_VARIANTS = {'thumb': 160, 'card': 480, 'full': 1600}
+# Pillow format and save options for each variant file type.
+IMAGE_FORMATS = {
+    'webp': ('WEBP', {'quality': 80, 'method': 4}),
+    'jpeg': ('JPEG', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+
+
+def fit(width, height, size):
+    """Dimensions of a width x height image scaled to fit in size x size."""
+    scale = min(1, size / max(width, height))
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+def variant_name(name, variant, ext):
+    """Storage name of one variant of the image stored as 'name'."""
+    return f'{os.path.splitext(name)[0]}-{variant}.{ext}'
+
+
+def make_variants(name, storage=default_storage):
+    """
+    Writes every variant of the stored image 'name' in every format and
+    returns the original's (width, height) after EXIF rotation.
+    Only pixels are copied, so EXIF and other metadata are dropped.
+    """
+    with storage.open(name) as f:
+        original = Image.open(f)
+        original.load()
+    original = ImageOps.exif_transpose(original)
+    if original.mode not in ('RGB', 'RGBA'):
+        original = original.convert('RGBA' if 'A' in original.getbands()
+                                    else 'RGB')
+    width, height = original.size
+    for variant, size in IMAGE_VARIANTS.items():
+        image = original.resize(fit(width, height, size), Image.LANCZOS)
+        for ext, (format, options) in IMAGE_FORMATS.items():
+            if format == 'JPEG' and image.mode == 'RGBA':
+                flat = Image.new('RGB', image.size, (255, 255, 255))
+                flat.paste(image, mask=image.getchannel('A'))
+                out = flat
+            else:
+                out = image
+            buffer = io.BytesIO()
+            out.save(buffer, format, **options)
+            path = variant_name(name, variant, ext)
+            storage.delete(path)
+            storage.save(path, ContentFile(buffer.getvalue()))
+    return width, height
+
+
+def processed_size(name):
+    """
+    Dimensions recorded for the stored image 'name' by any row that has
+    already been processed, or None. Identical uploads share one file, so
+    they share its variants too.
+    """
+    for model in IMAGE_MODELS:
+        size = apps.get_model('core', model).objects.filter(
+            image=name, image_processed=name, image_width__isnull=False
+        ).values_list('image_width', 'image_height').first()
+        if size:
+            return size
+    return None
+
+
+def process_image(instance):
+    """
+    Builds the variants of an instance's current image, unless another
+    row has already, and records its dimensions. Returns False if the
+    image couldn't be read; it is then marked processed without
+    dimensions so it isn't retried.
+    """
+    name = instance.image.name
+    try:
+        size = processed_size(name) or make_variants(name)
+        instance.image_width, instance.image_height = size
+        processed = True
+    except (OSError, Image.DecompressionBombError):
+        instance.image_width = instance.image_height = None
+        processed = False
+    instance.image_processed = name
+    instance.save(
+        update_fields=['image_width', 'image_height', 'image_processed']
+    )
+    return processed
+
+
+class ImageVariantsField(serializers.Field):
+    """
+    Read-only URLs and dimensions of each variant of an object's image,
+    or None until the image has been processed.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs['source'] = '*'
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, instance):
+        name = instance.image.name if instance.image else ''
+        if (not name or instance.image_processed != name or
+                instance.image_width is None):
+            return None
+        request = self.context.get('request')
+        variants = {}
+        for variant, size in IMAGE_VARIANTS.items():
+            width, height = fit(
+                instance.image_width, instance.image_height, size
+            )
+            variants[variant] = {'width': width, 'height': height}
+            for ext in IMAGE_FORMATS:
+                url = default_storage.url(variant_name(name, variant, ext))
+                if request is not None:
+                    url = request.build_absolute_uri(url)
+                variants[variant][ext] = url
+        return variants
@@ -0,0 +1,37 @@
+import math
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.models import TicketType, QueueToken
+
+
+class Command(BaseCommand):
+    """Django command to admit queued buyers at each ticket type's rate."""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval', type=int, default=5,
+            help='Seconds between admission rounds.'
+        )
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Run a single admission round and exit.'
+        )
+
+    def handle(self, *args, **options):
+        """Handle the command"""
+        interval = options['interval']
+        while True:
+            ticket_types = TicketType.objects.filter(
+                queue_enabled=True, queue_tokens__admitted_at__isnull=True
+            ).distinct()
+            for ticket_type in ticket_types:
+                count = math.ceil(ticket_type.queue_rate * interval / 60)
+                admitted = QueueToken.objects.admit_queue_tokens(
+                    ticket_type, count
+                )
+                self.stdout.write(f'Admitted {admitted} from {ticket_type}')
+            if options['once']:
+                break
+            time.sleep(interval)
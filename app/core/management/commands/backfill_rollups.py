@@ -0,0 +1,50 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncHour
+
+from core.models import Ticket, SalesRollup, VoteRollup
+
+
+class Command(BaseCommand):
+    """Django command to rebuild the sales and vote rollups from tickets."""
+
+    def handle(self, *args, **options):
+        """Handle the command"""
+        sales = Ticket.objects.values(
+            'ticket_type', 'ticket_type__event',
+            hour=TruncHour('created_at')
+        ).annotate(
+            total=Count('pk'), revenue=Sum('ticket_type__price')
+        ).order_by()
+        votes = Ticket.objects.filter(vote__isnull=False).values(
+            'vote', 'vote__event'
+        ).annotate(
+            total=Count('pk'), points=Sum('ticket_type__price')
+        ).order_by()
+        with transaction.atomic():
+            SalesRollup.objects.all().delete()
+            SalesRollup.objects.bulk_create((
+                SalesRollup(
+                    event_id=row['ticket_type__event'],
+                    ticket_type_id=row['ticket_type'],
+                    hour=row['hour'],
+                    tickets=row['total'],
+                    revenue=row['revenue']
+                )
+                for row in sales.iterator()
+            ), batch_size=1000)
+            VoteRollup.objects.all().delete()
+            VoteRollup.objects.bulk_create((
+                VoteRollup(
+                    event_id=row['vote__event'],
+                    tally_id=row['vote'],
+                    votes=row['total'],
+                    points=row['points']
+                )
+                for row in votes.iterator()
+            ), batch_size=1000)
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt {SalesRollup.objects.count()} sales rollups and '
+            f'{VoteRollup.objects.count()} vote rollups.'
+        ))
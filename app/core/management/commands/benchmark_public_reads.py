@@ -0,0 +1,103 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import RequestFactory
+
+from core.models import PUBLIC_PROFILE_FIELDS, User, Artist, PublicProfile
+from league.serializers import TableRowSerializer
+from league.views import ListTableRowView
+from user.serializers import PublicArtistSerializer, PublicProfileSerializer
+
+
+class Command(BaseCommand):
+    """
+    Django command to time public artist reads through the user table
+    against the narrowed and denormalized paths.
+    Sample artists are created in a transaction that is rolled back.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--count', type=int, default=50000,
+            help='Number of sample artists.'
+        )
+        parser.add_argument(
+            '--repeat', type=int, default=3,
+            help='Runs of each read; the fastest is reported.'
+        )
+
+    def time(self, read):
+        """Fastest of several runs of read(), in milliseconds."""
+        best = None
+        for _ in range(self.repeat):
+            start = time.perf_counter()
+            read()
+            elapsed = (time.perf_counter() - start) * 1000
+            best = elapsed if best is None else min(best, elapsed)
+        return best
+
+    def create_artists(self, count):
+        """Bulk creates sample artists and their public profiles."""
+        User.objects.bulk_create([
+            User(
+                email=f'benchmark-{i}@example.com',
+                name=f'Benchmark Artist {i}',
+                slug=f'benchmark-artist-{i}',
+                is_artist=True,
+                address_line1='1 Example Street',
+                address_city='London',
+                stripe_customer_id='cus_benchmark',
+                website='https://example.com',
+            )
+            for i in range(count)
+        ])
+        users = User.objects.filter(email__startswith='benchmark-')
+        for user in users.iterator():
+            # A raw save inserts only the child row, as fixtures do.
+            Artist(user_ptr=user, description='Benchmark').save_base(
+                raw=True
+            )
+        PublicProfile.objects.bulk_create([
+            PublicProfile(
+                user_id=user.pk, is_artist=True, description='Benchmark',
+                **{field: getattr(user, field) for field in
+                   PUBLIC_PROFILE_FIELDS if field != 'description'}
+            )
+            for user in users.iterator()
+        ])
+
+    def handle(self, *args, **options):
+        """Handle the command"""
+        self.repeat = options['repeat']
+        with transaction.atomic():
+            self.create_artists(options['count'])
+            if connection.vendor == 'postgresql':
+                with connection.cursor() as cursor:
+                    cursor.execute('ANALYZE')
+
+            artists = self.time(lambda: PublicArtistSerializer(
+                Artist.objects.order_by('name'), many=True
+            ).data)
+            profiles = self.time(lambda: PublicProfileSerializer(
+                PublicProfile.objects.filter(
+                    is_artist=True
+                ).order_by('name'), many=True
+            ).data)
+            self.stdout.write(
+                f'ListArtistView: user join {artists:.0f}ms, '
+                f'public profile {profiles:.0f}ms'
+            )
+
+            view = ListTableRowView(request=RequestFactory().get('/'))
+            wide = self.time(lambda: TableRowSerializer(
+                view.get_queryset().defer(None), many=True
+            ).data)
+            narrow = self.time(lambda: TableRowSerializer(
+                view.get_queryset(), many=True
+            ).data)
+            self.stdout.write(
+                f'ListTableRowView: all columns {wide:.0f}ms, '
+                f'only() {narrow:.0f}ms'
+            )
+            transaction.set_rollback(True)
@@ -0,0 +1,37 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.models import Ticket, create_code
+
+
+class Command(BaseCommand):
+    """Django command to time the issuing of ticket codes."""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--count', type=int, default=100000,
+            help='Number of codes to issue.'
+        )
+
+    def handle(self, *args, **options):
+        """Handle the command"""
+        count = options['count']
+
+        start = time.perf_counter()
+        codes = Ticket.objects.generate_codes(count)
+        elapsed = time.perf_counter() - start
+        self.stdout.write(
+            f'generate_codes: {count} codes in {elapsed:.3f}s '
+            f'({elapsed / count * 1e6:.1f}us per code, '
+            f'{count - len(set(codes))} duplicates)'
+        )
+
+        start = time.perf_counter()
+        hashed = [create_code(pk, 6) for pk in range(1, count + 1)]
+        elapsed = time.perf_counter() - start
+        self.stdout.write(
+            f'create_code: {count} codes in {elapsed:.3f}s '
+            f'({elapsed / count * 1e6:.1f}us per code, '
+            f'{count - len(set(hashed))} collisions after truncation)'
+        )
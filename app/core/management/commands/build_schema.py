@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from django.urls import resolve, reverse
+
+
+class Command(BaseCommand):
+    """
+    Django command to write the OpenAPI schema to OPENAPI_SCHEMA_DIR, so
+    the docs endpoints serve it without introspecting the API.
+    """
+
+    def handle(self, *args, **options):
+        """Handle the command"""
+        view = resolve(reverse('schema-swagger-ui')).func.cls
+        for path in view.write_schema():
+            self.stdout.write(self.style.SUCCESS(f'Wrote {path}'))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from core.suggest import build_index, get_index
+
+
+class Command(BaseCommand):
+    """Django command to rebuild the typeahead index from the database."""
+
+    def handle(self, *args, **options):
+        """Handle the command"""
+        build_index()
+        self.stdout.write(
+            self.style.SUCCESS(f'Indexed {len(get_index())} suggestions.')
+        )
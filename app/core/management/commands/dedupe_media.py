@@ -0,0 +1,84 @@
+import os
+import re
+
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from core.images import IMAGE_FORMATS, IMAGE_VARIANTS
+from core.models import upload_storage
+from core.storage import content_hash, content_name, release_file
+
+# Matches the variant files written next to each original.
+VARIANT_NAME = re.compile(r'-({})\.({})$'.format(
+    '|'.join(IMAGE_VARIANTS), '|'.join(IMAGE_FORMATS)
+))
+# Matches names already given by ContentAddressedStorage.
+CONTENT_NAME = re.compile(r'/([0-9a-f]{2})/\1[0-9a-f]{62}\.\w+$')
+# Every model with an image field, including the PublicProfile copies.
+MODELS = ('User', 'Venue', 'Event', 'PublicProfile')
+
+
+class Command(BaseCommand):
+    """
+    Django command to move existing uploads to content-addressed names.
+    Duplicate files collapse into one, every row is pointed at it and the
+    old files are removed once nothing refers to them. Variants are
+    rebuilt for the new names by process_images.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--directory', default='uploads',
+            help='Directory under MEDIA_ROOT to dedupe.'
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Report what would change without changing anything.'
+        )
+
+    def originals(self, directory):
+        """Storage names of the files in directory not yet addressed."""
+        root = upload_storage.path(directory)
+        for dirpath, _, filenames in os.walk(root):
+            for filename in sorted(filenames):
+                name = os.path.relpath(
+                    os.path.join(dirpath, filename), upload_storage.location
+                ).replace(os.sep, '/')
+                if not VARIANT_NAME.search(name) and \
+                        not CONTENT_NAME.search(name):
+                    yield name
+
+    def handle(self, *args, **options):
+        """Handle the command"""
+        directory = options['directory']
+        dry_run = options['dry_run']
+        stored = set()
+        moved = duplicates = saved = 0
+        for name in list(self.originals(directory)):
+            with upload_storage.open(name) as f:
+                new_name = content_name(directory, content_hash(f), name)
+            if new_name in stored or upload_storage.exists(new_name):
+                duplicates += 1
+                saved += upload_storage.size(name)
+            else:
+                moved += 1
+            stored.add(new_name)
+            if dry_run:
+                continue
+            if not upload_storage.exists(new_name):
+                with upload_storage.open(name) as f:
+                    # Saved under its old name, the storage picks new_name.
+                    upload_storage.save(name, f)
+            with transaction.atomic():
+                for model in MODELS:
+                    apps.get_model('core', model).objects.filter(
+                        image=name
+                    ).update(image=new_name)
+            release_file(name)
+
+        prefix = 'Would move' if dry_run else 'Moved'
+        self.stdout.write(self.style.SUCCESS(
+            f'{prefix} {moved} files and merged {duplicates} duplicates, '
+            f'saving {saved / 1024 / 1024:.1f}MB.'
+        ))
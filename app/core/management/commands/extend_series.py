@@ -0,0 +1,50 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db.models import F, Q
+from django.utils import timezone
+
+from core.models import EventSeries
+
+
+class Command(BaseCommand):
+    """
+    Django command to create the events of recurring series as they come
+    within EVENT_SERIES_HORIZON days.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval', type=int, default=3600,
+            help='Seconds between rounds.'
+        )
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Run a single round and exit.'
+        )
+
+    def handle(self, *args, **options):
+        """Handle the command"""
+        while True:
+            until = timezone.localdate() + timedelta(
+                days=settings.EVENT_SERIES_HORIZON
+            )
+            # Series that have not reached the horizon or their end yet.
+            series = EventSeries.objects.filter(
+                Q(materialized_until__isnull=True) |
+                Q(materialized_until__lt=until),
+                Q(materialized_until__isnull=True) |
+                Q(ends_on__isnull=True) |
+                Q(ends_on__gt=F('materialized_until'))
+            )
+            for each in series:
+                events = EventSeries.objects.extend_series(each, until)
+                if events:
+                    self.stdout.write(
+                        f'Created {len(events)} events for {each}'
+                    )
+            if options['once']:
+                break
+            time.sleep(options['interval'])
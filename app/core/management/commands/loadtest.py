@@ -0,0 +1,62 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from statistics import median
+from urllib.error import HTTPError, URLError
+from urllib.request import urlopen
+
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    """
+    Django command to load test a running server.
+    Fires requests at one URL from many threads and reports throughput
+    and latency, so serving setups can be compared.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument('url', help='URL to request.')
+        parser.add_argument(
+            '--concurrency', type=int, default=50,
+            help='Number of requests in flight at once.'
+        )
+        parser.add_argument(
+            '--requests', type=int, default=1000,
+            help='Total number of requests.'
+        )
+        parser.add_argument(
+            '--timeout', type=float, default=60,
+            help='Seconds before a request counts as failed.'
+        )
+
+    def request(self, url, timeout):
+        """Returns the latency of one request, or None if it failed."""
+        start = time.perf_counter()
+        try:
+            with urlopen(url, timeout=timeout) as response:
+                response.read()
+        except (HTTPError, URLError, OSError):
+            return None
+        return time.perf_counter() - start
+
+    def handle(self, *args, **options):
+        """Handle the command"""
+        url, count = options['url'], options['requests']
+        start = time.perf_counter()
+        with ThreadPoolExecutor(options['concurrency']) as executor:
+            results = list(executor.map(
+                lambda _: self.request(url, options['timeout']), range(count)
+            ))
+        elapsed = time.perf_counter() - start
+        latencies = sorted(r for r in results if r is not None)
+        errors = count - len(latencies)
+        self.stdout.write(
+            f'{count} requests, concurrency {options["concurrency"]}: '
+            f'{count / elapsed:.1f} req/s, {errors} errors'
+        )
+        if latencies:
+            p95 = latencies[int(len(latencies) * 0.95) - 1]
+            self.stdout.write(
+                f'latency p50 {median(latencies) * 1000:.0f}ms, '
+                f'p95 {p95 * 1000:.0f}ms, max {latencies[-1] * 1000:.0f}ms'
+            )
@@ -0,0 +1,44 @@
+import time
+
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.db.models import F
+
+from core.images import IMAGE_MODELS, process_image
+
+
+class Command(BaseCommand):
+    """
+    Django command to build resized variants of uploaded images.
+    Picks up every user, venue and event whose image has changed since
+    it was last processed.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval', type=int, default=5,
+            help='Seconds between checks for new images.'
+        )
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Process the waiting images and exit.'
+        )
+
+    def handle(self, *args, **options):
+        """Handle the command"""
+        while True:
+            for name in IMAGE_MODELS:
+                model = apps.get_model('core', name)
+                pending = model.objects.exclude(image='').exclude(
+                    image__isnull=True
+                ).exclude(image_processed=F('image'))
+                for instance in pending.iterator():
+                    if process_image(instance):
+                        self.stdout.write(f'Processed {instance.image.name}')
+                    else:
+                        self.stderr.write(
+                            f'Unreadable image {instance.image.name}'
+                        )
+            if options['once']:
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,109 @@
+import json
+import os
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# What a gunicorn worker imports before serving: the WSGI app, then the
+# URLconf and views loaded by the warm up in post_worker_init.
+STARTUP = (
+    'import app.wsgi\n'
+    'from django.urls import get_resolver\n'
+    'get_resolver().url_patterns\n'
+)
+
+
+def profile(code):
+    """
+    Runs code in a fresh interpreter under -X importtime and returns
+    {module: (self_us, cumulative_us)}.
+    """
+    env = dict(os.environ, DJANGO_SETTINGS_MODULE='app.settings')
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=settings.BASE_DIR, env=env,
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+        universal_newlines=True
+    )
+    if result.returncode:
+        raise CommandError(result.stderr.strip().splitlines()[-1])
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, cumulative, name = line[len('import time:'):].split('|')
+        modules[name.strip()] = (int(self_us), int(cumulative))
+    return modules
+
+
+def by_package(modules):
+    """Self time in milliseconds per top-level package."""
+    packages = defaultdict(int)
+    for name, (self_us, _) in modules.items():
+        packages[name.split('.')[0]] += self_us
+    return {name: round(us / 1000, 1) for name, us in packages.items()}
+
+
+class Command(BaseCommand):
+    """
+    Django command to report what a worker spends importing at startup,
+    per top-level package. Save a report with --save and check later
+    builds against it with --baseline, or cap the total with --budget.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--top', type=int, default=20,
+            help='Number of packages to list.'
+        )
+        parser.add_argument(
+            '--save', metavar='FILE',
+            help='Write the report to FILE as JSON.'
+        )
+        parser.add_argument(
+            '--baseline', metavar='FILE',
+            help='Compare against a report saved with --save.'
+        )
+        parser.add_argument(
+            '--budget', type=float, metavar='MS',
+            help='Fail if the total import time exceeds MS milliseconds.'
+        )
+
+    def handle(self, *args, **options):
+        """Handle the command"""
+        packages = by_package(profile(STARTUP))
+        total = round(sum(packages.values()), 1)
+        baseline = {}
+        if options['baseline']:
+            with open(options['baseline']) as f:
+                baseline = json.load(f)['packages']
+
+        self.stdout.write(f'{"package":<30} {"ms":>8} {"change":>8}')
+        ranked = sorted(packages.items(), key=lambda p: p[1], reverse=True)
+        for name, ms in ranked[:options['top']]:
+            change = ''
+            if baseline:
+                change = f'{ms - baseline.get(name, 0):+.1f}'
+            self.stdout.write(f'{name:<30} {ms:>8.1f} {change:>8}')
+        if baseline:
+            added = sorted(set(packages) - set(baseline))
+            if added:
+                self.stdout.write('New packages: ' + ', '.join(added))
+            before = round(sum(baseline.values()), 1)
+            self.stdout.write(
+                f'Total {total}ms ({total - before:+.1f}ms on baseline)'
+            )
+        else:
+            self.stdout.write(f'Total {total}ms')
+
+        if options['save']:
+            with open(options['save'], 'w') as f:
+                json.dump({'total': total, 'packages': packages}, f, indent=2)
+        if options['budget'] is not None and total > options['budget']:
+            raise CommandError(
+                f'Import time {total}ms is over the {options["budget"]}ms '
+                'budget.'
+            )
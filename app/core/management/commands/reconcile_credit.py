@@ -0,0 +1,41 @@
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import DecimalField, F, Sum, Value
+from django.db.models.functions import Coalesce
+
+
+class Command(BaseCommand):
+    """Django command to check user credit against the credit ledger."""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size', type=int, default=2000,
+            help='Number of mismatched users fetched per database round trip.'
+        )
+
+    def handle(self, *args, **options):
+        """Handle the command"""
+        # One aggregated query does the comparison in the database, so only
+        # mismatched rows are sent back regardless of how many users exist.
+        mismatches = get_user_model().objects.annotate(
+            ledger=Coalesce(
+                Sum('credit_entries__amount'),
+                Value(Decimal('0.00')),
+                output_field=DecimalField(max_digits=8, decimal_places=2)
+            )
+        ).exclude(credit=F('ledger')).values_list(
+            'pk', 'email', 'credit', 'ledger'
+        )
+        count = 0
+        for pk, email, credit, ledger in mismatches.iterator(
+            chunk_size=options['chunk_size']
+        ):
+            count += 1
+            self.stdout.write(
+                f'User {pk} ({email}): credit {credit}, ledger {ledger}'
+            )
+        if count:
+            raise CommandError(f'{count} balance(s) do not match the ledger.')
+        self.stdout.write(self.style.SUCCESS('All balances match the ledger.'))
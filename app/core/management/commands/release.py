@@ -0,0 +1,33 @@
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    """
+    Django command to run once per deploy, before any web container boots.
+    Refuses models without migrations, then applies migrations, collects
+    static files and writes the OpenAPI schema, so web startup only has
+    to wait for the database.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--skip-static', action='store_true',
+            help="Don't collect static files."
+        )
+
+    def handle(self, *args, **options):
+        """Handle the command"""
+        verbosity = options['verbosity']
+        # Migrations are written in development and committed, never
+        # generated on a server; exits non-zero if any are missing.
+        call_command(
+            'makemigrations', check=True, dry_run=True, verbosity=verbosity
+        )
+        call_command('migrate', interactive=False, verbosity=verbosity)
+        if not options['skip_static']:
+            call_command(
+                'collectstatic', interactive=False, verbosity=verbosity
+            )
+        call_command('build_schema', verbosity=verbosity)
+        self.stdout.write(self.style.SUCCESS('Release complete.'))
@@ -0,0 +1,82 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from core.models import Ticket
+from core.tickets import render_ticket, ticket_info
+
+
+class Command(BaseCommand):
+    """
+    Django command to render queued tickets' PDFs and QR codes.
+    Rendering is CPU bound, so batches are spread over a process pool;
+    a promoter rendering a whole event queues every ticket at once.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--processes', type=int, default=os.cpu_count(),
+            help='Number of rendering processes.'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=500,
+            help='Tickets taken from the queue at a time.'
+        )
+        parser.add_argument(
+            '--interval', type=float, default=1,
+            help='Seconds between checks of an empty queue.'
+        )
+        parser.add_argument(
+            '--event', type=int,
+            help="Queue every ticket for this event's id first."
+        )
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Render until the queue is empty and exit.'
+        )
+
+    def render_batch(self, pool, tickets):
+        """Renders tickets in the pool and records the results."""
+        infos = [ticket_info(ticket) for ticket in tickets]
+        # Worker processes are forked on demand and must not share this
+        # process's database connection.
+        connections.close_all()
+        futures = [pool.submit(render_ticket, info) for info in infos]
+        for ticket, future in zip(tickets, futures):
+            try:
+                stem = future.result()
+            except Exception as e:
+                # Dequeued anyway; the next download queues it again.
+                self.stderr.write(f'Failed to render {ticket.code}: {e}')
+                stem = ticket.rendered
+            Ticket.objects.mark_rendered(ticket, stem)
+
+    def handle(self, *args, **options):
+        """Handle the command"""
+        if options['event']:
+            queued = Ticket.objects.request_render(
+                Ticket.objects.filter(ticket_type__event_id=options['event'])
+            )
+            self.stdout.write(f'Queued {queued} tickets')
+
+        with ProcessPoolExecutor(options['processes']) as pool:
+            while True:
+                tickets = list(Ticket.objects.filter(
+                    render_requested_at__isnull=False
+                ).select_related(
+                    'ticket_type__event__venue'
+                ).order_by('render_requested_at')[:options['batch_size']])
+                if tickets:
+                    start = time.perf_counter()
+                    self.render_batch(pool, tickets)
+                    self.stdout.write(
+                        f'Rendered {len(tickets)} tickets in '
+                        f'{time.perf_counter() - start:.1f}s'
+                    )
+                if len(tickets) < options['batch_size']:
+                    if options['once']:
+                        break
+                    time.sleep(options['interval'])
@@ -0,0 +1,64 @@
+import os
+import time
+
+from django.apps import apps
+from django.core.management.base import BaseCommand
+
+from core.images import IMAGE_MODELS
+from core.management.commands.dedupe_media import VARIANT_NAME
+from core.models import upload_storage
+from core.storage import release_file
+
+
+class Command(BaseCommand):
+    """
+    Django command to delete stored images that nothing refers to.
+    Picks up the files release_file kept because an upload had reused
+    them within MEDIA_RELEASE_GRACE seconds.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--directory', default='uploads',
+            help='Directory under MEDIA_ROOT to sweep.'
+        )
+        parser.add_argument(
+            '--interval', type=int, default=3600,
+            help='Seconds between sweeps.'
+        )
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Run a single sweep and exit.'
+        )
+
+    def originals(self, directory):
+        """Storage names of the original images in directory."""
+        root = upload_storage.path(directory)
+        for dirpath, _, filenames in os.walk(root):
+            for filename in sorted(filenames):
+                name = os.path.relpath(
+                    os.path.join(dirpath, filename), upload_storage.location
+                ).replace(os.sep, '/')
+                if not VARIANT_NAME.search(name):
+                    yield name
+
+    def handle(self, *args, **options):
+        """Handle the command"""
+        while True:
+            used = set()
+            for model in IMAGE_MODELS:
+                used.update(
+                    apps.get_model('core', model).objects.exclude(
+                        image=''
+                    ).values_list('image', flat=True)
+                )
+            released = 0
+            for name in self.originals(options['directory']):
+                # release_file checks the references again under its lock.
+                if name not in used and release_file(name):
+                    released += 1
+            if released:
+                self.stdout.write(f'Released {released} unused images.')
+            if options['once']:
+                break
+            time.sleep(options['interval'])
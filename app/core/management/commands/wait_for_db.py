@@ -1,22 +1,49 @@
 import time
 
-from django.db import connections
-from django.db.utils import OperationalError
-from django.core.management.base import BaseCommand
+from django.db import DatabaseError
+from django.core.management.base import BaseCommand, CommandError
+
+from core.health import check_database
 
 
 class Command(BaseCommand):
-    """Django command to pause execution until database is available."""
+    """
+    Django command to pause execution until the database answers a query.
+    Retries back off exponentially up to --max-delay seconds apart.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--database', default='default',
+            help='Database alias to wait for.'
+        )
+        parser.add_argument(
+            '--timeout', type=float, default=120,
+            help='Seconds to wait before giving up.'
+        )
+        parser.add_argument(
+            '--max-delay', type=float, default=8,
+            help='Longest pause between attempts, in seconds.'
+        )
 
     def handle(self, *args, **options):
         """Handle the command"""
         self.stdout.write('Waiting for database...')
-        db_conn = None
-        while not db_conn:
+        deadline = time.monotonic() + options['timeout']
+        delay = 0.25
+        while True:
             try:
-                db_conn = connections['default']
-            except OperationalError:
-                self.stdout.write('Database unavailable, waiting 1 second...')
-                time.sleep(1)
+                latency = check_database(options['database'])
+                break
+            except DatabaseError as e:
+                if time.monotonic() + delay > deadline:
+                    raise CommandError(f'Database unavailable: {e}')
+                self.stdout.write(
+                    f'Database unavailable, waiting {delay:g} seconds...'
+                )
+                time.sleep(delay)
+                delay = min(delay * 2, options['max_delay'])
 
-        self.stdout.write(self.style.SUCCESS('Database available!'))
+        self.stdout.write(
+            self.style.SUCCESS(f'Database available! ({latency}ms)')
+        )
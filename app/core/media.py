@@ -0,0 +1,106 @@
+import mimetypes
+import os
+import posixpath
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.signing import BadSignature, TimestampSigner
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils.cache import patch_cache_control
+from django.utils.http import urlencode
+
+from rest_framework.exceptions import AuthenticationFailed
+
+from core.authentication import CachedTokenAuthentication
+
+# Files under private/<user pk>/ are readable by that user and staff.
+PRIVATE_MEDIA_DIR = 'private'
+
+signer = TimestampSigner(salt='core.media')
+
+
+def private_media_name(user_pk, *parts):
+    """Storage name of a file only user_pk may read."""
+    return posixpath.join(PRIVATE_MEDIA_DIR, str(user_pk), *parts)
+
+
+def is_private(name):
+    return name.split('/', 1)[0] == PRIVATE_MEDIA_DIR
+
+
+def sign(value):
+    """Signature for value, checked by valid_signature()."""
+    return signer.sign(value)[len(value) + 1:]
+
+
+def valid_signature(value, signature, max_age=None):
+    """True if signature was made for value within the max age."""
+    try:
+        signer.unsign(
+            f'{value}:{signature}',
+            max_age=max_age or settings.MEDIA_SIGNATURE_MAX_AGE
+        )
+    except BadSignature:
+        return False
+    return True
+
+
+def signed_media_url(name):
+    """
+    URL of a private file that works without an auth header, for links
+    and emails, until MEDIA_SIGNATURE_MAX_AGE seconds have passed.
+    """
+    return settings.MEDIA_URL + name + '?' + urlencode(
+        {'signature': sign(name)}
+    )
+
+
+def can_read(request, name):
+    """True if the request may read the stored file 'name'."""
+    if not is_private(name):
+        return True
+    signature = request.GET.get('signature')
+    if signature:
+        return valid_signature(name, signature)
+    try:
+        user_auth = CachedTokenAuthentication().authenticate(request)
+    except AuthenticationFailed:
+        return False
+    if user_auth is None:
+        return False
+    user = user_auth[0]
+    owner = name.split('/')[1] if name.count('/') > 1 else None
+    return user.is_staff or str(user.pk) == owner
+
+
+def media_response(name, filename=None):
+    """
+    Response for the stored file 'name', which the caller has authorized.
+    The transfer is handed to nginx with X-Accel-Redirect so no worker
+    streams file bytes; files are streamed from Django only when
+    MEDIA_ACCEL_REDIRECT is unset, in development. Pass filename to have
+    the file downloaded under that name.
+    """
+    content_type = mimetypes.guess_type(name)[0] or \
+        'application/octet-stream'
+    if settings.MEDIA_ACCEL_REDIRECT:
+        response = HttpResponse(content_type=content_type)
+        response['X-Accel-Redirect'] = \
+            settings.MEDIA_ACCEL_REDIRECT + quote(name)
+    else:
+        try:
+            file = open(os.path.join(settings.MEDIA_ROOT, name), 'rb')
+        except (FileNotFoundError, IsADirectoryError):
+            raise Http404
+        response = FileResponse(file, content_type=content_type)
+    if filename:
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+
+    if is_private(name):
+        patch_cache_control(response, private=True, no_cache=True)
+    else:
+        # Uploads are named by content hash and never change.
+        patch_cache_control(
+            response, public=True, max_age=31536000, immutable=True
+        )
+    return response
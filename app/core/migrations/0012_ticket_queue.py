@@ -0,0 +1,41 @@
+# Generated by Django 2.2.28 on 2026-10-19 13:10
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_auto_20191210_1253'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tickettype',
+            name='queue_enabled',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='tickettype',
+            name='queue_rate',
+            field=models.PositiveIntegerField(default=100),
+        ),
+        migrations.CreateModel(
+            name='QueueToken',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('admitted_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('position', models.PositiveIntegerField()),
+                ('token', models.CharField(max_length=32, unique=True)),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='queue_tokens', to=settings.AUTH_USER_MODEL)),
+                ('ticket_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='queue_tokens', to='core.TicketType')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='queuetoken',
+            index=models.Index(fields=['ticket_type', 'position'], name='core_queuet_ticket__dc9bc1_idx'),
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 2.2.28 on 2026-10-19 13:12
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def create_opening_balances(apps, schema_editor):
+    """Record each existing balance as the user's first ledger entry."""
+    User = apps.get_model('core', 'User')
+    CreditEntry = apps.get_model('core', 'CreditEntry')
+    users = User.objects.exclude(credit=0).values_list('pk', 'credit')
+    entries = [
+        CreditEntry(
+            user_id=pk,
+            amount=credit,
+            kind='adjustment',
+            description='Opening balance'
+        )
+        for pk, credit in users.iterator()
+    ]
+    CreditEntry.objects.bulk_create(entries, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_ticket_queue'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CreditEntry',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=8)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('description', models.CharField(blank=True, max_length=255)),
+                ('kind', models.CharField(choices=[('payment', 'Payment'), ('purchase', 'Purchase'), ('transfer', 'Transfer'), ('adjustment', 'Adjustment')], max_length=255)),
+                ('ticket', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='credit_entries', to='core.Ticket')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='credit_entries', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.RunPython(
+            create_opening_balances, migrations.RunPython.noop
+        ),
+    ]
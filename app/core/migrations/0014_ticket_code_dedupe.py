@@ -0,0 +1,43 @@
+# Generated by Django 2.2.28 on 2026-10-19 13:13
+
+import secrets
+
+from django.db import migrations
+from django.db.models import Count
+
+CODE_ALPHABET = 'abcdefghijkmnopqrstuvwxyz123456789'
+
+
+def reassign_duplicate_codes(apps, schema_editor):
+    """
+    Give a fresh code to every ticket that shares its (truncated) code with
+    an older ticket, so that the unique index can be created.
+    """
+    Ticket = apps.get_model('core', 'Ticket')
+    duplicates = Ticket.objects.values('code').annotate(
+        total=Count('pk')
+    ).filter(total__gt=1).values_list('code', flat=True)
+    taken = set(Ticket.objects.values_list('code', flat=True).iterator())
+    for code in list(duplicates):
+        tickets = Ticket.objects.filter(code=code).order_by('pk')[1:]
+        for ticket in tickets:
+            new_code = code
+            while new_code in taken:
+                new_code = ''.join(
+                    secrets.choice(CODE_ALPHABET) for _ in range(6)
+                )
+            taken.add(new_code)
+            Ticket.objects.filter(pk=ticket.pk).update(code=new_code)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013_creditentry'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            reassign_duplicate_codes, migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 2.2.28 on 2026-10-19 13:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0014_ticket_code_dedupe'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='ticket',
+            name='code',
+            field=models.CharField(max_length=6, unique=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 2.2.28 on 2026-10-19 13:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0015_ticket_code_unique'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ticket',
+            name='checked_in_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
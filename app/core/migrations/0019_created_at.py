@@ -0,0 +1,23 @@
+# Generated by Django 2.2.28 on 2026-10-19 13:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0018_rollups'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='message',
+            name='created_at',
+            field=models.DateTimeField(db_index=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='ticket',
+            name='created_at',
+            field=models.DateTimeField(db_index=True, null=True),
+        ),
+    ]
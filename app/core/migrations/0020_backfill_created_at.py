@@ -0,0 +1,48 @@
+# Generated by Django 2.2.28 on 2026-10-19 13:30
+
+from datetime import datetime
+
+from django.db import migrations
+from django.utils import timezone
+
+CHUNK_SIZE = 2000
+
+
+def backfill_created_at(apps, schema_editor):
+    """
+    Combine created_date and created_time into created_at.
+    Rows are updated in primary key chunks, each committed on its own, so
+    large tables are never locked in one long transaction.
+    """
+    for model_name in ('Message', 'Ticket'):
+        model = apps.get_model('core', model_name)
+        last_pk = 0
+        while True:
+            rows = list(
+                model.objects.filter(
+                    pk__gt=last_pk, created_at__isnull=True
+                ).order_by('pk').only(
+                    'pk', 'created_date', 'created_time'
+                )[:CHUNK_SIZE]
+            )
+            if not rows:
+                break
+            for row in rows:
+                row.created_at = timezone.make_aware(
+                    datetime.combine(row.created_date, row.created_time),
+                    timezone.utc
+                )
+            model.objects.bulk_update(rows, ['created_at'])
+            last_pk = rows[-1].pk
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('core', '0019_created_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_created_at, migrations.RunPython.noop),
+    ]
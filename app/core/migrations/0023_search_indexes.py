@@ -0,0 +1,71 @@
+from django.db import migrations
+
+# Mirrors core.search.SEARCH_VECTOR_FIELDS at the time of this migration.
+# Artist and promoter names live on the parent core_user row.
+SEARCH_VECTORS = {
+    'core_venue': (
+        ('core_venue.name', 'A'), ('core_venue.address_city', 'B'),
+        ('core_venue.address_line1', 'C'), ('core_venue.address_line2', 'C'),
+        ('core_venue.address_state', 'C'), ('core_venue.address_country', 'C'),
+        ('core_venue.address_zip', 'C'), ('core_venue.description', 'D'),
+    ),
+    'core_event': (
+        ('core_event.name', 'A'), ('core_event.description', 'D'),
+    ),
+    'core_artist': (
+        ('core_user.name', 'A'), ('core_artist.description', 'D'),
+    ),
+    'core_promoter': (
+        ('core_user.name', 'A'), ('core_promoter.description', 'D'),
+    ),
+}
+
+
+def vector_sql(columns):
+    """SQL expression matching core.search.build_search_vector."""
+    return ' || '.join(
+        f"setweight(to_tsvector('simple', coalesce({column}, '')), "
+        f"'{weight}')"
+        for column, weight in columns
+    )
+
+
+def create_search_indexes(apps, schema_editor):
+    """Create the GIN indexes and fill existing search vectors."""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for table, columns in SEARCH_VECTORS.items():
+        sql = f'UPDATE {table} SET search_vector = {vector_sql(columns)}'
+        if table in ('core_artist', 'core_promoter'):
+            sql += f' FROM core_user WHERE core_user.id = {table}.user_ptr_id'
+        schema_editor.execute(sql)
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {table}_search_vector_gin '
+            f'ON {table} USING gin (search_vector)'
+        )
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS core_user_name_trgm '
+        'ON core_user USING gin (name gin_trgm_ops)'
+    )
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for table in SEARCH_VECTORS:
+        schema_editor.execute(
+            f'DROP INDEX IF EXISTS {table}_search_vector_gin'
+        )
+    schema_editor.execute('DROP INDEX IF EXISTS core_user_name_trgm')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0022_search_vector'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
@@ -0,0 +1,125 @@
+# Generated by Django 2.2.28 on 2026-10-19 13:26
+
+import core.models
+from django.conf import settings
+import django.contrib.postgres.search
+from django.db import migrations, models
+import django.db.models.deletion
+
+PUBLIC_PROFILE_FIELDS = (
+    'name', 'slug', 'description', 'image', 'facebook', 'instagram',
+    'soundcloud', 'spotify', 'twitter', 'website', 'youtube'
+)
+CHUNK_SIZE = 2000
+
+
+def create_public_profiles(apps, schema_editor):
+    """Copy existing artists and promoters to public profiles."""
+    PublicProfile = apps.get_model('core', 'PublicProfile')
+    for model_name in ('Artist', 'Promoter'):
+        model = apps.get_model('core', model_name)
+        is_promoter = model_name == 'Promoter'
+        rows = model.objects.order_by('pk').values(
+            'pk', *PUBLIC_PROFILE_FIELDS,
+            *(('is_verified',) if is_promoter else ())
+        )
+        existing = set(PublicProfile.objects.values_list('pk', flat=True))
+        profiles = []
+        for row in rows.iterator(chunk_size=CHUNK_SIZE):
+            pk = row.pop('pk')
+            if pk in existing:
+                # Both an artist and a promoter: the promoter's fields win.
+                PublicProfile.objects.filter(pk=pk).update(
+                    is_promoter=True, **row
+                )
+                continue
+            profiles.append(PublicProfile(
+                user_id=pk,
+                is_artist=not is_promoter,
+                is_promoter=is_promoter,
+                **row
+            ))
+            if len(profiles) == CHUNK_SIZE:
+                PublicProfile.objects.bulk_create(profiles)
+                profiles = []
+        PublicProfile.objects.bulk_create(profiles)
+
+
+def create_search_indexes(apps, schema_editor):
+    """Move name search from the user table to public profiles."""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(
+        "UPDATE core_publicprofile SET search_vector = "
+        "setweight(to_tsvector('simple', coalesce(name, '')), 'A') || "
+        "setweight(to_tsvector('simple', coalesce(description, '')), 'D')"
+    )
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS core_publicprofile_search_vector_gin '
+        'ON core_publicprofile USING gin (search_vector)'
+    )
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS core_publicprofile_name_trgm '
+        'ON core_publicprofile USING gin (name gin_trgm_ops)'
+    )
+    schema_editor.execute('DROP INDEX IF EXISTS core_user_name_trgm')
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(
+        'DROP INDEX IF EXISTS core_publicprofile_search_vector_gin'
+    )
+    schema_editor.execute('DROP INDEX IF EXISTS core_publicprofile_name_trgm')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0023_search_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PublicProfile',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='public_profile', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('description', models.CharField(blank=True, max_length=1000)),
+                ('image', models.ImageField(blank=True, null=True, upload_to=core.models.image_file_path)),
+                ('is_artist', models.BooleanField(default=False)),
+                ('is_promoter', models.BooleanField(default=False)),
+                ('is_verified', models.BooleanField(default=False)),
+                ('name', models.CharField(max_length=255)),
+                ('search_vector', django.contrib.postgres.search.SearchVectorField(editable=False, null=True)),
+                ('slug', models.SlugField()),
+                ('facebook', models.URLField(blank=True)),
+                ('instagram', models.URLField(blank=True)),
+                ('soundcloud', models.URLField(blank=True)),
+                ('spotify', models.URLField(blank=True)),
+                ('twitter', models.URLField(blank=True)),
+                ('website', models.URLField(blank=True)),
+                ('youtube', models.URLField(blank=True)),
+            ],
+        ),
+        migrations.RemoveField(
+            model_name='artist',
+            name='search_vector',
+        ),
+        migrations.RemoveField(
+            model_name='promoter',
+            name='search_vector',
+        ),
+        migrations.AddIndex(
+            model_name='publicprofile',
+            index=models.Index(fields=['is_artist', 'name'], name='core_public_is_arti_3b0365_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='publicprofile',
+            index=models.Index(fields=['is_promoter', 'is_verified', 'name'], name='core_public_is_prom_d31121_idx'),
+        ),
+        migrations.RunPython(
+            create_public_profiles, migrations.RunPython.noop
+        ),
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
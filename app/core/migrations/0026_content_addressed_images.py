@@ -0,0 +1,35 @@
+# Generated by Django 2.2.28 on 2026-10-19 13:52
+
+import core.models
+import core.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0025_image_variants'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='event',
+            name='image',
+            field=models.ImageField(blank=True, null=True, storage=core.storage.ContentAddressedStorage(), upload_to=core.models.image_file_path),
+        ),
+        migrations.AlterField(
+            model_name='publicprofile',
+            name='image',
+            field=models.ImageField(blank=True, null=True, storage=core.storage.ContentAddressedStorage(), upload_to=core.models.image_file_path),
+        ),
+        migrations.AlterField(
+            model_name='user',
+            name='image',
+            field=models.ImageField(blank=True, null=True, storage=core.storage.ContentAddressedStorage(), upload_to=core.models.image_file_path),
+        ),
+        migrations.AlterField(
+            model_name='venue',
+            name='image',
+            field=models.ImageField(blank=True, null=True, storage=core.storage.ContentAddressedStorage(), upload_to=core.models.image_file_path),
+        ),
+    ]
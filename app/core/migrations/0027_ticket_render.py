@@ -0,0 +1,23 @@
+# Generated by Django 2.2.28 on 2026-10-19 13:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0026_content_addressed_images'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ticket',
+            name='render_requested_at',
+            field=models.DateTimeField(blank=True, db_index=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='ticket',
+            name='rendered',
+            field=models.CharField(blank=True, editable=False, max_length=100),
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 2.2.28 on 2026-10-19 14:00
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0027_ticket_render'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventSeries',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('description', models.CharField(blank=True, max_length=1000)),
+                ('end_time', models.TimeField()),
+                ('ends_on', models.DateField(blank=True, null=True)),
+                ('frequency', models.CharField(choices=[('weekly', 'Weekly'), ('monthly', 'Monthly')], max_length=255)),
+                ('interval', models.PositiveSmallIntegerField(default=1)),
+                ('materialized_until', models.DateField(blank=True, editable=False, null=True)),
+                ('name', models.CharField(max_length=255)),
+                ('start_time', models.TimeField()),
+                ('starts_on', models.DateField()),
+                ('artists', models.ManyToManyField(blank=True, related_name='event_series', to='core.Artist')),
+                ('promoter', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='event_series', to='core.Promoter')),
+                ('venue', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='event_series', to='core.Venue')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='SeriesTicketType',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255)),
+                ('price', models.DecimalField(decimal_places=2, max_digits=8)),
+                ('queue_enabled', models.BooleanField(default=False)),
+                ('queue_rate', models.PositiveIntegerField(default=100)),
+                ('tickets_remaining', models.IntegerField(blank=True, null=True)),
+                ('series', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ticket_types', to='core.EventSeries')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='series',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='events', to='core.EventSeries'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='event',
+            unique_together={('series', 'start_date')},
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 2.2.28 on 2026-10-19 14:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0028_event_series'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='queuetoken',
+            name='used_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 2.2.28 on 2026-10-19 14:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0029_queuetoken_used_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='creditentry',
+            name='charge_id',
+            field=models.CharField(blank=True, max_length=255, null=True, unique=True),
+        ),
+    ]
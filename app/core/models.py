@@ -1,9 +1,18 @@
 import uuid
 import os
+import secrets
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from functools import lru_cache
 from random import randint
 
-from django.db import models
+from django.contrib.postgres.search import SearchVectorField
+from django.db import connection, models, transaction, IntegrityError
+from django.db.models import Case, Exists, F, Max, OuterRef, Value, When
 from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
 from django.template.defaultfilters import slugify
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager, \
      PermissionsMixin
@@ -12,7 +21,24 @@ from django.contrib.auth import get_user_model
 from phonenumber_field.modelfields import PhoneNumberField
 from hashids import Hashids
 
+from core.authentication import invalidate_cached_users
 from core.email import Email
+from core.search import build_search_vector
+from core.storage import ContentAddressedStorage
+from core.suggest import update_index_many
+from core.tickets import ticket_link
+
+
+# Artist and promoter columns shown publicly, copied to PublicProfile.
+PUBLIC_PROFILE_FIELDS = (
+    'name', 'slug', 'description', 'image', 'image_height',
+    'image_processed', 'image_width', 'facebook', 'instagram', 'soundcloud',
+    'spotify', 'twitter', 'website', 'youtube'
+)
+
+
+# Uploaded images, stored once per distinct content.
+upload_storage = ContentAddressedStorage()
 
 
 def image_file_path(instance, filename):
@@ -31,17 +57,66 @@ def signup_check(email, password, name):
     if not name:
         raise ValueError('Enter a name.')
 
-def create_code(pk, n):
-    """Helper function to create ticket codes."""
-    hashids = Hashids(
+
+CODE_ALPHABET = 'abcdefghijkmnopqrstuvwxyz123456789'
+
+
+@lru_cache(maxsize=None)
+def get_hashids(n):
+    """Helper function to build (once) the encoder for n-character codes."""
+    return Hashids(
         salt=settings.SECRET_KEY,
         min_length=n,
-        alphabet='abcdefghijkmnopqrstuvwxyz123456789'
+        alphabet=CODE_ALPHABET
     )
-    code = hashids.encode(pk)[:n]
+
+
+def create_code(pk, n):
+    """Helper function to create codes."""
+    code = get_hashids(n).encode(pk)[:n]
     return code
 
 
+def random_code(n):
+    """Helper function to create a random n-character ticket code."""
+    return ''.join(secrets.choice(CODE_ALPHABET) for _ in range(n))
+
+
+def queue_position_key(ticket_type_pk):
+    """Cache key for the last position handed out in a ticket queue."""
+    return f'queue-position-{ticket_type_pk}'
+
+
+def queue_admitted_key(ticket_type_pk):
+    """Cache key for the last position admitted from a ticket queue."""
+    return f'queue-admitted-{ticket_type_pk}'
+
+
+def live_results_key(event_pk):
+    """Cache key for an event's live vote results."""
+    return f'live-results-{event_pk}'
+
+
+def nth_weekday(first, months):
+    """
+    The date 'months' after 'first' on the same weekday of the month
+    (the first Friday, the third Saturday...), or None if that month has
+    no such day.
+    """
+    year, month = divmod(first.month - 1 + months, 12)
+    month_start = date(first.year + year, month + 1, 1)
+    day = month_start + timedelta(
+        days=(first.weekday() - month_start.weekday()) % 7,
+        weeks=(first.day - 1) // 7
+    )
+    return day if day.month == month_start.month else None
+
+
+def queue_token_key(token):
+    """Cache key for a queue token's (ticket type, position) pair."""
+    return f'queue-token-{token}'
+
+
 class UserManager(BaseUserManager):
 
     def create_user(self, email, password, name, **extra_fields):
@@ -151,6 +226,34 @@ class PromoterManager(BaseUserManager):
         return promoter
 
 
+class PublicProfileManager(BaseUserManager):
+
+    def sync(self, user_pk):
+        """
+        Copies a user's public artist or promoter fields to their profile.
+        The profile is deleted if the user is neither.
+        """
+        artist = Artist.objects.filter(pk=user_pk).first()
+        promoter = Promoter.objects.filter(pk=user_pk).first()
+        source = promoter or artist
+        if source is None:
+            self.filter(user_id=user_pk).delete()
+            return None
+        defaults = {
+            field: getattr(source, field) for field in PUBLIC_PROFILE_FIELDS
+        }
+        profile, _ = self.update_or_create(
+            user_id=user_pk,
+            defaults=dict(
+                defaults,
+                is_artist=artist is not None,
+                is_promoter=promoter is not None,
+                is_verified=bool(promoter and promoter.is_verified),
+            )
+        )
+        return profile
+
+
 class MessageManager(BaseUserManager):
 
     def create_message(self, subject, text, **extra_fields):
@@ -236,6 +339,125 @@ class EventManager(BaseUserManager):
         return event[0]
 
 
+class EventSeriesManager(BaseUserManager):
+
+    def create_series(self, end_time, frequency, name, promoter, start_time,
+                      starts_on, venue, artists=(), ticket_types=(),
+                      **extra_fields):
+        """
+        Creates and saves a new event series with its lineup and ticket
+        types, and creates its events up to the horizon.
+        """
+        if not end_time:
+            raise ValueError('Enter an end time.')
+        if frequency not in dict(EventSeries.FREQUENCY_CHOICES):
+            raise ValueError('Enter a valid frequency.')
+        if extra_fields.get('interval', 1) < 1:
+            raise ValueError('Enter an interval of at least 1.')
+        if not name:
+            raise ValueError('Enter a name.')
+        if not start_time:
+            raise ValueError('Enter a start time.')
+        if not starts_on:
+            raise ValueError('Enter a start date.')
+        if not venue:
+            raise ValueError('Enter a venue.')
+        with transaction.atomic():
+            series = self.create(
+                end_time=end_time,
+                frequency=frequency,
+                name=name,
+                promoter=promoter,
+                start_time=start_time,
+                starts_on=starts_on,
+                venue=venue,
+                **extra_fields
+            )
+            series.artists.set(artists)
+            SeriesTicketType.objects.bulk_create([
+                SeriesTicketType(series=series, **ticket_type)
+                for ticket_type in ticket_types
+            ])
+            self.extend_series(series)
+            series.refresh_from_db(fields=['materialized_until'])
+            emails = [artist.email for artist in artists]
+            if emails:
+                transaction.on_commit(
+                    lambda: Email('artist_added', emails).send_bulk()
+                )
+        return series
+
+    def extend_series(self, series, until=None):
+        """
+        Creates a series' events up to 'until' (by default
+        EVENT_SERIES_HORIZON days ahead), with their lineups and ticket
+        types, in one transaction. Returns the new events.
+        """
+        until = until or timezone.localdate() + timedelta(
+            days=settings.EVENT_SERIES_HORIZON
+        )
+        with transaction.atomic():
+            series = self.select_for_update().get(pk=series.pk)
+            dates = series.occurrences(series.materialized_until, until)
+            if not dates:
+                return []
+            Event.objects.bulk_create([
+                Event(
+                    description=series.description,
+                    # Nights that finish after midnight end the next day.
+                    end_date=day + timedelta(
+                        days=series.end_time <= series.start_time
+                    ),
+                    end_time=series.end_time,
+                    name=series.name,
+                    promoter_id=series.promoter_id,
+                    series=series,
+                    start_date=day,
+                    start_time=series.start_time,
+                    venue_id=series.venue_id
+                )
+                for day in dates
+            ])
+            # Primary keys are only returned by bulk_create on PostgreSQL.
+            events = list(
+                Event.objects.filter(series=series, start_date__in=dates)
+            )
+            artists = list(series.artists.all())
+            ticket_types = list(series.ticket_types.all())
+            Tally.objects.bulk_create([
+                Tally(
+                    artist=artist,
+                    event=event,
+                    slug=slugify(str(event.pk) + '-' + str(artist))
+                )
+                for event in events for artist in artists
+            ])
+            TicketType.objects.bulk_create([
+                TicketType(
+                    event=event,
+                    name=ticket_type.name,
+                    price=ticket_type.price,
+                    queue_enabled=ticket_type.queue_enabled,
+                    queue_rate=ticket_type.queue_rate,
+                    slug=slugify(str(event.pk) + '-' + ticket_type.name),
+                    tickets_remaining=ticket_type.tickets_remaining
+                )
+                for event in events for ticket_type in ticket_types
+            ])
+            series.materialized_until = dates[-1]
+            series.save(update_fields=['materialized_until'])
+
+            # bulk_create sends no post_save, so do what its receivers do.
+            # Every event has the series' name and description.
+            if connection.vendor == 'postgresql':
+                Event.objects.filter(pk__in=[e.pk for e in events]).update(
+                    search_vector=build_search_vector(events[0])
+                )
+            names = {event.pk: event.name for event in events}
+            transaction.on_commit(lambda: update_index_many('event', names))
+        return events
+
+
 class TallyManager(BaseUserManager):
 
     def create_tally(self, artist, event, **extra_fields):
@@ -254,6 +476,47 @@ class TallyManager(BaseUserManager):
         Email('artist_added', artist.email).send()
         return tally[0]
 
+    def create_lineup(self, event, artist_slugs):
+        """
+        Adds artists to an event's lineup in bulk and returns the new
+        tallies. Artists already on the lineup are skipped. The artists
+        are checked in one query, and their artist_added emails are sent
+        together once the tallies are committed.
+        """
+        if not event:
+            raise ValueError('Enter an event.')
+        if not artist_slugs:
+            raise ValueError('Enter some artists.')
+        artists = {
+            artist.slug: artist
+            for artist in Artist.objects.filter(
+                slug__in=artist_slugs
+            ).annotate(on_lineup=Exists(
+                Tally.objects.filter(event=event, artist=OuterRef('pk'))
+            ))
+        }
+        unknown = [slug for slug in artist_slugs if slug not in artists]
+        if unknown:
+            raise ValueError('Unknown artists: ' + ', '.join(unknown) + '.')
+        new_artists = [
+            artists.pop(slug) for slug in artist_slugs
+            if slug in artists and not artists[slug].on_lineup
+        ]
+        tallies = self.bulk_create([
+            Tally(
+                artist=artist,
+                event=event,
+                slug=slugify(str(event.pk) + '-' + str(artist))
+            )
+            for artist in new_artists
+        ])
+        emails = [artist.email for artist in new_artists]
+        if emails:
+            transaction.on_commit(
+                lambda: Email('artist_added', emails).send_bulk()
+            )
+        return tallies
+
 
 class TicketTypeManager(BaseUserManager):
 
@@ -275,46 +538,474 @@ class TicketTypeManager(BaseUserManager):
         ticket_type[0].save(using=self._db)
         return ticket_type[0]
 
+    def create_ticket_types(self, event, ticket_types):
+        """
+        Creates and saves several ticket types for an event, from a list
+        of dicts of their fields, checking the names are new in one query.
+        """
+        if not event:
+            raise ValueError('Enter an event.')
+        if not ticket_types:
+            raise ValueError('Enter some ticket types.')
+        for ticket_type in ticket_types:
+            if not ticket_type.get('name'):
+                raise ValueError('Enter a name.')
+            if not ticket_type.get('price'):
+                raise ValueError('Enter a price.')
+        slugs = [
+            slugify(str(event.pk) + '-' + ticket_type['name'])
+            for ticket_type in ticket_types
+        ]
+        if len(set(slugs)) < len(slugs):
+            raise ValueError('Enter each ticket type once.')
+        taken = list(self.filter(event=event, slug__in=slugs).values_list(
+            'name', flat=True
+        ))
+        if taken:
+            raise ValueError(
+                'Ticket types already exist: ' + ', '.join(taken) + '.'
+            )
+        return self.bulk_create([
+            TicketType(event=event, slug=slug, **ticket_type)
+            for slug, ticket_type in zip(slugs, ticket_types)
+        ])
+
+
+class QueueTokenManager(BaseUserManager):
+
+    def join_queue(self, ticket_type, owner, **extra_fields):
+        """Creates and saves a new queue token at the back of the queue."""
+        if not ticket_type:
+            raise ValueError('Enter a ticket type.')
+        if not owner:
+            raise ValueError('Enter an owner.')
+        if not ticket_type.queue_enabled:
+            raise ValueError('This ticket type does not have a queue.')
+        queue_token = QueueToken.objects.filter(
+            ticket_type=ticket_type, owner=owner
+        ).order_by('-position').first()
+        if queue_token is not None and queue_token.used_at is None and \
+                not queue_token.is_expired():
+            return queue_token
+        key = queue_position_key(ticket_type.pk)
+        try:
+            position = cache.incr(key)
+        except ValueError:
+            # The counter was never set or has been evicted, so seed it
+            # from the last position handed out.
+            last_position = QueueToken.objects.filter(
+                ticket_type=ticket_type
+            ).aggregate(Max('position'))['position__max']
+            cache.add(key, last_position or 0, timeout=None)
+            position = cache.incr(key)
+        queue_token = QueueToken.objects.create(
+            ticket_type=ticket_type,
+            owner=owner,
+            position=position,
+            token=uuid.uuid4().hex,
+            **extra_fields
+        )
+        cache.set(
+            queue_token_key(queue_token.token),
+            (ticket_type.pk, position),
+            timeout=None
+        )
+        return queue_token
+
+    def admit_queue_tokens(self, ticket_type, count):
+        """Admits the next tokens waiting in a ticket type's queue."""
+        waiting = list(
+            QueueToken.objects.filter(
+                ticket_type=ticket_type, admitted_at__isnull=True
+            ).order_by('position').values_list('pk', 'position')[:count]
+        )
+        if not waiting:
+            return 0
+        QueueToken.objects.filter(
+            pk__in=[pk for pk, position in waiting]
+        ).update(admitted_at=timezone.now())
+        cache.set(
+            queue_admitted_key(ticket_type.pk), waiting[-1][1], timeout=None
+        )
+        return len(waiting)
+
+    def queue_status(self, token):
+        """
+        Returns the position of a token and how many buyers are ahead of it.
+        Served from the cache, so polling does not touch the database.
+        """
+        entry = cache.get(queue_token_key(token))
+        if entry is None:
+            queue_token = QueueToken.objects.get(token=token)
+            entry = (queue_token.ticket_type_id, queue_token.position)
+            cache.set(queue_token_key(token), entry, timeout=None)
+        ticket_type_pk, position = entry
+        admitted = cache.get(queue_admitted_key(ticket_type_pk))
+        if admitted is None:
+            admitted = QueueToken.objects.filter(
+                ticket_type_id=ticket_type_pk, admitted_at__isnull=False
+            ).aggregate(Max('position'))['position__max'] or 0
+            cache.set(
+                queue_admitted_key(ticket_type_pk), admitted, timeout=None
+            )
+        return {
+            'position': position,
+            'ahead': max(position - admitted - 1, 0),
+            'admitted': position <= admitted,
+        }
+
+    def use_admission(self, token, ticket_type, owner):
+        """
+        Uses up an admitted token for one purchase of this ticket type,
+        raising an error unless it may reserve it. Call inside the
+        purchase's transaction: the token is locked until it commits, and
+        a purchase that fails leaves it unused.
+        """
+        if not token:
+            raise ValueError('Enter a queue token.')
+        queue_token = QueueToken.objects.select_for_update().filter(
+            token=token, ticket_type=ticket_type, owner=owner
+        ).first()
+        if queue_token is None:
+            raise ValueError('Invalid queue token.')
+        if queue_token.admitted_at is None:
+            raise ValueError('This queue token has not been admitted yet.')
+        if queue_token.is_expired():
+            raise ValueError('This queue token has expired.')
+        if queue_token.used_at is not None:
+            raise ValueError('This queue token has already been used.')
+        queue_token.used_at = timezone.now()
+        queue_token.save(update_fields=['used_at'])
+        return queue_token
+
 
 class TicketManager(BaseUserManager):
 
-    def create_ticket(self, ticket_type, owner=None, **extra_fields):
+    def check_in(self, event, codes, checked_in_at=None):
+        """
+        Checks in a batch of scanned ticket codes for an event.
+        Each ticket is claimed by a single UPDATE on its unique code guarded
+        by 'checked_in_at IS NULL', so concurrent scans of the same ticket
+        admit it once. Ticket types are only read, never locked.
+        'checked_in_at' backdates scans that were made offline, either as
+        one time for the batch or as a dict of code -> scan time.
+        Returns a dict of code -> (status, checked_in_at).
+        """
+        ticket_type_ids = list(
+            TicketType.objects.filter(event=event).values_list(
+                'pk', flat=True
+            )
+        )
+        if isinstance(checked_in_at, dict):
+            scanned = checked_in_at
+        else:
+            now = checked_in_at or timezone.now()
+            scanned = {code: now for code in codes}
+        times = set(scanned.values())
+        if len(times) > 1:
+            checked_in_at = Case(
+                *[
+                    When(code=code, then=Value(when))
+                    for code, when in scanned.items()
+                ],
+                output_field=models.DateTimeField()
+            )
+        else:
+            checked_in_at = next(iter(times), None)
+        # The rows claimed here are told apart by their 'updated_at', so a
+        # replayed upload reports its tickets as already checked in.
+        claimed_at = timezone.now()
+        Ticket.objects.filter(
+            code__in=codes,
+            ticket_type_id__in=ticket_type_ids,
+            checked_in_at__isnull=True
+        ).update(checked_in_at=checked_in_at, updated_at=claimed_at)
+        found = Ticket.objects.filter(code__in=codes).values_list(
+            'code', 'ticket_type_id', 'checked_in_at', 'updated_at'
+        )
+        results = {code: (Ticket.INVALID, None) for code in codes}
+        for code, ticket_type_id, checked_in_at, updated_at in found:
+            if ticket_type_id not in ticket_type_ids:
+                results[code] = (Ticket.WRONG_EVENT, None)
+            elif updated_at == claimed_at:
+                results[code] = (Ticket.ADMITTED, checked_in_at)
+            else:
+                results[code] = (Ticket.ALREADY_CHECKED_IN, checked_in_at)
+        return results
+
+    def door_list(self, event, since=None):
+        """
+        Returns the version of an event's door list and an iterator of
+        (code, checked_in) rows sorted by code.
+        The version is the latest change to any of the event's tickets, in
+        microseconds since the epoch. With 'since', only tickets changed
+        after that version are included (plus a small overlap, so that rows
+        committed late with an older timestamp are not missed).
+        """
+        tickets = Ticket.objects.filter(ticket_type__event=event)
+        latest = tickets.aggregate(Max('updated_at'))['updated_at__max']
+        if latest is None:
+            return 0, iter(())
+        version = int(latest.timestamp() * 1000000)
+        tickets = tickets.filter(updated_at__lte=latest)
+        if since:
+            changed_after = datetime.fromtimestamp(
+                since / 1000000, tz=timezone.utc
+            ) - timedelta(seconds=settings.DOOR_LIST_OVERLAP)
+            tickets = tickets.filter(updated_at__gt=changed_after)
+        rows = tickets.order_by('code').values_list(
+            'code', 'checked_in_at'
+        ).iterator(chunk_size=2000)
+        return version, (
+            (code, checked_in_at is not None) for code, checked_in_at in rows
+        )
+
+    def generate_codes(self, count, n=6, batch_size=900):
+        """
+        Generates unused ticket codes ahead of insertion.
+        Candidates are checked against existing codes in batches; the unique
+        index on Ticket.code catches a concurrent insert of the same code.
+        """
+        codes = set()
+        while len(codes) < count:
+            candidates = list({
+                random_code(n) for _ in range(count - len(codes))
+            } - codes)
+            for i in range(0, len(candidates), batch_size):
+                batch = candidates[i:i + batch_size]
+                taken = Ticket.objects.filter(
+                    code__in=batch
+                ).values_list('code', flat=True)
+                codes.update(set(batch).difference(taken))
+        return list(codes)
+
+    def create_ticket(self, ticket_type, owner=None, queue_token=None,
+                      **extra_fields):
         """Creates and saves a new ticket."""
+        return self.create_tickets(
+            ticket_type, 1, owner, queue_token, **extra_fields
+        )[0]
+
+    def create_tickets(self, ticket_type, quantity, owner=None,
+                       queue_token=None, **extra_fields):
+        """
+        Creates and saves 'quantity' tickets bought together.
+        A queued ticket type needs the buyer's admitted queue token, which
+        the purchase uses up. Tickets without an owner are issued by the
+        event's promoter from the dashboard and skip the queue, which only
+        holds back public buyers.
+        """
         if not ticket_type:
             raise ValueError('Enter a ticket type.')
-        if ticket_type.tickets_remaining < 1:
-            raise ValueError(
-                'Insufficient tickets remaining.'
-            )
         promoter = ticket_type.event.promoter
         if owner is not None:
             issuer = owner
         else:
             issuer = promoter
-        if ticket_type.price > issuer.credit:
-            raise ValueError(
-                'Insufficient credit.'
-            )
-        ticket_type.tickets_remaining -= 1
-        issuer.credit = issuer.credit - ticket_type.price
-        if owner is not None:
-            promoter.credit = promoter.credit + ticket_type.price
-        ticket = Ticket.objects.create(
-            ticket_type=ticket_type,
-            owner=issuer,
-            **extra_fields
-        )
-        ticket_type.save(using=self._db)
-        ticket.save(using=self._db)
-        issuer.save(using=self._db)
-        ticket.code = create_code(ticket.pk, 6)
-        ticket.save(using=self._db)
-        if owner is not None:
-            promoter.save(using=self._db)
-            if not owner.is_promoter:
-                dynamic_template_data = {'code': ticket.code}
+        # The balance is checked by CreditEntry.objects.record against the
+        # database, as 'issuer' may be older than a payment just recorded.
+        tickets = []
+        with transaction.atomic(using=self._db):
+            if ticket_type.queue_enabled and owner is not None:
+                QueueToken.objects.use_admission(
+                    queue_token, ticket_type, owner
+                )
+            # Stock is taken in the database, as 'ticket_type' may be older
+            # than another purchase of the same type.
+            if not TicketType.objects.using(self._db).filter(
+                pk=ticket_type.pk, tickets_remaining__gte=quantity
+            ).update(tickets_remaining=F('tickets_remaining') - quantity):
+                raise ValueError('Insufficient tickets remaining.')
+            for code in self.generate_codes(quantity):
+                for attempt in range(3):
+                    try:
+                        with transaction.atomic(using=self._db):
+                            ticket = Ticket.objects.create(
+                                code=code,
+                                ticket_type=ticket_type,
+                                owner=issuer,
+                                **extra_fields
+                            )
+                        break
+                    except IntegrityError:
+                        # Another ticket took the same code in the meantime.
+                        if attempt == 2:
+                            raise
+                        code = self.generate_codes(1)[0]
+                tickets.append(ticket)
+                if ticket_type.price:
+                    entries = [CreditEntry(
+                        user=issuer,
+                        amount=-ticket_type.price,
+                        kind=CreditEntry.PURCHASE,
+                        ticket=ticket
+                    )]
+                    if owner is not None:
+                        entries.append(CreditEntry(
+                            user=promoter,
+                            amount=ticket_type.price,
+                            kind=CreditEntry.TRANSFER,
+                            ticket=ticket
+                        ))
+                    CreditEntry.objects.record(entries)
+                SalesRollup.objects.record_sale(ticket_type)
+                if ticket.vote_id is not None:
+                    VoteRollup.objects.record_vote(
+                        ticket.vote, ticket_type.price
+                    )
+        if owner is not None and not owner.is_promoter:
+            for ticket in tickets:
+                dynamic_template_data = {
+                    'code': ticket.code,
+                    'pdf_url': ticket_link(ticket.code),
+                }
                 Email('ticket', owner.email, dynamic_template_data).send()
-        return ticket
+        return tickets
+
+    def request_render(self, tickets):
+        """
+        Queues a queryset of tickets for the render_tickets worker.
+        Returns the number newly queued.
+        """
+        return tickets.filter(render_requested_at__isnull=True).update(
+            render_requested_at=timezone.now()
+        )
+
+    def mark_rendered(self, ticket, stem):
+        """Records a ticket's rendered files, unless it was queued again."""
+        return self.filter(
+            pk=ticket.pk, render_requested_at=ticket.render_requested_at
+        ).update(rendered=stem, render_requested_at=None)
+
+
+class SalesRollupManager(BaseUserManager):
+
+    def record_sale(self, ticket_type, sold_at=None):
+        """Adds a ticket sale to its ticket type's hourly rollup."""
+        sold_at = sold_at or timezone.now()
+        hour = sold_at.replace(minute=0, second=0, microsecond=0)
+        rollups = SalesRollup.objects.filter(
+            ticket_type=ticket_type, hour=hour
+        )
+        changes = {
+            'tickets': F('tickets') + 1,
+            'revenue': F('revenue') + ticket_type.price,
+        }
+        if rollups.update(**changes):
+            return
+        try:
+            with transaction.atomic(using=self._db):
+                SalesRollup.objects.create(
+                    event_id=ticket_type.event_id,
+                    ticket_type=ticket_type,
+                    hour=hour,
+                    tickets=1,
+                    revenue=ticket_type.price
+                )
+        except IntegrityError:
+            # A concurrent sale created this hour's row first.
+            rollups.update(**changes)
+
+
+class VoteRollupManager(BaseUserManager):
+
+    def record_vote(self, tally, points):
+        """Adds a vote to its tally's rollup."""
+        rollups = VoteRollup.objects.filter(tally=tally)
+        changes = {'votes': F('votes') + 1, 'points': F('points') + points}
+        if rollups.update(**changes):
+            return
+        try:
+            with transaction.atomic(using=self._db):
+                VoteRollup.objects.create(
+                    event_id=tally.event_id,
+                    tally=tally,
+                    votes=1,
+                    points=points
+                )
+        except IntegrityError:
+            rollups.update(**changes)
+
+    def live_results(self, event_pk):
+        """
+        Returns an event's live results from the cache, building them on a
+        miss. Returns None if the event does not exist.
+        """
+        results = cache.get(live_results_key(event_pk))
+        if results is None:
+            results = self.publish_results(event_pk)
+        return results
+
+    def publish_results(self, event_pk):
+        """
+        Rebuilds an event's live results from its vote rollups and caches
+        them under a new version for watchers to pick up.
+        """
+        tallies = Tally.objects.filter(event_id=event_pk).values_list(
+            'slug', 'artist__name', 'vote_rollup__votes', 'vote_rollup__points'
+        )
+        if not tallies and not Event.objects.filter(pk=event_pk).exists():
+            return None
+        previous = cache.get(live_results_key(event_pk)) or {'version': 0}
+        results = {
+            'event': event_pk,
+            'version': max(
+                int(timezone.now().timestamp() * 1000000),
+                previous['version'] + 1
+            ),
+            'tallies': sorted((
+                {
+                    'tally': slug,
+                    'artist': artist,
+                    'votes': votes or 0,
+                    'points': str(points or Decimal('0.00')),
+                }
+                for slug, artist, votes, points in tallies
+            ), key=lambda row: (-Decimal(row['points']), row['artist'])),
+        }
+        cache.set(live_results_key(event_pk), results, timeout=None)
+        return results
+
+
+class CreditEntryManager(BaseUserManager):
+
+    def record(self, entries):
+        """
+        Saves credit ledger entries and applies them to user balances.
+        Balances are moved with F() expressions so concurrent writers cannot
+        lose updates, and a debit fails rather than overdrawing a user.
+        """
+        deltas = defaultdict(Decimal)
+        for entry in entries:
+            deltas[entry.user_id] += entry.amount
+        with transaction.atomic(using=self._db):
+            for user_id, delta in deltas.items():
+                users = User.objects.filter(pk=user_id)
+                if delta < 0:
+                    users = users.filter(credit__gte=-delta)
+                if not users.update(credit=F('credit') + delta):
+                    raise ValueError('Insufficient credit.')
+            # update() sends no signals, so drop cached users here.
+            user_pks = list(deltas)
+            transaction.on_commit(
+                lambda: invalidate_cached_users(user_pks), using=self._db
+            )
+            return self.bulk_create(entries)
+
+    def adjust_credit(self, user, credit, **extra_fields):
+        """Records an admin adjustment that sets a user's balance."""
+        with transaction.atomic(using=self._db):
+            current = User.objects.select_for_update().values_list(
+                'credit', flat=True
+            ).get(pk=user.pk)
+            entry = CreditEntry(
+                user=user,
+                amount=credit - current,
+                kind=CreditEntry.ADJUSTMENT,
+                **extra_fields
+            )
+            self.record([entry])
+        return entry
 
 
 class User(AbstractBaseUser, PermissionsMixin):
@@ -326,8 +1017,15 @@ class User(AbstractBaseUser, PermissionsMixin):
     credit = models.DecimalField(max_digits=8, decimal_places=2, default=0)
     email = models.EmailField(max_length=255, unique=True)
     image = models.ImageField(
-        null=True, blank=True, upload_to=image_file_path
+        null=True, blank=True, upload_to=image_file_path,
+        storage=upload_storage
     )
+    # Set by the process_images worker along with the image's variants.
+    image_height = models.PositiveIntegerField(null=True, editable=False)
+    image_processed = models.CharField(
+        max_length=100, blank=True, editable=False
+    )
+    image_width = models.PositiveIntegerField(null=True, editable=False)
     is_active = models.BooleanField(default=True)
     is_staff = models.BooleanField(default=False)
     name = models.CharField(max_length=255)
@@ -402,12 +1100,62 @@ class Promoter(User, PermissionsMixin):
         return self.name
 
 
+class PublicProfile(models.Model):
+    """
+    Read-only copy of an artist's or promoter's public fields.
+    Kept in step by signals so public lists and lookups read one narrow
+    table instead of joining the wide user table.
+    """
+    user = models.OneToOneField(
+        'User', on_delete=models.CASCADE, primary_key=True,
+        related_name='public_profile'
+    )
+    description = models.CharField(max_length=1000, blank=True)
+    image = models.ImageField(
+        null=True, blank=True, upload_to=image_file_path,
+        storage=upload_storage
+    )
+    image_height = models.PositiveIntegerField(null=True, editable=False)
+    image_processed = models.CharField(
+        max_length=100, blank=True, editable=False
+    )
+    image_width = models.PositiveIntegerField(null=True, editable=False)
+    is_artist = models.BooleanField(default=False)
+    is_promoter = models.BooleanField(default=False)
+    is_verified = models.BooleanField(default=False)
+    name = models.CharField(max_length=255)
+    search_vector = SearchVectorField(null=True, editable=False)
+    slug = models.SlugField()
+
+    # Contact
+    facebook = models.URLField(blank=True)
+    instagram = models.URLField(blank=True)
+    soundcloud = models.URLField(blank=True)
+    spotify = models.URLField(blank=True)
+    twitter = models.URLField(blank=True)
+    website = models.URLField(blank=True)
+    youtube = models.URLField(blank=True)
+
+    objects = PublicProfileManager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['is_artist', 'name']),
+            models.Index(fields=['is_promoter', 'is_verified', 'name']),
+        ]
+
+    def __str__(self):
+        return self.name
+
+
 class Message(models.Model):
     """
     Message model.
     Messages are 'sent' once read flags are created.
     Can be sent by a user or generated by the system (i.e. no sender).
     """
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    # Legacy, kept readable until API clients move to 'created_at'.
     created_date = models.DateField(auto_now_add=True)
     created_time = models.TimeField(auto_now_add=True)
     sender = models.ForeignKey(
@@ -453,9 +1201,16 @@ class Venue(models.Model):
     description = models.CharField(max_length=1000, blank=True)
     google_maps = models.CharField(max_length=1000, blank=True)
     image = models.ImageField(
-        null=True, blank=True, upload_to=image_file_path
+        null=True, blank=True, upload_to=image_file_path,
+        storage=upload_storage
+    )
+    image_height = models.PositiveIntegerField(null=True, editable=False)
+    image_processed = models.CharField(
+        max_length=100, blank=True, editable=False
     )
+    image_width = models.PositiveIntegerField(null=True, editable=False)
     name = models.CharField(max_length=255)
+    search_vector = SearchVectorField(null=True, editable=False)
     slug = models.SlugField()
 
     REQUIRED_FIELDS = ['address_line1', 'address_zip', 'name']
@@ -471,12 +1226,23 @@ class Event(models.Model):
     end_date = models.DateField()
     end_time = models.TimeField()
     image = models.ImageField(
-        null=True, blank=True, upload_to=image_file_path
+        null=True, blank=True, upload_to=image_file_path,
+        storage=upload_storage
     )
+    image_height = models.PositiveIntegerField(null=True, editable=False)
+    image_processed = models.CharField(
+        max_length=100, blank=True, editable=False
+    )
+    image_width = models.PositiveIntegerField(null=True, editable=False)
     name = models.CharField(max_length=255)
     promoter = models.ForeignKey(
         'Promoter', on_delete=models.CASCADE, related_name='events'
     )
+    search_vector = SearchVectorField(null=True, editable=False)
+    series = models.ForeignKey(
+        'EventSeries', on_delete=models.SET_NULL, related_name='events',
+        null=True, blank=True
+    )
     start_date = models.DateField()
     start_time = models.TimeField()
     venue = models.ForeignKey(
@@ -488,6 +1254,88 @@ class Event(models.Model):
     ]
     objects = EventManager()
 
+    class Meta:
+        unique_together = ('series', 'start_date')
+
+    def __str__(self):
+        return self.name
+
+
+class EventSeries(models.Model):
+    """
+    Event series model.
+    A recurring night: its events are created from the series' details,
+    lineup and ticket types, a rolling EVENT_SERIES_HORIZON ahead, by
+    extend_series. Monthly series fall on the same weekday of the month
+    as their first event, e.g. the first Friday.
+    """
+    WEEKLY = 'weekly'
+    MONTHLY = 'monthly'
+    FREQUENCY_CHOICES = (
+        (WEEKLY, 'Weekly'),
+        (MONTHLY, 'Monthly'),
+    )
+
+    artists = models.ManyToManyField(
+        'Artist', blank=True, related_name='event_series'
+    )
+    description = models.CharField(max_length=1000, blank=True)
+    end_time = models.TimeField()
+    ends_on = models.DateField(null=True, blank=True)
+    frequency = models.CharField(max_length=255, choices=FREQUENCY_CHOICES)
+    interval = models.PositiveSmallIntegerField(default=1)
+    materialized_until = models.DateField(
+        null=True, blank=True, editable=False
+    )
+    name = models.CharField(max_length=255)
+    promoter = models.ForeignKey(
+        'Promoter', on_delete=models.CASCADE, related_name='event_series'
+    )
+    start_time = models.TimeField()
+    starts_on = models.DateField()
+    venue = models.ForeignKey(
+        'Venue', on_delete=models.CASCADE, related_name='event_series'
+    )
+
+    REQUIRED_FIELDS = [
+        'end_time', 'frequency', 'name', 'start_time', 'starts_on', 'venue'
+    ]
+    objects = EventSeriesManager()
+
+    def __str__(self):
+        return self.name
+
+    def occurrences(self, after, until):
+        """Dates of the series' events after 'after', up to 'until'."""
+        if self.ends_on:
+            until = min(until, self.ends_on)
+        dates = []
+        n = 0
+        day = self.starts_on
+        while day is None or day <= until:
+            if day is not None and (after is None or day > after):
+                dates.append(day)
+            n += self.interval
+            if self.frequency == self.WEEKLY:
+                day = self.starts_on + timedelta(weeks=n)
+            else:
+                day = nth_weekday(self.starts_on, months=n)
+        return dates
+
+
+class SeriesTicketType(models.Model):
+    """A ticket type given to each of a series' events."""
+    name = models.CharField(max_length=255)
+    price = models.DecimalField(max_digits=8, decimal_places=2)
+    queue_enabled = models.BooleanField(default=False)
+    queue_rate = models.PositiveIntegerField(default=100)
+    series = models.ForeignKey(
+        'EventSeries', on_delete=models.CASCADE, related_name='ticket_types'
+    )
+    tickets_remaining = models.IntegerField(blank=True, null=True)
+
+    REQUIRED_FIELDS = ['name', 'price', 'series']
+
     def __str__(self):
         return self.name
 
@@ -516,6 +1364,8 @@ class TicketType(models.Model):
     )
     name = models.CharField(max_length=255)
     price = models.DecimalField(max_digits=8, decimal_places=2)
+    queue_enabled = models.BooleanField(default=False)
+    queue_rate = models.PositiveIntegerField(default=100)
     slug = models.SlugField()
     tickets_remaining = models.IntegerField(blank=True, null=True)
 
@@ -526,9 +1376,146 @@ class TicketType(models.Model):
         return self.slug
 
 
+class QueueToken(models.Model):
+    """
+    Queue token model.
+    Buyers of a queued ticket type join the back of the queue and are
+    admitted in position order at the ticket type's 'queue_rate' (per
+    minute). An admitted token may be used for one purchase within a
+    limited window.
+    """
+    admitted_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    owner = models.ForeignKey(
+        'User', on_delete=models.CASCADE, related_name='queue_tokens'
+    )
+    position = models.PositiveIntegerField()
+    ticket_type = models.ForeignKey(
+        'TicketType', on_delete=models.CASCADE, related_name='queue_tokens'
+    )
+    token = models.CharField(max_length=32, unique=True)
+    used_at = models.DateTimeField(null=True, blank=True)
+
+    REQUIRED_FIELDS = ['owner', 'position', 'ticket_type', 'token']
+    objects = QueueTokenManager()
+
+    class Meta:
+        indexes = [models.Index(fields=['ticket_type', 'position'])]
+
+    def __str__(self):
+        return self.token
+
+    def is_expired(self):
+        """Check if the token's reservation window has closed."""
+        if self.admitted_at is None:
+            return False
+        window = timedelta(seconds=settings.QUEUE_ADMISSION_WINDOW)
+        return self.admitted_at + window < timezone.now()
+
+
+class CreditEntry(models.Model):
+    """
+    Credit entry model.
+    An append-only ledger of credit movements. A user's credit is the sum
+    of their entries; the reconcile_credit command checks this holds.
+    """
+    PAYMENT = 'payment'
+    PURCHASE = 'purchase'
+    TRANSFER = 'transfer'
+    ADJUSTMENT = 'adjustment'
+    KIND_CHOICES = (
+        (PAYMENT, 'Payment'),
+        (PURCHASE, 'Purchase'),
+        (TRANSFER, 'Transfer'),
+        (ADJUSTMENT, 'Adjustment'),
+    )
+
+    amount = models.DecimalField(max_digits=8, decimal_places=2)
+    # The Stripe charge a payment was made by, so it is recorded only once.
+    charge_id = models.CharField(
+        max_length=255, null=True, blank=True, unique=True
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    description = models.CharField(max_length=255, blank=True)
+    kind = models.CharField(max_length=255, choices=KIND_CHOICES)
+    ticket = models.ForeignKey(
+        'Ticket',
+        on_delete=models.SET_NULL,
+        related_name='credit_entries',
+        null=True,
+        blank=True
+    )
+    user = models.ForeignKey(
+        'User', on_delete=models.CASCADE, related_name='credit_entries'
+    )
+
+    REQUIRED_FIELDS = ['amount', 'kind', 'user']
+    objects = CreditEntryManager()
+
+    def __str__(self):
+        return f'{self.kind} {self.amount}'
+
+
+class SalesRollup(models.Model):
+    """
+    Sales rollup model.
+    Ticket sales per ticket type per hour (UTC), kept up to date as tickets
+    are issued and rebuilt by the backfill_rollups command.
+    """
+    event = models.ForeignKey(
+        'Event', on_delete=models.CASCADE, related_name='sales_rollups'
+    )
+    hour = models.DateTimeField()
+    revenue = models.DecimalField(
+        max_digits=10, decimal_places=2, default=0
+    )
+    ticket_type = models.ForeignKey(
+        'TicketType', on_delete=models.CASCADE, related_name='sales_rollups'
+    )
+    tickets = models.PositiveIntegerField(default=0)
+
+    objects = SalesRollupManager()
+
+    class Meta:
+        unique_together = ('ticket_type', 'hour')
+        indexes = [models.Index(fields=['event', 'hour'])]
+
+    def __str__(self):
+        return f'{self.ticket_type} {self.hour}'
+
+
+class VoteRollup(models.Model):
+    """
+    Vote rollup model.
+    Votes and points per tally, kept up to date as votes are cast.
+    """
+    event = models.ForeignKey(
+        'Event', on_delete=models.CASCADE, related_name='vote_rollups'
+    )
+    points = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    tally = models.OneToOneField(
+        'Tally', on_delete=models.CASCADE, related_name='vote_rollup'
+    )
+    votes = models.PositiveIntegerField(default=0)
+
+    objects = VoteRollupManager()
+
+    def __str__(self):
+        return str(self.tally)
+
+
 class Ticket(models.Model):
     """Ticket model. (better description needed)."""
-    code = models.CharField(max_length=6)
+    # Check-in results
+    ADMITTED = 'admitted'
+    ALREADY_CHECKED_IN = 'already_checked_in'
+    WRONG_EVENT = 'wrong_event'
+    INVALID = 'invalid'
+
+    checked_in_at = models.DateTimeField(null=True, blank=True)
+    code = models.CharField(max_length=6, unique=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    # Legacy, kept readable until API clients move to 'created_at'.
     created_date = models.DateField(auto_now_add=True)
     created_time = models.TimeField(auto_now_add=True)
     owner = models.ForeignKey(
@@ -538,9 +1525,16 @@ class Ticket(models.Model):
         null=True,
         blank=True
     )
+    # Set while the ticket waits for the render_tickets worker.
+    render_requested_at = models.DateTimeField(
+        null=True, blank=True, editable=False, db_index=True
+    )
+    # Storage name, without extension, of the rendered PDF and QR code.
+    rendered = models.CharField(max_length=100, blank=True, editable=False)
     ticket_type = models.ForeignKey(
         'TicketType', on_delete=models.CASCADE, related_name='tickets'
     )
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
     vote = models.ForeignKey(
         'Tally',
         on_delete=models.SET_NULL,
@@ -0,0 +1,117 @@
+import hashlib
+import threading
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError, connections
+from rest_framework.permissions import SAFE_METHODS
+
+REPLICA = 'replica'
+REPLICA_LAG_KEY = 'replica-lag'
+PIN_COOKIE = 'primary_pin'
+
+# Per request (per thread, or per greenlet under gevent).
+_state = threading.local()
+
+
+def replica_lag():
+    """
+    Seconds the replica is behind the primary, checked at most every
+    REPLICA_LAG_CHECK_INTERVAL seconds. None if it can't be reached.
+    """
+    lag = cache.get(REPLICA_LAG_KEY)
+    if lag is None:
+        connection = connections[REPLICA]
+        try:
+            if connection.vendor == 'postgresql':
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        'SELECT CASE WHEN pg_last_wal_receive_lsn() = '
+                        'pg_last_wal_replay_lsn() THEN 0 ELSE EXTRACT(EPOCH '
+                        'FROM now() - pg_last_xact_replay_timestamp()) END'
+                    )
+                    lag = float(cursor.fetchone()[0] or 0)
+            else:
+                # Other backends (a second SQLite file in development)
+                # have no replication to measure.
+                lag = 0
+        except DatabaseError:
+            lag = -1
+        cache.set(
+            REPLICA_LAG_KEY, lag, timeout=settings.REPLICA_LAG_CHECK_INTERVAL
+        )
+    return None if lag < 0 else lag
+
+
+def pin_key(request):
+    """Cache key pinning a token's client to the primary."""
+    token = request.META.get('HTTP_AUTHORIZATION', '')
+    return 'primary-pin-' + hashlib.sha256(token.encode()).hexdigest()
+
+
+def is_pinned(request):
+    """True if the client wrote within the last REPLICA_PIN_DURATION."""
+    if PIN_COOKIE in request.COOKIES:
+        return True
+    return 'HTTP_AUTHORIZATION' in request.META and \
+        cache.get(pin_key(request)) is not None
+
+
+class ReplicaMiddleware:
+    """
+    Sends the reads of views marked 'read_replica' to the replica on safe
+    requests. A client that has just written is pinned to the primary for
+    REPLICA_PIN_DURATION seconds, by cookie and by auth token, so it
+    reads its own writes.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        _state.use_replica = False
+        try:
+            response = self.get_response(request)
+        finally:
+            _state.use_replica = False
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            duration = settings.REPLICA_PIN_DURATION
+            response.set_cookie(PIN_COOKIE, '1', max_age=duration)
+            if 'HTTP_AUTHORIZATION' in request.META:
+                cache.set(pin_key(request), True, timeout=duration)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view = getattr(view_func, 'cls', view_func)
+        _state.use_replica = (
+            REPLICA in settings.DATABASES and
+            request.method in SAFE_METHODS and
+            getattr(view, 'read_replica', False) and
+            not is_pinned(request)
+        )
+
+
+class ReplicaRouter:
+    """
+    Reads go to the replica only while ReplicaMiddleware allows it and the
+    replica is within REPLICA_MAX_LAG seconds of the primary. Everything
+    else uses the primary ('default').
+    """
+
+    def db_for_read(self, model, **hints):
+        if getattr(_state, 'use_replica', False):
+            lag = replica_lag()
+            if lag is not None and lag <= settings.REPLICA_MAX_LAG:
+                return REPLICA
+        return 'default'
+
+    def db_for_write(self, model, **hints):
+        # Later reads in the same request must see this write.
+        _state.use_replica = False
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db != REPLICA
@@ -0,0 +1,86 @@
+import hashlib
+import os
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+
+from drf_yasg.views import get_schema_view
+
+# Spec renderer formats and the file each is stored in. The UI renderers
+# don't introspect anything and are served as usual.
+SCHEMA_FILES = {
+    'openapi': 'openapi.json',
+    '.json': 'openapi.json',
+    '.yaml': 'openapi.yaml',
+}
+
+# Rendered schemas held by this process: {file name: (content, etag)}.
+_schemas = {}
+
+
+def get_cached_schema_view(info, url=None, urlconf=None, **kwargs):
+    """
+    get_schema_view() for a public schema that is generated at most once
+    per process. The spec is read from OPENAPI_SCHEMA_DIR when the
+    build_schema command has written it, and is otherwise generated on the
+    first request. Responses carry an ETag, so clients revalidate with 304s.
+    """
+    schema_view = get_schema_view(info, url=url, urlconf=urlconf, **kwargs)
+    assert schema_view.public, 'only a public schema is the same for all'
+
+    class CachedSchemaView(schema_view):
+
+        @classmethod
+        def render_schema(cls, renderer_class):
+            """Introspects every view and renders the spec."""
+            generator = cls.generator_class(info, '', url, urlconf=urlconf)
+            return renderer_class().render(generator.get_schema(None, True))
+
+        @classmethod
+        def write_schema(cls):
+            """Writes the spec in each format and returns the paths."""
+            os.makedirs(settings.OPENAPI_SCHEMA_DIR, exist_ok=True)
+            paths = []
+            for renderer_class in cls.renderer_classes:
+                name = SCHEMA_FILES.get(renderer_class.format)
+                if name is None:
+                    continue
+                path = os.path.join(settings.OPENAPI_SCHEMA_DIR, name)
+                if path not in paths:
+                    with open(path, 'wb') as f:
+                        f.write(cls.render_schema(renderer_class))
+                    paths.append(path)
+            return paths
+
+        @classmethod
+        def load_schema(cls, renderer_class):
+            """The spec and its ETag, from memory, disk or generated."""
+            name = SCHEMA_FILES[renderer_class.format]
+            if name not in _schemas:
+                path = os.path.join(settings.OPENAPI_SCHEMA_DIR, name)
+                try:
+                    with open(path, 'rb') as f:
+                        content = f.read()
+                except FileNotFoundError:
+                    content = cls.render_schema(renderer_class)
+                etag = '"%s"' % hashlib.sha256(content).hexdigest()[:32]
+                _schemas[name] = (content, etag)
+            return _schemas[name]
+
+        def get(self, request, version='', format=None):
+            renderer = request.accepted_renderer
+            if renderer.format not in SCHEMA_FILES:
+                return super().get(request, version, format)
+            content, etag = self.load_schema(type(renderer))
+            response = HttpResponse(
+                content, content_type=f'{renderer.media_type}; charset=utf-8'
+            )
+            response['ETag'] = etag
+            # Unchanged until the next deploy, so revalidating is cheap.
+            patch_cache_control(response, public=True, no_cache=True)
+            return get_conditional_response(
+                request, etag=etag, response=response
+            )
+
+    return CachedSchemaView
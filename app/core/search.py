@@ -0,0 +1,106 @@
+import re
+from functools import reduce
+from operator import or_
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, \
+                                          SearchVector, TrigramSimilarity
+from django.db import connection
+from django.db.models import Case, CharField, F, IntegerField, Q, Value, \
+                             When
+
+from rest_framework import filters as rest_filters
+
+# (field, weight) pairs that make up each model's 'search_vector'.
+# Weights run from 'A' (most relevant) to 'D'.
+SEARCH_VECTOR_FIELDS = {
+    'Venue': (
+        ('name', 'A'), ('address_city', 'B'), ('address_line1', 'C'),
+        ('address_line2', 'C'), ('address_state', 'C'),
+        ('address_country', 'C'), ('address_zip', 'C'), ('description', 'D'),
+    ),
+    'Event': (('name', 'A'), ('description', 'D')),
+    'PublicProfile': (('name', 'A'), ('description', 'D')),
+}
+SEARCH_CONFIG = 'simple'
+
+
+def build_search_vector(instance):
+    """Build the search vector for a model instance from its own values."""
+    fields = SEARCH_VECTOR_FIELDS[instance._meta.object_name]
+    return reduce(lambda a, b: a + b, [
+        SearchVector(
+            Value(getattr(instance, field), output_field=CharField()),
+            weight=weight,
+            config=SEARCH_CONFIG
+        )
+        for field, weight in fields
+    ])
+
+
+def update_search_vector(instance):
+    """Store an instance's search vector (PostgreSQL only)."""
+    if connection.vendor != 'postgresql':
+        return
+    type(instance)._default_manager.filter(pk=instance.pk).update(
+        search_vector=build_search_vector(instance)
+    )
+
+
+class RankedSearchFilter(rest_filters.SearchFilter):
+    """
+    Search filter that returns results ranked by relevance.
+    On PostgreSQL, terms are prefix-matched against the model's GIN indexed
+    'search_vector', and the view's 'trigram_fields' are also matched by
+    trigram similarity so misspelt names are still found.
+    Elsewhere (SQLite in development) it falls back to icontains matching
+    on 'search_fields', ranked by how many fields match.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        search_terms = self.get_search_terms(request)
+        if not search_terms:
+            return queryset
+        if connection.vendor == 'postgresql':
+            return self.filter_postgresql(search_terms, queryset, view)
+        return self.filter_fallback(search_terms, queryset, view)
+
+    def filter_postgresql(self, search_terms, queryset, view):
+        words = [re.sub(r'[^\w]', '', term) for term in search_terms]
+        words = [word for word in words if word]
+        if not words:
+            return queryset.none()
+        query = SearchQuery(
+            ' & '.join(f'{word}:*' for word in words),
+            config=SEARCH_CONFIG,
+            search_type='raw'
+        )
+        text = ' '.join(search_terms)
+        match = Q(search_vector=query)
+        rank = SearchRank(F('search_vector'), query)
+        for field in getattr(view, 'trigram_fields', ()):
+            match |= Q(**{f'{field}__trigram_similar': text})
+            rank = rank + TrigramSimilarity(field, text)
+        return queryset.filter(match).annotate(
+            search_rank=rank
+        ).order_by('-search_rank')
+
+    def filter_fallback(self, search_terms, queryset, view):
+        search_fields = self.get_search_fields(view, None)
+        for term in search_terms:
+            queryset = queryset.filter(reduce(or_, [
+                Q(**{f'{field}__icontains': term}) for field in search_fields
+            ]))
+        # Earlier search fields count for more.
+        rank = sum((
+            Case(
+                When(
+                    Q(**{f'{field}__icontains': term}),
+                    then=Value(len(search_fields) - i)
+                ),
+                default=Value(0),
+                output_field=IntegerField()
+            )
+            for term in search_terms
+            for i, field in enumerate(search_fields)
+        ), Value(0, output_field=IntegerField()))
+        return queryset.annotate(search_rank=rank).order_by('-search_rank')
@@ -0,0 +1,137 @@
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from rest_framework.authtoken.models import Token
+
+from core.authentication import auth_token_key, invalidate_cached_users
+from core.models import PUBLIC_PROFILE_FIELDS, User, Artist, Promoter, \
+                        Venue, Event, PublicProfile, Tally, VoteRollup
+from core.search import update_search_vector
+from core.storage import release_file
+from core.suggest import update_index
+
+SUGGEST_KINDS = {
+    Artist: 'artist', Promoter: 'promoter', Venue: 'venue', Event: 'event'
+}
+
+
+@receiver(post_save, sender=Venue)
+@receiver(post_save, sender=Event)
+def search_vector_post_save(sender, instance, **kwargs):
+    """Keep the search vector in step with the searchable fields."""
+    update_search_vector(instance)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_save, sender=Artist)
+@receiver(post_save, sender=Promoter)
+@receiver(post_delete, sender=Artist)
+@receiver(post_delete, sender=Promoter)
+def public_profile_changed(sender, instance, raw=False, update_fields=None,
+                           **kwargs):
+    """Copy public artist and promoter fields to their public profile."""
+    if raw:
+        return
+    if update_fields and not set(update_fields).intersection(
+        PUBLIC_PROFILE_FIELDS + ('is_verified',)
+    ):
+        return
+    if sender is User and not (instance.is_artist or instance.is_promoter):
+        return
+    profile = PublicProfile.objects.sync(instance.pk)
+    if profile is not None:
+        update_search_vector(profile)
+
+
+@receiver(post_save, sender=Artist)
+@receiver(post_save, sender=Promoter)
+@receiver(post_save, sender=Venue)
+@receiver(post_save, sender=Event)
+def suggest_post_save(sender, instance, update_fields=None, **kwargs):
+    """Update the typeahead index once the save is committed."""
+    if update_fields and not {'name', 'is_verified'} & set(update_fields):
+        return
+    name = instance.name
+    if sender is Promoter and not instance.is_verified:
+        name = None
+    transaction.on_commit(
+        lambda: update_index(SUGGEST_KINDS[sender], instance.pk, name)
+    )
+
+
+@receiver(post_delete, sender=Artist)
+@receiver(post_delete, sender=Promoter)
+@receiver(post_delete, sender=Venue)
+@receiver(post_delete, sender=Event)
+def suggest_post_delete(sender, instance, **kwargs):
+    """Remove a deleted object from the typeahead index."""
+    pk = instance.pk
+    transaction.on_commit(lambda: update_index(SUGGEST_KINDS[sender], pk))
+
+
+@receiver(post_save, sender=User)
+@receiver(post_save, sender=Artist)
+@receiver(post_save, sender=Promoter)
+@receiver(post_delete, sender=User)
+@receiver(post_delete, sender=Artist)
+@receiver(post_delete, sender=Promoter)
+def cached_user_changed(sender, instance, **kwargs):
+    """Drop a changed user from the authentication cache."""
+    pk = instance.pk
+    transaction.on_commit(lambda: invalidate_cached_users([pk]))
+
+
+@receiver(post_delete, sender=Token)
+def cached_token_deleted(sender, instance, **kwargs):
+    """Stop a deleted token from authenticating from the cache."""
+    cache.delete(auth_token_key(instance.key))
+
+
+@receiver(post_save, sender=Tally)
+@receiver(post_delete, sender=Tally)
+def lineup_changed(sender, instance, **kwargs):
+    """Republish live results when an event's lineup changes."""
+    event_pk = instance.event_id
+    transaction.on_commit(
+        lambda: VoteRollup.objects.publish_results(event_pk)
+    )
+
+
+@receiver(pre_save, sender=User)
+@receiver(pre_save, sender=Artist)
+@receiver(pre_save, sender=Promoter)
+@receiver(pre_save, sender=Venue)
+@receiver(pre_save, sender=Event)
+def image_pre_save(sender, instance, raw=False, update_fields=None,
+                   **kwargs):
+    """Note the image a save may replace."""
+    if raw or instance.pk is None or \
+            (update_fields and 'image' not in update_fields):
+        return
+    instance._replaced_image = sender.objects.filter(
+        pk=instance.pk
+    ).values_list('image', flat=True).first()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_save, sender=Artist)
+@receiver(post_save, sender=Promoter)
+@receiver(post_save, sender=Venue)
+@receiver(post_save, sender=Event)
+def image_replaced(sender, instance, **kwargs):
+    """Release a replaced image once the save is committed."""
+    name = instance.__dict__.pop('_replaced_image', None)
+    if name and name != instance.image.name:
+        transaction.on_commit(lambda: release_file(name))
+
+
+@receiver(post_delete, sender=User)
+@receiver(post_delete, sender=Venue)
+@receiver(post_delete, sender=Event)
+def image_deleted(sender, instance, **kwargs):
+    """Release a deleted object's image once the delete is committed."""
+    name = instance.image.name
+    if name:
+        transaction.on_commit(lambda: release_file(name))
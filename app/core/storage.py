@@ -0,0 +1,126 @@
+import fcntl
+import hashlib
+import os
+import time
+from contextlib import contextmanager
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage, default_storage
+from django.core.files.uploadhandler import MemoryFileUploadHandler, \
+                                            TemporaryFileUploadHandler
+from django.utils.deconstruct import deconstructible
+
+from core.images import IMAGE_FORMATS, IMAGE_MODELS, IMAGE_VARIANTS, \
+                        variant_name
+
+
+def content_hash(content):
+    """SHA-256 of a file, read in chunks unless upload already hashed it."""
+    digest = getattr(content, 'content_hash', None)
+    if digest is None:
+        sha = hashlib.sha256()
+        for chunk in content.chunks():
+            sha.update(chunk)
+        digest = sha.hexdigest()
+    return digest
+
+
+def content_name(directory, digest, filename):
+    """Content-addressed storage name, fanned out by the hash's prefix."""
+    ext = os.path.splitext(filename)[1].lower()
+    return os.path.join(directory, digest[:2], digest + ext)
+
+
+@contextmanager
+def storage_lock(storage):
+    """
+    Holds a lock, shared by every process using the storage's directory,
+    while a stored file is reused or released.
+    """
+    os.makedirs(storage.location, exist_ok=True)
+    with open(os.path.join(storage.location, '.storage.lock'), 'a') as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    Stores each file under the hash of its content, so identical uploads
+    share one file and a stored file never changes.
+    A reused file is touched, and release_file leaves recently touched
+    files alone, as the row that will refer to it is not committed yet.
+    """
+
+    def save(self, name, content, max_length=None):
+        name = content_name(
+            os.path.dirname(name), content_hash(content), name
+        )
+        with storage_lock(self):
+            try:
+                os.utime(self.path(name))
+            except FileNotFoundError:
+                return super().save(name, content, max_length=max_length)
+        return name
+
+
+class HashingUploadMixin:
+    """Hashes an upload as its chunks arrive and tags the file with it."""
+
+    def new_file(self, *args, **kwargs):
+        self.sha = hashlib.sha256()
+        super().new_file(*args, **kwargs)
+
+    def receive_data_chunk(self, raw_data, start):
+        self.sha.update(raw_data)
+        return super().receive_data_chunk(raw_data, start)
+
+    def file_complete(self, file_size):
+        file = super().file_complete(file_size)
+        if file is not None:
+            file.content_hash = self.sha.hexdigest()
+        return file
+
+
+class HashingMemoryFileUploadHandler(HashingUploadMixin,
+                                     MemoryFileUploadHandler):
+    pass
+
+
+class HashingTemporaryFileUploadHandler(HashingUploadMixin,
+                                        TemporaryFileUploadHandler):
+    pass
+
+
+def references(name):
+    """Number of rows whose image is the stored file 'name'."""
+    return sum(
+        apps.get_model('core', model).objects.filter(image=name).count()
+        for model in IMAGE_MODELS
+    )
+
+
+def release_file(name):
+    """
+    Deletes a stored image and its variants once nothing uses it.
+    Files stored or reused in the last MEDIA_RELEASE_GRACE seconds are
+    kept, and left for the sweep_media command.
+    """
+    if not name or references(name):
+        return False
+    with storage_lock(default_storage):
+        try:
+            modified = os.stat(default_storage.path(name)).st_mtime
+        except FileNotFoundError:
+            modified = 0
+        if time.time() - modified < settings.MEDIA_RELEASE_GRACE:
+            return False
+        default_storage.delete(name)
+        for variant in IMAGE_VARIANTS:
+            for ext in IMAGE_FORMATS:
+                default_storage.delete(variant_name(name, variant, ext))
+    return True
@@ -0,0 +1,329 @@
+import fcntl
+import mmap
+import os
+import re
+import struct
+import unicodedata
+from bisect import bisect_left
+
+from django.conf import settings
+
+# Snapshot layout: header (magic, record count), one uint32 offset per record,
+# then the records. Records are sorted by key and each one is
+# 'key \x1f kind \x1f pk \x1f name \n' in UTF-8, so UTF-8 byte order matches
+# the sort order and lookups can binary search the mapped file directly.
+# Changes since the snapshot are appended to '<path>.delta', one
+# 'kind \x1f pk \x1f name \n' line per upsert and 'kind \x1f pk \n' per
+# removal, and are merged into lookups until the snapshot is compacted.
+MAGIC = b'SUG1'
+HEADER = struct.Struct('<4sI')
+OFFSET = struct.Struct('=I')
+SEPARATOR = '\x1f'
+# Names are also indexed from their second, third... word so that
+# 'moon' finds 'The Moonwalkers'.
+MAX_WORD_KEYS = 4
+
+
+def normalize(text):
+    """Lowercase, strip accents and punctuation, and collapse whitespace."""
+    text = unicodedata.normalize('NFKD', text or '')
+    text = ''.join(c for c in text if not unicodedata.combining(c))
+    return ' '.join(re.sub(r'[\W_]+', ' ', text.casefold()).split())
+
+
+def index_keys(name):
+    """The keys a name can be found by."""
+    words = normalize(name).split()
+    return [' '.join(words[i:]) for i in range(len(words[:MAX_WORD_KEYS]))]
+
+
+def clean_name(name):
+    """A name without the characters that delimit records and fields."""
+    return name.replace(SEPARATOR, ' ').replace('\n', ' ')
+
+
+def entries_for(kind, pk, name):
+    """The index entries of one object."""
+    name = clean_name(name)
+    return [(key, kind, str(pk), name) for key in index_keys(name)]
+
+
+def source_entries():
+    """Every suggestion entry, read from the database."""
+    from core.models import Artist, Promoter, Venue, Event
+    sources = (
+        ('artist', Artist.objects.all()),
+        ('promoter', Promoter.objects.filter(is_verified=True)),
+        ('venue', Venue.objects.all()),
+        ('event', Event.objects.all()),
+    )
+    for kind, queryset in sources:
+        for pk, name in queryset.values_list('pk', 'name').iterator():
+            yield from entries_for(kind, pk, name)
+
+
+def write_snapshot(entries, path=None):
+    """Atomically replace the snapshot file with the given entries."""
+    path = path or settings.SUGGEST_INDEX_PATH
+    records = sorted({
+        SEPARATOR.join(entry).encode() + b'\n' for entry in entries
+    })
+    offsets, position = [], 0
+    for record in records:
+        offsets.append(OFFSET.pack(position))
+        position += len(record)
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, len(records)))
+        f.write(b''.join(offsets))
+        f.write(b''.join(records))
+    os.replace(tmp_path, path)
+
+
+def read_entries(path=None):
+    """Every entry in the snapshot file, or None if there is none."""
+    path = path or settings.SUGGEST_INDEX_PATH
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except FileNotFoundError:
+        return None
+    count = HEADER.unpack_from(data)[1]
+    start = HEADER.size + count * OFFSET.size
+    return [
+        tuple(line.split(SEPARATOR, 3))
+        for line in data[start:].decode().split('\n')[:-1]
+    ]
+
+
+def read_changes(data):
+    """The {(kind, pk): name} changes in the complete lines of a delta."""
+    changes = {}
+    for line in data.decode().split('\n')[:-1]:
+        kind, pk, *name = line.split(SEPARATOR, 2)
+        changes[kind, pk] = name[0] if name else None
+    return changes
+
+
+def rotate_delta(path):
+    """
+    Move the delta aside to be merged, so changes made in the meantime go
+    to a new delta. Returns the name it was moved to, or None if empty.
+    """
+    with open(f'{path}.lock', 'w') as lock:
+        # Writers hold the lock shared, so none is midway through a line.
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        merging = f'{path}.merging'
+        if os.path.exists(merging):
+            # Left by an interrupted compaction, so carry it over.
+            try:
+                with open(f'{path}.delta', 'rb') as delta:
+                    data = delta.read()
+            except FileNotFoundError:
+                return merging
+            with open(merging, 'ab') as f:
+                f.write(data)
+            os.remove(f'{path}.delta')
+            return merging
+        try:
+            os.replace(f'{path}.delta', merging)
+        except FileNotFoundError:
+            return None
+    return merging
+
+
+def build_index(path=None):
+    """Rebuild the snapshot file from the database."""
+    path = path or settings.SUGGEST_INDEX_PATH
+    with open(f'{path}.compact.lock', 'w') as compact_lock:
+        fcntl.flock(compact_lock, fcntl.LOCK_EX)
+        merging = rotate_delta(path)
+        write_snapshot(source_entries(), path)
+        if merging:
+            os.remove(merging)
+
+
+def compact_index(path=None):
+    """
+    Merge the delta into the snapshot file. Returns False without waiting
+    if another process is already compacting.
+    """
+    path = path or settings.SUGGEST_INDEX_PATH
+    with open(f'{path}.compact.lock', 'w') as compact_lock:
+        try:
+            fcntl.flock(compact_lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return False
+        merging = rotate_delta(path)
+        if not merging:
+            return True
+        with open(merging, 'rb') as f:
+            changes = read_changes(f.read())
+        entries = [
+            e for e in read_entries(path) or ()
+            if (e[1], e[2]) not in changes
+        ]
+        for (kind, pk), name in changes.items():
+            if name is not None:
+                entries += entries_for(kind, pk, name)
+        write_snapshot(entries, path)
+        os.remove(merging)
+    return True
+
+
+def update_index(kind, pk, name=None, path=None):
+    """
+    Replace the entries of one object in the index.
+    A name of None removes the object. Nothing is done if there is no
+    snapshot yet, as it will be built from the database on first use.
+    """
+    update_index_many(kind, {pk: name}, path)
+
+
+def update_index_many(kind, names, path=None):
+    """
+    Like update_index() for a {pk: name} dict. The changes are appended to
+    the delta, so a write costs the same however large the index is.
+    """
+    path = path or settings.SUGGEST_INDEX_PATH
+    if not os.path.exists(path):
+        return
+    lines = b''.join(
+        SEPARATOR.join(
+            (kind, str(pk)) if name is None else
+            (kind, str(pk), clean_name(name))
+        ).encode() + b'\n'
+        for pk, name in names.items()
+    )
+    with open(f'{path}.lock', 'w') as lock:
+        fcntl.flock(lock, fcntl.LOCK_SH)
+        with open(f'{path}.delta', 'ab') as f:
+            f.write(lines)
+
+
+class Delta:
+    """The changes in a delta file, read incrementally as it grows."""
+
+    def __init__(self, path):
+        self.path = path
+        self.inode = None
+        self.position = 0
+        self.changes = {}
+
+    def refresh(self):
+        try:
+            f = open(self.path, 'rb')
+        except FileNotFoundError:
+            self.inode, self.position, self.changes = None, 0, {}
+            return
+        with f:
+            inode = os.fstat(f.fileno()).st_ino
+            if inode != self.inode:
+                self.inode, self.position, self.changes = inode, 0, {}
+            f.seek(self.position)
+            data = f.read()
+        # A line still being written is read on the next refresh.
+        data = data[:data.rfind(b'\n') + 1]
+        self.position += len(data)
+        self.changes.update(read_changes(data))
+
+
+class SuggestIndex:
+    """
+    A read-only, memory-mapped view of a snapshot file, with the changes
+    appended to its delta since.
+    """
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self.stat = os.fstat(f.fileno())
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.count = HEADER.unpack_from(self.data)[1]
+        self.start = HEADER.size + self.count * OFFSET.size
+        self.offsets = memoryview(self.data)[HEADER.size:self.start].cast('I')
+        # A delta being compacted, then the current one.
+        self.deltas = [Delta(f'{path}.merging'), Delta(f'{path}.delta')]
+        self.refresh()
+
+    def refresh(self):
+        """Pick up the changes appended since the last refresh."""
+        for delta in self.deltas:
+            delta.refresh()
+        self.changes = {}
+        for delta in self.deltas:
+            self.changes.update(delta.changes)
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, i):
+        """The key of the i-th record, so bisect can search the index."""
+        start = self.start + self.offsets[i]
+        return self.data[start:self.data.find(b'\x1f', start)]
+
+    def record(self, i):
+        """The (key, kind, pk, name) of the i-th record."""
+        start = self.start + self.offsets[i]
+        end = self.data.find(b'\n', start)
+        return self.data[start:end].decode().split(SEPARATOR, 3)
+
+    def is_current(self, path):
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return False
+        return (stat.st_ino, stat.st_mtime_ns) == \
+            (self.stat.st_ino, self.stat.st_mtime_ns)
+
+    def suggest(self, query, limit=10):
+        """Suggestions whose name, or a later word of it, starts with query."""
+        prefix = normalize(query).encode()
+        if not prefix:
+            return []
+        matches, seen = [], set()
+        i = bisect_left(self, prefix)
+        while i < self.count and len(seen) < limit:
+            if not self[i].startswith(prefix):
+                break
+            key, kind, pk, name = self.record(i)
+            if (kind, pk) not in seen and (kind, pk) not in self.changes:
+                seen.add((kind, pk))
+                matches.append((key, kind, pk, name))
+            i += 1
+        query = prefix.decode()
+        for (kind, pk), name in self.changes.items():
+            if name is not None:
+                matches += [
+                    entry for entry in entries_for(kind, pk, name)
+                    if entry[0].startswith(query)
+                ]
+        results, seen = [], set()
+        for key, kind, pk, name in sorted(matches):
+            if (kind, pk) not in seen and len(results) < limit:
+                seen.add((kind, pk))
+                results.append({'type': kind, 'id': int(pk), 'name': name})
+        return results
+
+
+_index = None
+
+
+def get_index():
+    """
+    The current index for this process.
+    The snapshot is remapped when another process has replaced it, and is
+    built from the database if it does not exist yet. Once the delta holds
+    SUGGEST_DELTA_MAX changes it is merged into a new snapshot.
+    """
+    global _index
+    path = settings.SUGGEST_INDEX_PATH
+    if _index is None or not _index.is_current(path):
+        if not os.path.exists(path):
+            build_index(path)
+        _index = SuggestIndex(path)
+    else:
+        _index.refresh()
+    if len(_index.changes) >= settings.SUGGEST_DELTA_MAX and \
+            compact_index(path):
+        _index = SuggestIndex(path)
+    return _index
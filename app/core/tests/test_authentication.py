@@ -0,0 +1,68 @@
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import TransactionTestCase
+
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import AuthenticationFailed
+
+from core import models
+from core.admin import verify
+from core.authentication import CachedTokenAuthentication, auth_user_key
+
+
+class CachedTokenAuthenticationTests(TransactionTestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.promoter = models.Promoter.objects.create_promoter(
+            email='promoter@test.com',
+            password='testpass',
+            name='test promoter',
+            phone='+442071234567'
+        )
+        self.token = Token.objects.create(user=self.promoter)
+        self.auth = CachedTokenAuthentication()
+
+    def test_warm_cache_makes_no_queries(self):
+        """Test that a cached user and profile need no queries."""
+        self.auth.authenticate_credentials(self.token.key)
+        with self.assertNumQueries(0):
+            user, token = self.auth.authenticate_credentials(self.token.key)
+            self.assertFalse(user.promoter.is_verified)
+            self.assertFalse(hasattr(user, 'artist'))
+        self.assertEqual(user.pk, self.promoter.pk)
+        self.assertEqual(token.key, self.token.key)
+
+    def test_saving_user_invalidates_cache(self):
+        """Test that a saved user is reloaded on their next request."""
+        self.auth.authenticate_credentials(self.token.key)
+        self.promoter.is_verified = True
+        self.promoter.save()
+        user, _ = self.auth.authenticate_credentials(self.token.key)
+        self.assertTrue(user.promoter.is_verified)
+
+    def test_deleted_token_fails(self):
+        """Test that a deleted token stops authenticating."""
+        self.auth.authenticate_credentials(self.token.key)
+        self.token.delete()
+        with self.assertRaises(AuthenticationFailed):
+            self.auth.authenticate_credentials(self.token.key)
+
+    def test_cache_holds_only_auth_fields(self):
+        """Test that secrets are not cached and other fields load lazily."""
+        self.auth.authenticate_credentials(self.token.key)
+        cached = repr(cache.get(auth_user_key(self.promoter.pk)))
+        self.assertNotIn(self.promoter.password, cached)
+        self.assertNotIn('promoter@test.com', cached)
+        user, _ = self.auth.authenticate_credentials(self.token.key)
+        with self.assertNumQueries(1):
+            self.assertEqual(user.email, 'promoter@test.com')
+
+    def test_verify_action_invalidates_cache(self):
+        """Test that the admin verify action reloads cached promoters."""
+        self.auth.authenticate_credentials(self.token.key)
+        with patch('core.admin.Email'):
+            verify(None, None, models.Promoter.objects.all())
+        user, _ = self.auth.authenticate_credentials(self.token.key)
+        self.assertTrue(user.promoter.is_verified)
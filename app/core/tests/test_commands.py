@@ -1,25 +1,116 @@
 from unittest.mock import patch
 
+from datetime import date, time
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
 from django.core.management import call_command
+from django.core.management.base import CommandError
 from django.db.utils import OperationalError
 from django.test import TestCase
 
+from core.models import CreditEntry, Promoter, Venue, Event, TicketType, \
+                        Ticket, SalesRollup, VoteRollup, Artist, Tally
+
 
 class CommandsTestCase(TestCase):
 
     def test_wait_for_db_ready(self):
         """Test waiting for db when db is available."""
 
-        with patch('django.db.utils.ConnectionHandler.__getitem__') as gi:
-            gi.return_value = True
+        with patch('core.management.commands.wait_for_db.check_database') \
+                as cd:
+            cd.return_value = 1.0
             call_command('wait_for_db')
-            self.assertEqual(gi.call_count, 1)
+            self.assertEqual(cd.call_count, 1)
 
     @patch('time.sleep', return_value=None)
     def test_wait_for_db(self, ts):
-        """Test waiting for db."""
+        """Test waiting for db with an exponential backoff."""
 
-        with patch('django.db.utils.ConnectionHandler.__getitem__') as gi:
-            gi.side_effect = [OperationalError] * 5 + [True]
+        with patch('core.management.commands.wait_for_db.check_database') \
+                as cd:
+            cd.side_effect = [OperationalError] * 5 + [1.0]
             call_command('wait_for_db')
-            self.assertEqual(gi.call_count, 6)
+            self.assertEqual(cd.call_count, 6)
+            self.assertEqual(
+                [c[0][0] for c in ts.call_args_list], [0.25, 0.5, 1, 2, 4]
+            )
+
+    @patch('time.sleep', return_value=None)
+    def test_wait_for_db_timeout(self, ts):
+        """Test that waiting for db gives up after the timeout."""
+
+        with patch('core.management.commands.wait_for_db.check_database') \
+                as cd:
+            cd.side_effect = OperationalError
+            with self.assertRaises(CommandError):
+                call_command('wait_for_db', timeout=0)
+
+    @patch('core.models.Email')
+    def test_reconcile_credit(self, email):
+        """Test that balances built from the ledger reconcile."""
+        user = get_user_model().objects.create_user(
+            email='test@test.com', password='testpass', name='test user'
+        )
+        CreditEntry.objects.record([
+            CreditEntry(user=user, amount=Decimal('10.00'), kind='payment'),
+            CreditEntry(user=user, amount=Decimal('-2.50'), kind='purchase'),
+        ])
+        call_command('reconcile_credit')
+
+    @patch('core.models.Email')
+    def test_reconcile_credit_mismatch(self, email):
+        """Test that balances changed outside the ledger are reported."""
+        user = get_user_model().objects.create_user(
+            email='test@test.com', password='testpass', name='test user'
+        )
+        get_user_model().objects.filter(pk=user.pk).update(credit=5)
+        with self.assertRaises(CommandError):
+            call_command('reconcile_credit')
+
+    @patch('core.models.Email')
+    def test_backfill_rollups(self, email):
+        """Test that the rollups are rebuilt from the tickets."""
+        promoter = Promoter.objects.create_promoter(
+            email='promoter@test.com',
+            password='testpass',
+            name='test promoter',
+            phone='+442071234567'
+        )
+        event = Event.objects.create(
+            end_date=date(2030, 1, 2),
+            end_time=time(2, 0, 0),
+            start_date=date(2030, 1, 1),
+            start_time=time(20, 0, 0),
+            name='test event',
+            promoter=promoter,
+            venue=Venue.objects.create(name='test venue')
+        )
+        ticket_type = TicketType.objects.create(
+            event=event, name='standard', price=Decimal('5.00'),
+            slug='1-standard', tickets_remaining=10
+        )
+        artist = Artist.objects.create_artist(
+            email='artist@test.com', password='testpass', name='artist'
+        )
+        tally = Tally.objects.create(artist=artist, event=event, slug='artist')
+        for code in ('aaaaaa', 'bbbbbb'):
+            Ticket.objects.create(
+                code=code, ticket_type=ticket_type, vote=tally
+            )
+        Ticket.objects.create(code='cccccc', ticket_type=ticket_type)
+
+        call_command('backfill_rollups')
+
+        sales = SalesRollup.objects.get()
+        self.assertEqual(sales.ticket_type, ticket_type)
+        self.assertEqual(sales.tickets, 3)
+        self.assertEqual(sales.revenue, Decimal('15.00'))
+        votes = VoteRollup.objects.get()
+        self.assertEqual(votes.tally, tally)
+        self.assertEqual(votes.votes, 2)
+        self.assertEqual(votes.points, Decimal('10.00'))
+
+        call_command('backfill_rollups')
+        self.assertEqual(SalesRollup.objects.get().tickets, 3)
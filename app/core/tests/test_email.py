@@ -0,0 +1,60 @@
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from core.email import Email
+from core.models import Message, ReadFlag
+
+EMAILS = ['artist1@test.com', 'artist2@test.com']
+
+
+@patch('sendgrid.SendGridAPIClient')
+class EmailTests(TestCase):
+
+    def setUp(self):
+        with patch('core.models.Email'):
+            for email in EMAILS:
+                get_user_model().objects.create_user(
+                    email=email, password='testpass', name='test user'
+                )
+
+    def test_send(self, client):
+        """Test that each address gets its own email and message."""
+        Email('artist_added', EMAILS).send()
+
+        self.assertEqual(client.return_value.send.call_count, 2)
+        mail = client.return_value.send.call_args[0][0].get()
+        self.assertEqual(
+            [p['to'] for p in mail['personalizations']],
+            [[{'email': 'artist2@test.com'}]]
+        )
+        self.assertEqual(Message.objects.count(), 2)
+        self.assertEqual(
+            sorted(ReadFlag.objects.values_list(
+                'recipient__email', flat=True
+            )),
+            EMAILS
+        )
+
+    def test_send_bulk(self, client):
+        """Test that a batch is sent in one request with one message."""
+        Email('artist_added', EMAILS, {'event': 'test event'}).send_bulk()
+
+        client.return_value.send.assert_called_once()
+        mail = client.return_value.send.call_args[0][0].get()
+        self.assertEqual(
+            sorted(p['to'][0]['email'] for p in mail['personalizations']),
+            EMAILS
+        )
+        self.assertTrue(all(
+            p['dynamic_template_data'] == {'event': 'test event'}
+            for p in mail['personalizations']
+        ))
+        message = Message.objects.get()
+        self.assertEqual(
+            sorted(message.readflags.values_list(
+                'recipient__email', flat=True
+            )),
+            EMAILS
+        )
@@ -0,0 +1,39 @@
+from unittest.mock import patch
+
+from django.db.utils import OperationalError
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core import health
+
+
+class HealthTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_healthz(self):
+        """Test that liveness needs no auth or database."""
+        with patch('core.health.check_database') as cd:
+            res = self.client.get(reverse('healthz'))
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertFalse(cd.called)
+
+    def test_readyz(self):
+        """Test that readiness reports the database and warm up."""
+        res = self.client.get(reverse('readyz'))
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['pending_migrations'], 0)
+        self.assertIn('database_ms', res.data)
+        self.assertIsNotNone(res.data['warm_up'])
+
+    @patch('core.health.check_database', side_effect=OperationalError('down'))
+    def test_readyz_database_down(self, cd):
+        """Test that readiness fails when the database is unreachable."""
+        with patch.object(health, 'warmed_up', {'seconds': 0}):
+            res = self.client.get(reverse('readyz'))
+        self.assertEqual(res.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(res.data['database_error'], 'down')
@@ -0,0 +1,55 @@
+import io
+import shutil
+import tempfile
+
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+
+from PIL import Image
+
+from core.images import ImageVariantsField, process_image, variant_name
+from core.models import Venue
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+def sample_image(size=(2000, 1000)):
+    """A JPEG upload with EXIF data."""
+    exif = Image.Exif()
+    exif[0x010f] = 'Camera'
+    buffer = io.BytesIO()
+    Image.new('RGB', size, 'red').save(buffer, 'JPEG', exif=exif)
+    return SimpleUploadedFile('photo.jpg', buffer.getvalue())
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class ImageVariantTests(TestCase):
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    def test_process_image(self):
+        """Test that variants are resized, stripped and exposed."""
+        venue = Venue.objects.create(
+            name='Moon Club', address_line1='1 Street', address_zip='AB1',
+            image=sample_image()
+        )
+        self.assertIsNone(ImageVariantsField().to_representation(venue))
+
+        self.assertTrue(process_image(venue))
+        venue.refresh_from_db()
+        self.assertEqual((venue.image_width, venue.image_height), (2000, 1000))
+        with default_storage.open(
+            variant_name(venue.image.name, 'thumb', 'jpeg')
+        ) as f:
+            thumb = Image.open(f)
+            self.assertEqual(thumb.size, (160, 80))
+            self.assertFalse(thumb.getexif())
+
+        variants = ImageVariantsField().to_representation(venue)
+        self.assertEqual(variants['card']['width'], 480)
+        self.assertEqual(variants['full']['height'], 800)
+        self.assertTrue(variants['thumb']['webp'].endswith('-thumb.webp'))
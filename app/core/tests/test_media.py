@@ -0,0 +1,80 @@
+import os
+import shutil
+import tempfile
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+
+from rest_framework.authtoken.models import Token
+
+from core.media import private_media_name, signed_media_url
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+@override_settings(
+    MEDIA_ROOT=MEDIA_ROOT, MEDIA_ACCEL_REDIRECT='/protected-media/'
+)
+class ServeMediaTests(TestCase):
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        patcher = patch('core.models.Email')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.user = get_user_model().objects.create_user(
+            email='user@test.com', password='testpass', name='test user'
+        )
+        self.private = private_media_name(self.user.pk, 'tickets', 'a.pdf')
+
+    def test_public_media_handed_to_nginx(self):
+        """Test that public files are redirected with immutable caching."""
+        res = self.client.get('/media/uploads/ab/abc.jpg')
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(
+            res['X-Accel-Redirect'], '/protected-media/uploads/ab/abc.jpg'
+        )
+        self.assertEqual(res['Content-Type'], 'image/jpeg')
+        self.assertIn('immutable', res['Cache-Control'])
+        self.assertEqual(res.content, b'')
+
+    def test_private_media_needs_owner(self):
+        """Test that private files are only served to their owner."""
+        url = '/media/' + self.private
+        self.assertEqual(self.client.get(url).status_code, 403)
+        other = get_user_model().objects.create_user(
+            email='other@test.com', password='testpass', name='other user'
+        )
+        token = Token.objects.create(user=other)
+        res = self.client.get(url, HTTP_AUTHORIZATION=f'Token {token.key}')
+        self.assertEqual(res.status_code, 403)
+        token = Token.objects.create(user=self.user)
+        res = self.client.get(url, HTTP_AUTHORIZATION=f'Token {token.key}')
+        self.assertEqual(res.status_code, 200)
+        self.assertIn('private', res['Cache-Control'])
+
+    def test_signed_url(self):
+        """Test that a signed link serves a private file without auth."""
+        url = signed_media_url(self.private)
+        self.assertEqual(self.client.get(url).status_code, 200)
+        self.assertEqual(self.client.get(url + 'x').status_code, 403)
+
+    def test_path_traversal(self):
+        """Test that paths outside the media root are refused."""
+        res = self.client.get('/media/uploads/../../app/settings.py')
+        self.assertEqual(res.status_code, 404)
+
+    @override_settings(MEDIA_ACCEL_REDIRECT='')
+    def test_streamed_in_development(self):
+        """Test that files are streamed when nginx isn't in front."""
+        os.makedirs(os.path.join(MEDIA_ROOT, 'uploads'), exist_ok=True)
+        with open(os.path.join(MEDIA_ROOT, 'uploads', 'a.txt'), 'w') as f:
+            f.write('media')
+        res = self.client.get('/media/uploads/a.txt')
+        self.assertEqual(b''.join(res.streaming_content), b'media')
+        self.assertEqual(self.client.get('/media/b.txt').status_code, 404)
@@ -1,10 +1,14 @@
+import os
 import pytz
-from datetime import date, time
+import tempfile
+from datetime import date, time, datetime, timedelta
+from unittest.mock import patch
 
-from django.test import TestCase
+from django.core.cache import cache
+from django.test import TestCase, override_settings
 from django.contrib.auth import get_user_model
 
-from core import models
+from core import models, suggest
 
 
 class UserManagerTests(TestCase):
@@ -151,6 +155,651 @@ class PromoterManagerTests(TestCase):
             )
 
 
+@patch('core.models.Email')
+class QueueTokenManagerTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        with patch('core.models.Email'):
+            promoter = models.Promoter.objects.create_promoter(
+                email='promoter@test.com',
+                password='testpass',
+                name='test promoter',
+                phone='+442071234567'
+            )
+            self.user = get_user_model().objects.create_user(
+                email='test@test.com',
+                password='testpass',
+                name='test user'
+            )
+        event = models.Event.objects.create(
+            end_date=date(2020, 1, 1),
+            end_time=time(2, 0, 0),
+            start_date=date(2019, 12, 31),
+            start_time=time(20, 0, 0),
+            name='test event',
+            promoter=promoter,
+            venue=models.Venue.objects.create(name='test venue')
+        )
+        self.ticket_type = models.TicketType.objects.create(
+            event=event,
+            name='test ticket type',
+            price=0,
+            queue_enabled=True,
+            slug='1-test-ticket-type',
+            tickets_remaining=10
+        )
+
+    def test_join_queue(self, email):
+        """Test that buyers are queued in the order they join."""
+        first = models.QueueToken.objects.join_queue(
+            self.ticket_type, self.user
+        )
+        second = models.QueueToken.objects.join_queue(
+            self.ticket_type,
+            get_user_model().objects.create(email='other@test.com')
+        )
+        self.assertEqual(first.position, 1)
+        self.assertEqual(second.position, 2)
+
+    def test_join_queue_twice(self, email):
+        """Test that joining a queue again returns the existing token."""
+        first = models.QueueToken.objects.join_queue(
+            self.ticket_type, self.user
+        )
+        second = models.QueueToken.objects.join_queue(
+            self.ticket_type, self.user
+        )
+        self.assertEqual(first, second)
+
+    def test_queue_status(self, email):
+        """Test that queue status is served without database queries."""
+        queue_token = models.QueueToken.objects.join_queue(
+            self.ticket_type, self.user
+        )
+        models.QueueToken.objects.admit_queue_tokens(self.ticket_type, 1)
+        with self.assertNumQueries(0):
+            status = models.QueueToken.objects.queue_status(
+                queue_token.token
+            )
+        self.assertTrue(status['admitted'])
+        self.assertEqual(status['ahead'], 0)
+
+    def test_create_ticket_requires_admission(self, email):
+        """Test that only admitted tokens may reserve queued tickets."""
+        queue_token = models.QueueToken.objects.join_queue(
+            self.ticket_type, self.user
+        )
+        with self.assertRaises(ValueError):
+            models.Ticket.objects.create_ticket(
+                self.ticket_type, self.user, queue_token=queue_token.token
+            )
+        models.QueueToken.objects.admit_queue_tokens(self.ticket_type, 1)
+        ticket = models.Ticket.objects.create_ticket(
+            self.ticket_type, self.user, queue_token=queue_token.token
+        )
+        self.assertEqual(ticket.owner, self.user)
+
+    def test_queue_token_used_once(self, email):
+        """Test that an admission buys once, however many tickets."""
+        queue_token = models.QueueToken.objects.join_queue(
+            self.ticket_type, self.user
+        )
+        models.QueueToken.objects.admit_queue_tokens(self.ticket_type, 1)
+        tickets = models.Ticket.objects.create_tickets(
+            self.ticket_type, 2, self.user, queue_token=queue_token.token
+        )
+        self.assertEqual(len(tickets), 2)
+        with self.assertRaises(ValueError):
+            models.Ticket.objects.create_ticket(
+                self.ticket_type, self.user, queue_token=queue_token.token
+            )
+        self.assertEqual(models.Ticket.objects.count(), 2)
+        rejoined = models.QueueToken.objects.join_queue(
+            self.ticket_type, self.user
+        )
+        self.assertNotEqual(rejoined, queue_token)
+
+    def test_failed_purchase_keeps_admission(self, email):
+        """Test that a purchase that fails does not use the token."""
+        queue_token = models.QueueToken.objects.join_queue(
+            self.ticket_type, self.user
+        )
+        models.QueueToken.objects.admit_queue_tokens(self.ticket_type, 1)
+        self.ticket_type.price = 5
+        with self.assertRaises(ValueError):
+            models.Ticket.objects.create_ticket(
+                self.ticket_type, self.user, queue_token=queue_token.token
+            )
+        queue_token.refresh_from_db()
+        self.assertIsNone(queue_token.used_at)
+        self.assertFalse(models.Ticket.objects.exists())
+
+    def test_create_tickets_stale_ticket_type(self, email):
+        """Test that stock is checked against the database, not the copy."""
+        stale = models.TicketType.objects.get(pk=self.ticket_type.pk)
+        models.Ticket.objects.create_tickets(self.ticket_type, 8)
+        models.TicketType.objects.filter(pk=stale.pk).update(name='renamed')
+        with self.assertRaises(ValueError):
+            models.Ticket.objects.create_tickets(stale, 3)
+        models.Ticket.objects.create_tickets(stale, 2)
+        self.ticket_type.refresh_from_db()
+        self.assertEqual(self.ticket_type.tickets_remaining, 0)
+        self.assertEqual(self.ticket_type.name, 'renamed')
+
+
+def run_on_commit(func):
+    """Stands in for transaction.on_commit, which TestCase never fires."""
+    func()
+
+
+@patch('core.models.Email')
+@patch('core.models.transaction.on_commit', run_on_commit)
+@override_settings(
+    EVENT_SERIES_HORIZON=20,
+    SUGGEST_INDEX_PATH=os.path.join(tempfile.mkdtemp(), 'suggest.idx')
+)
+class EventSeriesManagerTests(TestCase):
+
+    def setUp(self):
+        with patch('core.models.Email'):
+            self.promoter = models.Promoter.objects.create_promoter(
+                email='promoter@test.com',
+                password='testpass',
+                name='test promoter',
+                phone='+442071234567'
+            )
+            self.artists = [
+                models.Artist.objects.create_artist(
+                    email=f'artist{i}@test.com',
+                    password='testpass',
+                    name=f'test artist {i}'
+                )
+                for i in range(2)
+            ]
+        self.today = date.today()
+
+    def create_series(self, **extra_fields):
+        return models.EventSeries.objects.create_series(
+            end_time=time(2, 0, 0),
+            frequency=models.EventSeries.WEEKLY,
+            name='test night',
+            promoter=self.promoter,
+            start_time=time(22, 0, 0),
+            starts_on=self.today,
+            venue=models.Venue.objects.create(name='test venue'),
+            artists=self.artists,
+            ticket_types=[{'name': 'entry', 'price': 5}],
+            **extra_fields
+        )
+
+    def test_nth_weekday(self, email):
+        """Test that monthly dates keep the weekday of the month."""
+        first_friday = date(2021, 1, 1)
+        self.assertEqual(
+            models.nth_weekday(first_friday, months=1), date(2021, 2, 5)
+        )
+        fifth_friday = date(2021, 1, 29)
+        self.assertIsNone(models.nth_weekday(fifth_friday, months=1))
+        self.assertEqual(
+            models.nth_weekday(fifth_friday, months=3), date(2021, 4, 30)
+        )
+
+    def test_create_series(self, email):
+        """Test that events are created up to the horizon in bulk."""
+        series = self.create_series()
+        events = series.events.order_by('start_date')
+        self.assertEqual(
+            [event.start_date for event in events],
+            [self.today + timedelta(weeks=n) for n in range(3)]
+        )
+        event = events[0]
+        self.assertEqual(event.end_date, self.today + timedelta(days=1))
+        self.assertEqual(event.promoter_id, self.promoter.pk)
+        self.assertEqual(
+            sorted(event.lineup.values_list('slug', flat=True)),
+            [f'{event.pk}-test-artist-0', f'{event.pk}-test-artist-1']
+        )
+        ticket_type = event.ticket_types.get()
+        self.assertEqual(ticket_type.slug, f'{event.pk}-entry')
+        self.assertEqual(series.materialized_until, events[2].start_date)
+        email.assert_called_once_with(
+            'artist_added', ['artist0@test.com', 'artist1@test.com']
+        )
+        email.return_value.send_bulk.assert_called_once_with()
+
+    def test_extend_series(self, email):
+        """Test that extending a series only adds the new dates."""
+        series = self.create_series(ends_on=self.today + timedelta(days=30))
+        until = self.today + timedelta(days=60)
+        events = models.EventSeries.objects.extend_series(series, until)
+        self.assertEqual(
+            [event.start_date for event in events],
+            [self.today + timedelta(weeks=n) for n in (3, 4)]
+        )
+        self.assertEqual(
+            models.EventSeries.objects.extend_series(series, until), []
+        )
+        self.assertEqual(models.TicketType.objects.count(), 5)
+
+
+@patch('core.models.Email')
+@patch('core.models.transaction.on_commit', run_on_commit)
+class BulkLineupTests(TestCase):
+
+    def setUp(self):
+        with patch('core.models.Email'):
+            promoter = models.Promoter.objects.create_promoter(
+                email='promoter@test.com',
+                password='testpass',
+                name='test promoter',
+                phone='+442071234567'
+            )
+            for i in range(3):
+                models.Artist.objects.create_artist(
+                    email=f'artist{i}@test.com',
+                    password='testpass',
+                    name=f'test artist {i}'
+                )
+        self.event = models.Event.objects.create(
+            end_date=date(2020, 1, 1),
+            end_time=time(2, 0, 0),
+            start_date=date(2019, 12, 31),
+            start_time=time(20, 0, 0),
+            name='test event',
+            promoter=promoter,
+            venue=models.Venue.objects.create(name='test venue')
+        )
+
+    def test_create_lineup(self, email):
+        """Test that new artists are added in bulk with one email."""
+        models.Tally.objects.create_tally(
+            models.Artist.objects.get(slug='test-artist-0'), self.event
+        )
+        email.reset_mock()
+        with self.assertNumQueries(2):
+            tallies = models.Tally.objects.create_lineup(self.event, [
+                'test-artist-0', 'test-artist-1', 'test-artist-2'
+            ])
+        self.assertEqual([tally.slug for tally in tallies], [
+            f'{self.event.pk}-test-artist-1', f'{self.event.pk}-test-artist-2'
+        ])
+        self.assertEqual(self.event.lineup.count(), 3)
+        email.assert_called_once_with(
+            'artist_added', ['artist1@test.com', 'artist2@test.com']
+        )
+        email.return_value.send_bulk.assert_called_once_with()
+
+    def test_create_lineup_unknown_artist(self, email):
+        """Test that nothing is added if any artist is unknown."""
+        with self.assertRaises(ValueError):
+            models.Tally.objects.create_lineup(
+                self.event, ['test-artist-0', 'nobody']
+            )
+        self.assertFalse(self.event.lineup.exists())
+        email.assert_not_called()
+
+    def test_create_ticket_types(self, email):
+        """Test that ticket types are created in bulk with new names only."""
+        ticket_types = models.TicketType.objects.create_ticket_types(
+            self.event, [
+                {'name': 'early bird', 'price': 5},
+                {'name': 'standard', 'price': 8, 'tickets_remaining': 100},
+            ]
+        )
+        self.assertEqual(
+            [ticket_type.slug for ticket_type in ticket_types],
+            [f'{self.event.pk}-early-bird', f'{self.event.pk}-standard']
+        )
+        with self.assertRaises(ValueError):
+            models.TicketType.objects.create_ticket_types(
+                self.event, [{'name': 'Standard', 'price': 10}]
+            )
+        self.assertEqual(self.event.ticket_types.count(), 2)
+
+
+@patch('core.models.Email')
+class CreditEntryManagerTests(TestCase):
+
+    def setUp(self):
+        with patch('core.models.Email'):
+            self.user = get_user_model().objects.create_user(
+                email='test@test.com',
+                password='testpass',
+                name='test user'
+            )
+
+    def test_record(self, email):
+        """Test that ledger entries are applied to the balance."""
+        models.CreditEntry.objects.record([
+            models.CreditEntry(user=self.user, amount=10, kind='payment'),
+            models.CreditEntry(user=self.user, amount=-4, kind='purchase'),
+        ])
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.credit, 6)
+        self.assertEqual(self.user.credit_entries.count(), 2)
+
+    def test_record_insufficient_credit(self, email):
+        """Test that a debit cannot overdraw a user."""
+        with self.assertRaises(ValueError):
+            models.CreditEntry.objects.record([
+                models.CreditEntry(user=self.user, amount=-1, kind='purchase')
+            ])
+        self.assertFalse(self.user.credit_entries.exists())
+
+    def test_adjust_credit(self, email):
+        """Test that an adjustment records the difference in balance."""
+        models.CreditEntry.objects.record([
+            models.CreditEntry(user=self.user, amount=10, kind='payment')
+        ])
+        entry = models.CreditEntry.objects.adjust_credit(self.user, 3)
+        self.user.refresh_from_db()
+        self.assertEqual(entry.amount, -7)
+        self.assertEqual(self.user.credit, 3)
+
+
+class TicketCodeTests(TestCase):
+
+    def test_generate_codes(self):
+        """Test that generated ticket codes are unique."""
+        codes = models.Ticket.objects.generate_codes(1000)
+        self.assertEqual(len(set(codes)), 1000)
+        self.assertTrue(all(len(code) == 6 for code in codes))
+
+    @patch('core.models.Email')
+    def test_check_in(self, email):
+        """Test that a ticket can only be checked in once per event."""
+        promoter = models.Promoter.objects.create_promoter(
+            email='promoter@test.com',
+            password='testpass',
+            name='test promoter',
+            phone='+442071234567'
+        )
+        venue = models.Venue.objects.create(name='test venue')
+        events = [
+            models.Event.objects.create(
+                end_date=date(2020, 1, 1),
+                end_time=time(2, 0, 0),
+                start_date=date(2019, 12, 31),
+                start_time=time(20, 0, 0),
+                name=name,
+                promoter=promoter,
+                venue=venue
+            )
+            for name in ('test event', 'other event')
+        ]
+        tickets = [
+            models.Ticket.objects.create(
+                code=code,
+                ticket_type=models.TicketType.objects.create(
+                    event=event, name='test', price=0, slug=code
+                )
+            )
+            for code, event in (('aaaaaa', events[0]), ('bbbbbb', events[1]))
+        ]
+        results = models.Ticket.objects.check_in(
+            events[0], ['aaaaaa', 'bbbbbb', 'cccccc']
+        )
+        self.assertEqual(results['aaaaaa'][0], models.Ticket.ADMITTED)
+        self.assertEqual(results['bbbbbb'][0], models.Ticket.WRONG_EVENT)
+        self.assertEqual(results['cccccc'][0], models.Ticket.INVALID)
+        results = models.Ticket.objects.check_in(events[0], ['aaaaaa'])
+        self.assertEqual(
+            results['aaaaaa'][0], models.Ticket.ALREADY_CHECKED_IN
+        )
+        tickets[0].refresh_from_db()
+        self.assertIsNotNone(tickets[0].checked_in_at)
+
+    @override_settings(DOOR_LIST_OVERLAP=0)
+    @patch('core.models.Email')
+    def test_door_list_since(self, email):
+        """Test that a door list can be downloaded incrementally."""
+        promoter = models.Promoter.objects.create_promoter(
+            email='promoter@test.com',
+            password='testpass',
+            name='test promoter',
+            phone='+442071234567'
+        )
+        event = models.Event.objects.create(
+            end_date=date(2020, 1, 1),
+            end_time=time(2, 0, 0),
+            start_date=date(2019, 12, 31),
+            start_time=time(20, 0, 0),
+            name='test event',
+            promoter=promoter,
+            venue=models.Venue.objects.create(name='test venue')
+        )
+        ticket_type = models.TicketType.objects.create(
+            event=event, name='test', price=0, slug='1-test'
+        )
+        for code in ('bbbbbb', 'aaaaaa'):
+            models.Ticket.objects.create(code=code, ticket_type=ticket_type)
+        version, rows = models.Ticket.objects.door_list(event)
+        self.assertEqual(
+            list(rows), [('aaaaaa', False), ('bbbbbb', False)]
+        )
+        models.Ticket.objects.check_in(event, ['bbbbbb'])
+        since, rows = models.Ticket.objects.door_list(event, version)
+        self.assertGreater(since, version)
+        self.assertEqual(list(rows), [('bbbbbb', True)])
+
+    def test_create_code_cached_encoder(self):
+        """Test that the code encoder is only built once."""
+        models.create_code(1, 6)
+        models.create_code(2, 6)
+        self.assertGreaterEqual(models.get_hashids.cache_info().hits, 1)
+
+
+class RollupManagerTests(TestCase):
+
+    @patch('core.models.Email')
+    def test_record_sale(self, email):
+        """Test that sales in the same hour share a rollup."""
+        event = models.Event.objects.create(
+            end_date=date(2020, 1, 1),
+            end_time=time(2, 0, 0),
+            start_date=date(2019, 12, 31),
+            start_time=time(20, 0, 0),
+            name='test event',
+            promoter=models.Promoter.objects.create_promoter(
+                email='promoter@test.com',
+                password='testpass',
+                name='test promoter',
+                phone='+442071234567'
+            ),
+            venue=models.Venue.objects.create(name='test venue')
+        )
+        ticket_type = models.TicketType.objects.create(
+            event=event, name='test', price=5, slug='1-test'
+        )
+        sold_at = datetime(2020, 1, 1, 20, 15, tzinfo=pytz.utc)
+        for minutes in (0, 30, 60):
+            models.SalesRollup.objects.record_sale(
+                ticket_type, sold_at + timedelta(minutes=minutes)
+            )
+        rollups = models.SalesRollup.objects.filter(
+            event=event
+        ).order_by('hour')
+        self.assertEqual(rollups.count(), 2)
+        self.assertEqual(rollups[0].tickets, 2)
+        self.assertEqual(rollups[0].revenue, 10)
+        self.assertEqual(rollups[1].tickets, 1)
+
+    @patch('core.models.Email')
+    def test_publish_results(self, email):
+        """Test that live results are versioned and ranked by points."""
+        cache.clear()
+        promoter = models.Promoter.objects.create_promoter(
+            email='promoter@test.com',
+            password='testpass',
+            name='test promoter',
+            phone='+442071234567'
+        )
+        event = models.Event.objects.create(
+            end_date=date(2020, 1, 1),
+            end_time=time(2, 0, 0),
+            start_date=date(2019, 12, 31),
+            start_time=time(20, 0, 0),
+            name='test event',
+            promoter=promoter,
+            venue=models.Venue.objects.create(name='test venue')
+        )
+        tallies = [
+            models.Tally.objects.create(
+                artist=models.Artist.objects.create_artist(
+                    email=f'artist{i}@test.com',
+                    password='testpass',
+                    name=f'artist {i}'
+                ),
+                event=event,
+                slug=f'{event.pk}-artist-{i}'
+            )
+            for i in range(2)
+        ]
+        first = models.VoteRollup.objects.live_results(event.pk)
+        self.assertEqual([t['votes'] for t in first['tallies']], [0, 0])
+        models.VoteRollup.objects.record_vote(tallies[1], 5)
+        self.assertEqual(
+            models.VoteRollup.objects.live_results(event.pk), first
+        )
+        second = models.VoteRollup.objects.publish_results(event.pk)
+        self.assertGreater(second['version'], first['version'])
+        self.assertEqual(second['tallies'][0]['artist'], 'artist 1')
+        self.assertEqual(second['tallies'][0]['points'], '5.00')
+        self.assertIsNone(models.VoteRollup.objects.live_results(0))
+
+
+class PublicProfileTests(TestCase):
+
+    def test_profile_follows_artist(self):
+        """Test that an artist's public fields are copied to a profile."""
+        artist = models.Artist.objects.create_artist(
+            email='artist@test.com',
+            password='testpass',
+            name='test artist'
+        )
+        artist.description = 'test description'
+        artist.save()
+        profile = models.PublicProfile.objects.get(pk=artist.pk)
+        self.assertTrue(profile.is_artist)
+        self.assertFalse(profile.is_promoter)
+        self.assertEqual(profile.name, 'test artist')
+        self.assertEqual(profile.description, 'test description')
+
+    @patch('core.models.Email')
+    def test_profile_follows_promoter_verification(self, mock_email):
+        """Test that a promoter's profile tracks verification."""
+        promoter = models.Promoter.objects.create_promoter(
+            email='promoter@test.com',
+            password='testpass',
+            name='test promoter',
+            phone='+442071234567'
+        )
+        self.assertFalse(
+            models.PublicProfile.objects.get(pk=promoter.pk).is_verified
+        )
+        promoter.is_verified = True
+        promoter.save(update_fields=['is_verified'])
+        self.assertTrue(
+            models.PublicProfile.objects.get(pk=promoter.pk).is_verified
+        )
+
+
+class SuggestIndexTests(TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, 'suggest.idx')
+        models.Venue.objects.create(name='The Moon Club')
+        models.Artist.objects.create_artist(
+            email='artist@test.com',
+            password='testpass',
+            name='Moonwalkers'
+        )
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_suggest_prefix(self):
+        """Test that names are suggested by any word prefix."""
+        suggest.build_index(self.path)
+        index = suggest.SuggestIndex(self.path)
+        results = index.suggest('MOON')
+        self.assertEqual(
+            [r['name'] for r in results], ['The Moon Club', 'Moonwalkers']
+        )
+        self.assertEqual(index.suggest('moon c')[0]['type'], 'venue')
+        self.assertEqual(index.suggest('walkers'), [])
+
+    def test_update_index(self):
+        """Test that an object's entries are replaced and removed."""
+        suggest.build_index(self.path)
+        venue = models.Venue.objects.get()
+        suggest.update_index('venue', venue.pk, 'Sun Club', self.path)
+        index = suggest.SuggestIndex(self.path)
+        self.assertEqual(index.suggest('club')[0]['name'], 'Sun Club')
+        self.assertFalse(
+            any(r['type'] == 'venue' for r in index.suggest('moon'))
+        )
+        suggest.update_index('venue', venue.pk, path=self.path)
+        self.assertEqual(suggest.SuggestIndex(self.path).suggest('sun'), [])
+
+    def test_update_index_appends_delta(self):
+        """Test that updates leave the snapshot until it is compacted."""
+        suggest.build_index(self.path)
+        index = suggest.SuggestIndex(self.path)
+        venue = models.Venue.objects.get()
+        suggest.update_index('venue', venue.pk, 'Sun Club', self.path)
+        self.assertFalse(os.path.exists(f'{self.path}.merging'))
+        self.assertEqual(index.suggest('sun'), [])
+        index.refresh()
+        self.assertEqual(index.suggest('sun')[0]['id'], venue.pk)
+        self.assertIn(
+            ('moon club', 'venue', str(venue.pk), 'The Moon Club'),
+            suggest.read_entries(self.path)
+        )
+        self.assertTrue(suggest.compact_index(self.path))
+        self.assertFalse(os.path.exists(f'{self.path}.delta'))
+        self.assertNotIn(
+            ('moon club', 'venue', str(venue.pk), 'The Moon Club'),
+            suggest.read_entries(self.path)
+        )
+        self.assertEqual(
+            suggest.SuggestIndex(self.path).suggest('sun')[0]['name'],
+            'Sun Club'
+        )
+
+    def test_get_index_compacts(self):
+        """Test that a large delta is merged into the snapshot."""
+        venue = models.Venue.objects.get()
+        with self.settings(SUGGEST_INDEX_PATH=self.path, SUGGEST_DELTA_MAX=2):
+            suggest.build_index(self.path)
+            suggest.update_index('venue', venue.pk, 'Sun Club', self.path)
+            self.assertEqual(len(suggest.get_index().changes), 1)
+            suggest.update_index('venue', 0, 'Star Club', self.path)
+            index = suggest.get_index()
+            self.assertEqual(index.changes, {})
+            self.assertEqual(
+                [r['name'] for r in index.suggest('s')],
+                ['Star Club', 'Sun Club']
+            )
+
+    def test_name_with_separator(self):
+        """Test that a name containing the field separator is stored."""
+        suggest.build_index(self.path)
+        venue = models.Venue.objects.get()
+        suggest.update_index('venue', venue.pk, 'Sun\x1fClub', self.path)
+        self.assertEqual(
+            suggest.SuggestIndex(self.path).suggest('club')[0]['name'],
+            'Sun Club'
+        )
+        suggest.compact_index(self.path)
+        self.assertEqual(
+            suggest.SuggestIndex(self.path).suggest('club')[0]['name'],
+            'Sun Club'
+        )
+
+
 class StringRepresentationTests(TestCase):
 
     def test_str_user(self):
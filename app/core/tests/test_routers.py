@@ -0,0 +1,69 @@
+from unittest.mock import patch
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+
+from core.models import Venue
+from core.routers import PIN_COOKIE, ReplicaMiddleware, ReplicaRouter
+
+DATABASES = dict(settings.DATABASES, replica=settings.DATABASES['default'])
+
+
+class PublicView:
+    read_replica = True
+
+
+class PrivateView:
+    pass
+
+
+@override_settings(DATABASES=DATABASES)
+@patch('core.routers.replica_lag', return_value=0)
+class ReplicaRouterTests(TestCase):
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.router = ReplicaRouter()
+
+    def route(self, request, view):
+        """Runs a request through the middleware and returns the read db."""
+        routed = []
+
+        def get_response(request):
+            middleware.process_view(request, view, (), {})
+            routed.append(self.router.db_for_read(Venue))
+            return HttpResponse()
+
+        middleware = ReplicaMiddleware(get_response)
+        response = middleware(request)
+        return routed[0], response
+
+    def test_public_read_uses_replica(self, lag):
+        """Test that safe requests to public read views use the replica."""
+        db, _ = self.route(self.factory.get('/'), PublicView)
+        self.assertEqual(db, 'replica')
+        db, _ = self.route(self.factory.get('/'), PrivateView)
+        self.assertEqual(db, 'default')
+
+    def test_write_pins_to_primary(self, lag):
+        """Test that a client reads the primary just after writing."""
+        _, response = self.route(
+            self.factory.post('/', HTTP_AUTHORIZATION='Token abc'),
+            PublicView
+        )
+        self.assertIn(PIN_COOKIE, response.cookies)
+        request = self.factory.get('/', HTTP_AUTHORIZATION='Token abc')
+        self.assertEqual(self.route(request, PublicView)[0], 'default')
+        request = self.factory.get('/')
+        request.COOKIES[PIN_COOKIE] = '1'
+        self.assertEqual(self.route(request, PublicView)[0], 'default')
+
+    def test_lagging_replica_falls_back(self, lag):
+        """Test that reads use the primary when the replica lags."""
+        lag.return_value = settings.REPLICA_MAX_LAG + 1
+        db, _ = self.route(self.factory.get('/'), PublicView)
+        self.assertEqual(db, 'default')
+        lag.return_value = None
+        db, _ = self.route(self.factory.get('/'), PublicView)
+        self.assertEqual(db, 'default')
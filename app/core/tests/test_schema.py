@@ -0,0 +1,39 @@
+import os
+import tempfile
+
+from django.test import TestCase, override_settings
+
+from core import schema
+
+SCHEMA_DIR = os.path.join(tempfile.gettempdir(), 'test-openapi-schema')
+
+
+@override_settings(OPENAPI_SCHEMA_DIR=SCHEMA_DIR)
+class SchemaTests(TestCase):
+
+    def setUp(self):
+        schema._schemas.clear()
+        self.addCleanup(schema._schemas.clear)
+
+    def test_schema_cached_with_etag(self):
+        """Test that the schema is generated once and revalidates."""
+        res = self.client.get('/swagger/?format=openapi')
+        self.assertEqual(res.status_code, 200)
+        self.assertIn(b'"swagger"', res.content)
+        with self.assertNumQueries(0):
+            again = self.client.get('/swagger/?format=openapi')
+        self.assertEqual(again.content, res.content)
+        res = self.client.get(
+            '/swagger/?format=openapi', HTTP_IF_NONE_MATCH=res['ETag']
+        )
+        self.assertEqual(res.status_code, 304)
+
+    def test_schema_served_from_disk(self):
+        """Test that a schema written at release is served as is."""
+        os.makedirs(SCHEMA_DIR, exist_ok=True)
+        path = os.path.join(SCHEMA_DIR, 'openapi.json')
+        with open(path, 'wb') as f:
+            f.write(b'{"swagger": "2.0"}')
+        self.addCleanup(os.remove, path)
+        res = self.client.get('/swagger/?format=openapi')
+        self.assertEqual(res.content, b'{"swagger": "2.0"}')
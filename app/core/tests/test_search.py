@@ -0,0 +1,42 @@
+from unittest.mock import patch
+
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from core.models import Artist
+
+
+LIST_ARTISTS_URL = reverse('user:list-artists', kwargs={'version': 'v1'})
+
+
+@patch('core.models.Email')
+class RankedSearchFilterTests(TestCase):
+    """Test the ranked search on the list views."""
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_search_artists_ranked(self, email):
+        """Test that name matches are ranked above description matches."""
+        Artist.objects.create_artist(
+            email='artist1@test.com', password='testpass',
+            name='other artist', phone='+447546103437',
+            description='supporting the moonwalkers'
+        )
+        Artist.objects.create_artist(
+            email='artist2@test.com', password='testpass',
+            name='the moonwalkers', phone='+447546103438'
+        )
+        Artist.objects.create_artist(
+            email='artist3@test.com', password='testpass',
+            name='unrelated', phone='+447546103439'
+        )
+        res = self.client.get(LIST_ARTISTS_URL, {'search': 'moonwalk'})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [artist['name'] for artist in res.data],
+            ['the moonwalkers', 'other artist']
+        )
@@ -0,0 +1,75 @@
+import os
+import shutil
+import tempfile
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TransactionTestCase, override_settings
+
+from core.models import Venue, upload_storage
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+def flyer(content=b'flyer'):
+    return SimpleUploadedFile('flyer.jpg', content)
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class ContentAddressedStorageTests(TransactionTestCase):
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    def create_venue(self, image):
+        return Venue.objects.create(
+            name='Moon Club', address_line1='1 Street', address_zip='AB1',
+            image=image
+        )
+
+    def test_duplicates_share_one_file(self):
+        """Test that identical uploads are stored once under their hash."""
+        first = self.create_venue(flyer())
+        second = self.create_venue(flyer())
+        self.assertEqual(first.image.name, second.image.name)
+        self.assertRegex(
+            first.image.name, r'^uploads/[0-9a-f]{2}/[0-9a-f]{64}\.jpg$'
+        )
+        self.assertTrue(upload_storage.exists(first.image.name))
+
+    @override_settings(MEDIA_RELEASE_GRACE=0)
+    def test_file_released_with_last_reference(self):
+        """Test that a shared file is deleted only when unused."""
+        first = self.create_venue(flyer())
+        second = self.create_venue(flyer())
+        name = first.image.name
+
+        first.image = flyer(b'new flyer')
+        first.save()
+        self.assertTrue(upload_storage.exists(name))
+        second.delete()
+        self.assertFalse(upload_storage.exists(name))
+        self.assertTrue(upload_storage.exists(first.image.name))
+
+    def test_reused_file_kept_for_grace(self):
+        """Test that a file reused by an upload outlives its release."""
+        venue = self.create_venue(flyer())
+        name = venue.image.name
+        os.utime(upload_storage.path(name), (0, 0))
+        # The upload reuses the stored file before its row is saved.
+        upload_storage.save('uploads/flyer.jpg', flyer())
+        venue.delete()
+        self.assertTrue(upload_storage.exists(name))
+
+        os.utime(upload_storage.path(name), (0, 0))
+        call_command('sweep_media', once=True)
+        self.assertFalse(upload_storage.exists(name))
+
+    def test_sweep_keeps_used_files(self):
+        """Test that the sweep leaves files that are still referred to."""
+        venue = self.create_venue(flyer())
+        os.utime(upload_storage.path(venue.image.name), (0, 0))
+        call_command('sweep_media', once=True)
+        self.assertTrue(upload_storage.exists(venue.image.name))
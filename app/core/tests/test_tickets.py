@@ -0,0 +1,108 @@
+import shutil
+import tempfile
+from datetime import date, time
+from unittest.mock import patch
+from urllib.parse import urlsplit
+
+from django.contrib.auth import get_user_model
+from django.core.files.storage import default_storage
+from django.test import TestCase, override_settings
+
+from rest_framework.authtoken.models import Token
+
+from core import models
+from core.tickets import render_ticket, ticket_info, ticket_link, \
+                         ticket_stem
+
+MEDIA_ROOT = tempfile.mkdtemp()
+PDF_URL = '/v1/league/ticket/ABC123/pdf/'
+
+
+@override_settings(
+    MEDIA_ROOT=MEDIA_ROOT, MEDIA_ACCEL_REDIRECT='/protected-media/'
+)
+class TicketFileTests(TestCase):
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        with patch('core.models.Email'):
+            promoter = models.Promoter.objects.create_promoter(
+                email='promoter@test.com',
+                password='testpass',
+                name='test promoter',
+                phone='+442071234567'
+            )
+            self.user = get_user_model().objects.create_user(
+                email='test@test.com', password='testpass', name='test user'
+            )
+        event = models.Event.objects.create(
+            end_date=date(2020, 1, 1),
+            end_time=time(2, 0, 0),
+            start_date=date(2019, 12, 31),
+            start_time=time(20, 0, 0),
+            name='test event',
+            promoter=promoter,
+            venue=models.Venue.objects.create(name='test venue')
+        )
+        ticket_type = models.TicketType.objects.create(
+            event=event, name='test ticket type', price=0,
+            slug='1-test-ticket-type', tickets_remaining=10
+        )
+        self.ticket = models.Ticket.objects.create(
+            code='ABC123', owner=self.user, ticket_type=ticket_type
+        )
+        token = Token.objects.create(user=self.user)
+        self.auth = {'HTTP_AUTHORIZATION': f'Token {token.key}'}
+
+    def test_render_ticket(self):
+        """Test that the QR code and PDF are stored under the stem."""
+        stem = render_ticket(ticket_info(self.ticket))
+        self.assertTrue(stem.startswith(f'private/{self.user.pk}/tickets/'))
+        with default_storage.open(f'{stem}.pdf') as f:
+            self.assertEqual(f.read(5), b'%PDF-')
+        with default_storage.open(f'{stem}.png') as f:
+            self.assertEqual(f.read(4), b'\x89PNG')
+
+    def test_stem_changes_with_event(self):
+        """Test that editing the event invalidates rendered files."""
+        stem = ticket_stem(ticket_info(self.ticket))
+        self.ticket.ticket_type.event.name = 'renamed event'
+        self.assertNotEqual(stem, ticket_stem(ticket_info(self.ticket)))
+
+    def test_download_queues_then_serves(self):
+        """Test that a download is queued once and then handed to nginx."""
+        res = self.client.get(PDF_URL, **self.auth)
+        self.assertEqual(res.status_code, 202)
+        self.assertEqual(res['Retry-After'], '1')
+        self.ticket.refresh_from_db()
+        self.assertIsNotNone(self.ticket.render_requested_at)
+
+        stem = render_ticket(ticket_info(self.ticket))
+        models.Ticket.objects.mark_rendered(self.ticket, stem)
+        res = self.client.get(PDF_URL, **self.auth)
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(
+            res['X-Accel-Redirect'], f'/protected-media/{stem}.pdf'
+        )
+        self.assertIn('ticket-ABC123.pdf', res['Content-Disposition'])
+
+    def test_download_needs_holder_or_signature(self):
+        """Test that strangers need the signed link from the email."""
+        self.assertEqual(self.client.get(PDF_URL).status_code, 403)
+        self.assertEqual(
+            self.client.get(PDF_URL, {'signature': 'bad'}).status_code, 403
+        )
+        url = urlsplit(ticket_link('ABC123'))
+        self.assertEqual(url.path, PDF_URL)
+        self.assertEqual(
+            self.client.get(f'{url.path}?{url.query}').status_code, 202
+        )
+
+    def test_download_bad_signature_falls_back_to_holder(self):
+        """Test that a signed in holder is let in despite a bad link."""
+        res = self.client.get(PDF_URL, {'signature': 'bad'}, **self.auth)
+        self.assertEqual(res.status_code, 202)
@@ -0,0 +1,122 @@
+import hashlib
+import io
+import json
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.urls import reverse
+from django.utils.http import urlencode
+
+from PIL import Image, ImageDraw, ImageFont
+
+from core.media import private_media_name, sign, valid_signature
+
+# A6 at 150dpi.
+PAGE_SIZE = (620, 874)
+PAGE_DPI = 150
+MARGIN = 40
+
+
+def ticket_info(ticket):
+    """
+    Everything printed on a ticket, as plain data that can be sent to
+    another process. Expects ticket_type__event__venue selected.
+    """
+    event = ticket.ticket_type.event
+    return {
+        'code': ticket.code,
+        # Unclaimed tickets are stored with the promoter's files.
+        'holder': ticket.owner_id or event.promoter_id,
+        'event': event.name,
+        'date': f'{event.start_date:%a %d %b %Y}, {event.start_time:%H:%M}',
+        'venue': event.venue.name,
+        'ticket_type': ticket.ticket_type.name,
+    }
+
+
+def ticket_stem(info):
+    """
+    Storage name, without extension, of a ticket's rendered files.
+    It changes with anything printed on the ticket, so an edited event is
+    rendered afresh rather than served stale.
+    """
+    digest = hashlib.sha256(
+        json.dumps(info, sort_keys=True).encode()
+    ).hexdigest()[:12]
+    return private_media_name(
+        info['holder'], 'tickets', f'{info["code"]}-{digest}'
+    )
+
+
+def ticket_link(code, file_format='pdf'):
+    """
+    Signed address of a ticket's file for the ticket email, which works
+    without logging in until TICKET_LINK_MAX_AGE seconds have passed.
+    """
+    path = reverse(
+        f'league:ticket-{file_format}', kwargs={'version': 'v1', 'code': code}
+    )
+    return settings.API_URL + path + '?' + urlencode(
+        {'signature': sign(f'tickets/{code}')}
+    )
+
+
+def valid_ticket_signature(code, signature):
+    return valid_signature(
+        f'tickets/{code}', signature, max_age=settings.TICKET_LINK_MAX_AGE
+    )
+
+
+def font(size):
+    try:
+        return ImageFont.truetype('DejaVuSans.ttf', size)
+    except OSError:
+        return ImageFont.load_default()
+
+
+def render_qr(code):
+    """QR code image of a ticket code, as scanned at the door."""
+    import qrcode
+
+    qr = qrcode.QRCode(
+        error_correction=qrcode.constants.ERROR_CORRECT_M, border=2
+    )
+    qr.add_data(code)
+    qr.make(fit=True)
+    return qr.make_image().convert('RGB')
+
+
+def render_ticket(info):
+    """
+    Renders a ticket's QR code (PNG) and printable page (PDF) to storage
+    and returns their stem. CPU bound; run by the render_tickets worker.
+    """
+    stem = ticket_stem(info)
+    qr = render_qr(info['code'])
+
+    page = Image.new('RGB', PAGE_SIZE, 'white')
+    draw = ImageDraw.Draw(page)
+    y = MARGIN
+    for text, size in (
+        (info['event'], 34), (info['date'], 22), (info['venue'], 22),
+        (info['ticket_type'], 22),
+    ):
+        draw.text((MARGIN, y), text, fill='black', font=font(size))
+        y += size + 16
+    side = PAGE_SIZE[0] - 2 * MARGIN
+    page.paste(qr.resize((side, side), Image.NEAREST), (MARGIN, y + 10))
+    draw.text(
+        (MARGIN, y + side + 30), info['code'], fill='black', font=font(40)
+    )
+
+    for ext, image, options in (
+        ('png', qr, {'format': 'PNG'}),
+        ('pdf', page, {'format': 'PDF', 'resolution': PAGE_DPI}),
+    ):
+        buffer = io.BytesIO()
+        image.save(buffer, **options)
+        name = f'{stem}.{ext}'
+        default_storage.delete(name)
+        default_storage.save(name, ContentFile(buffer.getvalue()))
+    return stem
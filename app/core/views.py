@@ -0,0 +1,66 @@
+import os
+import posixpath
+import time
+
+from django.db import DatabaseError
+from django.http import Http404, HttpResponseForbidden
+from django.views.decorators.http import require_safe
+
+from rest_framework import status
+from rest_framework.decorators import api_view, authentication_classes, \
+                                      permission_classes
+from rest_framework.response import Response
+
+from core import health
+from core.media import can_read, media_response
+
+
+@api_view(['GET'])
+@authentication_classes(())
+@permission_classes(())
+def healthz(request):
+    """Liveness: the worker is up and serving. Touches nothing else."""
+    return Response({
+        'status': 'ok',
+        'pid': os.getpid(),
+        'uptime': round(time.time() - health.started_at),
+    })
+
+
+@api_view(['GET'])
+@authentication_classes(())
+@permission_classes(())
+def readyz(request):
+    """
+    Readiness: this worker has warmed up, the database answers and every
+    migration is applied. Responds 503 with the failing checks otherwise,
+    so the proxy keeps traffic away.
+    """
+    report = {'pid': os.getpid()}
+    try:
+        if health.warmed_up is None:
+            health.warm_up()
+        report['database_ms'] = health.check_database()
+        report['pending_migrations'] = health.pending_migrations()
+        ready = report['pending_migrations'] == 0
+    except DatabaseError as e:
+        report['database_error'] = str(e)
+        ready = False
+    report['warm_up'] = health.warmed_up
+    report['status'] = 'ready' if ready else 'unavailable'
+    return Response(
+        report,
+        status=status.HTTP_200_OK if ready else
+        status.HTTP_503_SERVICE_UNAVAILABLE
+    )
+
+
+@require_safe
+def serve_media(request, path):
+    """Serves a media file the request may read."""
+    name = posixpath.normpath(path)
+    if name != path or name.startswith(('.', '/')):
+        raise Http404
+    if not can_read(request, name):
+        return HttpResponseForbidden()
+    return media_response(name)
@@ -2,7 +2,10 @@ from django.template.defaultfilters import slugify
 
 from rest_framework import serializers
 
-from core.models import Artist, Venue, Event, Tally, TicketType, Ticket
+from core.images import ImageVariantsField
+from core.models import Artist, Venue, Event, EventSeries, \
+                        SeriesTicketType, Tally, TicketType, Ticket, \
+                        QueueToken
 from user.serializers import PublicArtistSerializer
 
 
@@ -27,13 +30,15 @@ class CreateVenueSerializer(serializers.ModelSerializer):
 
 class VenueSerializer(serializers.ModelSerializer):
     """Serializer for the venue object."""
+    image_variants = ImageVariantsField()
 
     class Meta:
         model = Venue
         fields = (
             'address_city', 'address_country', 'address_line1',
             'address_line2', 'address_state', 'address_zip',
-            'description', 'google_maps', 'image', 'name', 'slug'
+            'description', 'google_maps', 'image', 'image_variants', 'name',
+            'slug'
         )
 
     def update(self, instance, validated_data):
@@ -83,8 +88,9 @@ class TallySerializer(serializers.ModelSerializer):
 
     def __init__(self, *args, **kwargs):
         super(TallySerializer, self).__init__(*args, **kwargs)
-        user = kwargs['context']['request'].user
-        if user.is_promoter:
+        # Schema generation introspects without a request.
+        user = getattr(kwargs['context']['request'], 'user', None)
+        if getattr(user, 'is_promoter', False):
             self.fields['event'].queryset = Event.objects.filter(
                 promoter=user.promoter
             )
@@ -99,6 +105,56 @@ class TallySerializer(serializers.ModelSerializer):
         return Tally.objects.create_tally(**validated_data)
 
 
+class SeriesTicketTypeSerializer(serializers.ModelSerializer):
+    """Serializer for a ticket type given to each event in a series."""
+
+    class Meta:
+        model = SeriesTicketType
+        fields = (
+            'name', 'price', 'queue_enabled', 'queue_rate',
+            'tickets_remaining'
+        )
+
+
+class SeriesEventSerializer(serializers.ModelSerializer):
+    """Serializer for the events created for a series."""
+    id = serializers.ReadOnlyField(source='pk')
+
+    class Meta:
+        model = Event
+        fields = ('id', 'start_date')
+
+
+class EventSeriesSerializer(serializers.ModelSerializer):
+    """Serializer for the event series object."""
+    id = serializers.ReadOnlyField(source='pk')
+    lineup = serializers.SlugRelatedField(
+        many=True, queryset=Artist.objects.all(), required=False,
+        slug_field='slug', source='artists'
+    )
+    events = SeriesEventSerializer(many=True, read_only=True)
+    promoter = serializers.ReadOnlyField(source='promoter.name')
+    ticket_types = SeriesTicketTypeSerializer(many=True, required=False)
+    venue = serializers.SlugRelatedField(
+        queryset=Venue.objects.all(), slug_field='slug'
+    )
+
+    class Meta:
+        model = EventSeries
+        fields = (
+            'description', 'end_time', 'ends_on', 'events', 'frequency',
+            'id', 'interval', 'lineup', 'name', 'promoter', 'start_time',
+            'starts_on', 'ticket_types', 'venue'
+        )
+        extra_kwargs = {
+            'interval': {'min_value': 1},
+        }
+
+    def create(self, validated_data):
+        """Create a new event series and its first events."""
+        return EventSeries.objects.create_series(**validated_data)
+
+
 class PublicTallySerializer(serializers.ModelSerializer):
     """Serializer for the tally object when publicly retrieved or listed."""
     artist = serializers.ReadOnlyField(source='artist.name')
@@ -145,7 +201,7 @@ class TicketTypeSerializer(serializers.ModelSerializer):
         fields = (
             'event', 'event_name', 'event_start_date', 'event_start_time',
             'event_end_date', 'event_end_time', 'name', 'price',
-            'tickets_remaining', 'slug'
+            'queue_enabled', 'queue_rate', 'tickets_remaining', 'slug'
         )
         extra_kwargs = {
             'slug': {'read_only': True},
@@ -153,8 +209,8 @@ class TicketTypeSerializer(serializers.ModelSerializer):
 
     def __init__(self, *args, **kwargs):
         super(TicketTypeSerializer, self).__init__(*args, **kwargs)
-        user = kwargs['context']['request'].user
-        if user.is_promoter:
+        user = getattr(kwargs['context']['request'], 'user', None)
+        if getattr(user, 'is_promoter', False):
             self.fields['event'].queryset = Event.objects.filter(
                 promoter=user.promoter
             )
@@ -182,19 +238,22 @@ class TicketTypeEventSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = TicketType
-        fields = ('name', 'price', 'tickets_remaining', 'slug')
+        fields = (
+            'name', 'price', 'queue_enabled', 'tickets_remaining', 'slug'
+        )
 
 
 class CreateTicketSerializer(serializers.ModelSerializer):
     """Serializer for the ticket object."""
     owner = serializers.StringRelatedField()
+    queue_token = serializers.CharField(write_only=True, required=False)
     ticket_type = serializers.SlugRelatedField(
         queryset=TicketType.objects.all(), slug_field='slug'
     )
 
     class Meta:
         model = Ticket
-        fields = ('code', 'owner', 'ticket_type', 'vote')
+        fields = ('code', 'owner', 'queue_token', 'ticket_type', 'vote')
         extra_kwargs = {
             'code': {'read_only': True},
             'owner': {'read_only': True},
@@ -207,6 +266,51 @@ class CreateTicketSerializer(serializers.ModelSerializer):
         return Ticket.objects.create_ticket(**validated_data)
 
 
+class QueueTokenSerializer(serializers.ModelSerializer):
+    """Serializer for the queue token object."""
+    owner = serializers.StringRelatedField()
+    ticket_type = serializers.SlugRelatedField(
+        queryset=TicketType.objects.filter(queue_enabled=True),
+        slug_field='slug'
+    )
+
+    class Meta:
+        model = QueueToken
+        fields = ('admitted_at', 'owner', 'position', 'ticket_type', 'token')
+        extra_kwargs = {
+            'admitted_at': {'read_only': True},
+            'position': {'read_only': True},
+            'token': {'read_only': True},
+        }
+
+    def create(self, validated_data):
+        """Join a ticket type's queue and return the token."""
+        return QueueToken.objects.join_queue(**validated_data)
+
+
+class CheckInSerializer(serializers.Serializer):
+    """Serializer for a batch of ticket scans at an event's door."""
+    codes = serializers.ListField(
+        child=serializers.CharField(max_length=6),
+        min_length=1,
+        max_length=500
+    )
+    event = serializers.IntegerField()
+
+
+class ScanSerializer(serializers.Serializer):
+    """Serializer for a ticket scan made offline by a door device."""
+    code = serializers.CharField(max_length=6)
+    scanned_at = serializers.DateTimeField()
+
+
+class DoorListScansSerializer(serializers.Serializer):
+    """Serializer for a delta upload of offline ticket scans."""
+    scans = serializers.ListField(
+        child=ScanSerializer(), min_length=1, max_length=500
+    )
+
+
 class TicketSerializer(serializers.ModelSerializer):
     """Serializer for the ticket object."""
     event = serializers.ReadOnlyField(source='ticket_type.event.name')
@@ -235,12 +339,14 @@ class TicketSerializer(serializers.ModelSerializer):
     class Meta:
         model = Ticket
         fields = (
-            'created_date', 'created_time', 'code', 'event', 'event_id',
+            'checked_in_at', 'created_at', 'created_date', 'created_time',
+            'code', 'event', 'event_id',
             'event_end_date', 'event_end_time', 'event_start_date',
             'event_start_time', 'id', 'owner', 'ticket_type',
             'ticket_type_slug', 'vote', 'vote_artist', 'vote_slug'
         )
         extra_kwargs = {
+            'checked_in_at': {'read_only': True},
             'code': {'read_only': True},
             'id': {'read_only': True},
             'owner': {'read_only': True},
@@ -252,6 +358,7 @@ class TicketSerializer(serializers.ModelSerializer):
 class EventSerializer(serializers.ModelSerializer):
     """Serializer for the event object."""
     id = serializers.ReadOnlyField(source='pk')
+    image_variants = ImageVariantsField()
     lineup = LineupSerializer(many=True, read_only=True)
     promoter = serializers.ReadOnlyField(source='promoter.name')
     promoter_slug = serializers.ReadOnlyField(source='promoter.slug')
@@ -269,10 +376,10 @@ class EventSerializer(serializers.ModelSerializer):
     class Meta:
         model = Event
         fields = (
-            'description', 'end_date', 'end_time', 'id', 'image', 'lineup',
-            'name', 'promoter', 'promoter_slug', 'start_date', 'start_time',
-            'ticket_types', 'tickets_sold', 'venue', 'venue_city',
-            'venue_google_maps', 'venue_name'
+            'description', 'end_date', 'end_time', 'id', 'image',
+            'image_variants', 'lineup', 'name', 'promoter', 'promoter_slug',
+            'start_date', 'start_time', 'ticket_types', 'tickets_sold',
+            'venue', 'venue_city', 'venue_google_maps', 'venue_name'
         )
         read_only_fields = ('id',)
 
@@ -303,3 +410,26 @@ class TableRowSerializer(serializers.ModelSerializer):
     class Meta:
         model = Artist
         fields = ('event_count', 'name', 'points', 'slug')
+
+
+class BulkLineupSerializer(serializers.Serializer):
+    """Serializer for adding several artists to an event's lineup."""
+    artists = serializers.ListField(
+        child=serializers.SlugField(), min_length=1, max_length=100
+    )
+    event = serializers.IntegerField()
+
+
+class BulkTicketTypeSerializer(serializers.Serializer):
+    """Serializer for creating several ticket types for an event."""
+    event = serializers.IntegerField()
+    ticket_types = SeriesTicketTypeSerializer(many=True)
+
+    def validate_ticket_types(self, value):
+        if not value:
+            raise serializers.ValidationError('Enter some ticket types.')
+        if len(value) > 100:
+            raise serializers.ValidationError(
+                'Enter at most 100 ticket types.'
+            )
+        return value
@@ -0,0 +1,111 @@
+from django.urls import reverse
+
+from rest_framework import status
+
+from core.models import Ticket
+
+from league.tests.test_ticket_api import PromoterTicketApiTests, \
+                                         create_event, create_promoter
+
+
+CHECK_IN_TICKETS_URL = reverse(
+    'league:check-in-tickets', kwargs={'version': 'v1'}
+)
+
+
+def check_in_url(code):
+    """Return the single ticket check-in URL for a code."""
+    return reverse(
+        'league:check-in-ticket', kwargs={'version': 'v1', 'code': code}
+    )
+
+
+class CheckInApiTests(PromoterTicketApiTests):
+    """Test checking in tickets at an event's door."""
+
+    def test_check_in_requires_promoter(self):
+        """Test that only verified promoters may check tickets in."""
+        payload = {'codes': ['aaaaaa'], 'event': self.event.pk}
+        for url in (CHECK_IN_TICKETS_URL, check_in_url('aaaaaa')):
+            self.client.force_authenticate(user=None)
+            res = self.client.post(url, payload, format='json')
+            self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+            self.client.force_authenticate(user=self.user)
+            res = self.client.post(url, payload, format='json')
+            self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertFalse(
+            Ticket.objects.filter(checked_in_at__isnull=False).exists()
+        )
+
+    def test_check_in_other_promoters_event(self):
+        """Test that another promoter's event is not found."""
+        self.client.force_authenticate(
+            user=create_promoter(email='other@test.com')
+        )
+        res = self.client.post(
+            CHECK_IN_TICKETS_URL,
+            {'codes': ['aaaaaa'], 'event': self.event.pk},
+            format='json'
+        )
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+        res = self.client.post(
+            check_in_url('aaaaaa'), {'event': self.event.pk}, format='json'
+        )
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_check_in_tickets(self):
+        """Test that a batch of scans is reported code by code."""
+        other = create_promoter(email='other@test.com')
+        other_event = create_event(other.promoter)
+        Ticket.objects.create(
+            code='cccccc', ticket_type=other_event.ticket_types.get()
+        )
+
+        res = self.client.post(
+            CHECK_IN_TICKETS_URL,
+            {
+                'codes': ['aaaaaa', 'cccccc', 'zzzzzz'],
+                'event': self.event.pk
+            },
+            format='json'
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        results = {each['code']: each for each in res.data['results']}
+        self.assertEqual(results['aaaaaa']['status'], Ticket.ADMITTED)
+        self.assertIsNotNone(results['aaaaaa']['checked_in_at'])
+        self.assertEqual(results['cccccc']['status'], Ticket.WRONG_EVENT)
+        self.assertEqual(results['zzzzzz']['status'], Ticket.INVALID)
+
+    def test_check_in_tickets_invalid(self):
+        """Test that empty, oversized and eventless batches are rejected."""
+        for payload in (
+            {'codes': [], 'event': self.event.pk},
+            {'codes': ['aaaaaa'] * 501, 'event': self.event.pk},
+            {'codes': ['aaaaaa']},
+        ):
+            res = self.client.post(
+                CHECK_IN_TICKETS_URL, payload, format='json'
+            )
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_check_in_ticket(self):
+        """Test that a ticket is admitted once, then refused."""
+        payload = {'event': self.event.pk}
+
+        res = self.client.post(check_in_url('aaaaaa'), payload)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['status'], Ticket.ADMITTED)
+
+        res = self.client.post(check_in_url('aaaaaa'), payload)
+        self.assertEqual(res.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(res.data['status'], Ticket.ALREADY_CHECKED_IN)
+
+        res = self.client.post(check_in_url('zzzzzz'), payload)
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(res.data['status'], Ticket.INVALID)
+
+    def test_check_in_ticket_invalid(self):
+        """Test that a scan without an event is rejected."""
+        res = self.client.post(check_in_url('aaaaaa'), {})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
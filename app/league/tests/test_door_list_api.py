@@ -0,0 +1,122 @@
+import gzip
+import json
+
+from django.urls import reverse
+
+from rest_framework import status
+
+from core.models import Ticket
+
+from league.tests.test_ticket_api import PromoterTicketApiTests, \
+                                         create_event, create_promoter
+
+
+def door_list_url(event_pk):
+    """Return the door list URL for an event."""
+    return reverse(
+        'league:door-list', kwargs={'version': 'v1', 'pk': event_pk}
+    )
+
+
+def scans_url(event_pk):
+    """Return the offline scans upload URL for an event."""
+    return reverse(
+        'league:door-list-scans', kwargs={'version': 'v1', 'pk': event_pk}
+    )
+
+
+class DoorListApiTests(PromoterTicketApiTests):
+    """Test the offline door list and its scan uploads."""
+
+    def download(self, params=None):
+        res = self.client.get(door_list_url(self.event.pk), params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        lines = gzip.decompress(
+            b''.join(res.streaming_content)
+        ).decode().splitlines()
+        return json.loads(lines[0]), lines[1:]
+
+    def upload(self, scans):
+        return self.client.post(
+            scans_url(self.event.pk), {'scans': scans}, format='json'
+        )
+
+    def test_door_list_requires_promoter(self):
+        """Test that only the event's promoter may use its door list."""
+        for url in (door_list_url(self.event.pk), scans_url(self.event.pk)):
+            self.client.force_authenticate(user=None)
+            res = self.client.get(url)
+            self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+            self.client.force_authenticate(user=self.user)
+            res = self.client.get(url)
+            self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+        self.client.force_authenticate(
+            user=create_promoter(email='other@test.com')
+        )
+        res = self.client.get(door_list_url(self.event.pk))
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+        res = self.upload([])
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_door_list(self):
+        """Test that the door list is a gzipped, sorted list of codes."""
+        header, lines = self.download()
+
+        self.assertEqual(header['event'], self.event.pk)
+        self.assertIsNone(header['since'])
+        self.assertEqual(lines, ['aaaaaa\t0', 'bbbbbb\t0'])
+
+    def test_door_list_invalid_since(self):
+        """Test that a version that is not a number is rejected."""
+        res = self.client.get(door_list_url(self.event.pk), {'since': 'abc'})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_upload_scans(self):
+        """Test that offline scans are checked in at their scan time."""
+        other = create_promoter(email='other@test.com')
+        other_event = create_event(other.promoter)
+        Ticket.objects.create(
+            code='cccccc', ticket_type=other_event.ticket_types.get()
+        )
+        scans = [
+            {'code': 'bbbbbb', 'scanned_at': '2030-01-01T21:00:00Z'},
+            {'code': 'aaaaaa', 'scanned_at': '2030-01-01T20:30:00Z'},
+            {'code': 'aaaaaa', 'scanned_at': '2030-01-01T20:45:00Z'},
+            {'code': 'cccccc', 'scanned_at': '2030-01-01T20:30:00Z'},
+            {'code': 'zzzzzz', 'scanned_at': '2030-01-01T20:30:00Z'},
+        ]
+
+        res = self.upload(scans)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        results = {each['code']: each for each in res.data['results']}
+        self.assertEqual(len(res.data['results']), 4)
+        self.assertEqual(results['aaaaaa']['status'], Ticket.ADMITTED)
+        self.assertEqual(
+            results['aaaaaa']['checked_in_at'].isoformat(),
+            '2030-01-01T20:30:00+00:00'
+        )
+        self.assertEqual(results['bbbbbb']['status'], Ticket.ADMITTED)
+        self.assertEqual(results['cccccc']['status'], Ticket.WRONG_EVENT)
+        self.assertEqual(results['zzzzzz']['status'], Ticket.INVALID)
+        header, lines = self.download()
+        self.assertEqual(lines, ['aaaaaa\t1', 'bbbbbb\t1'])
+
+    def test_upload_scans_replayed(self):
+        """Test that uploading the same scans again admits nobody twice."""
+        scans = [{'code': 'aaaaaa', 'scanned_at': '2030-01-01T20:30:00Z'}]
+        self.upload(scans)
+
+        res = self.upload(scans)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            res.data['results'][0]['status'], Ticket.ALREADY_CHECKED_IN
+        )
+
+    def test_upload_scans_invalid(self):
+        """Test that empty, oversized and malformed uploads are rejected."""
+        scan = {'code': 'aaaaaa', 'scanned_at': '2030-01-01T20:30:00Z'}
+        for scans in ([], [scan] * 501, [{'code': 'aaaaaa'}]):
+            res = self.upload(scans)
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
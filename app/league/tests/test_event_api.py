@@ -0,0 +1,218 @@
+from decimal import Decimal
+from unittest.mock import patch
+
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from core.models import Artist, Tally, TicketType, Ticket, CreditEntry, \
+                        SalesRollup
+
+from league.tests.test_ticket_api import create_event, create_promoter, \
+                                         create_user
+
+
+CREATE_LINEUP_URL = reverse('league:create-lineup', kwargs={'version': 'v1'})
+CREATE_TICKET_TYPES_URL = reverse(
+    'league:create-ticket-types', kwargs={'version': 'v1'}
+)
+
+
+def analytics_url(event_pk):
+    """Return the analytics URL for an event."""
+    return reverse(
+        'league:event-analytics', kwargs={'version': 'v1', 'pk': event_pk}
+    )
+
+
+@patch('core.models.Email')
+class BulkEventApiTests(TestCase):
+    """Test adding lineups and ticket types to an event in bulk."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.promoter = create_promoter()
+        self.event = create_event(self.promoter.promoter)
+        with patch('core.models.Email'):
+            for i in range(3):
+                Artist.objects.create_artist(
+                    email=f'artist{i}@test.com',
+                    password='testpass',
+                    name=f'test artist {i}'
+                )
+        self.client.force_authenticate(user=self.promoter)
+
+    def test_bulk_requires_promoter(self, email):
+        """Test that only the event's promoter may add to it."""
+        requests = (
+            (CREATE_LINEUP_URL, {
+                'artists': ['test-artist-0'], 'event': self.event.pk
+            }),
+            (CREATE_TICKET_TYPES_URL, {
+                'ticket_types': [{'name': 'vip', 'price': '10.00'}],
+                'event': self.event.pk
+            }),
+        )
+        user = create_user()
+        other = create_promoter(email='other@test.com')
+        for url, payload in requests:
+            self.client.force_authenticate(user=None)
+            res = self.client.post(url, payload, format='json')
+            self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+            self.client.force_authenticate(user=user)
+            res = self.client.post(url, payload, format='json')
+            self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+            self.client.force_authenticate(user=other)
+            res = self.client.post(url, payload, format='json')
+            self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertFalse(self.event.lineup.exists())
+        self.assertEqual(self.event.ticket_types.count(), 1)
+
+    def test_create_lineup(self, email):
+        """Test that artists are added once each."""
+        res = self.client.post(CREATE_LINEUP_URL, {
+            'artists': ['test-artist-0', 'test-artist-1'],
+            'event': self.event.pk
+        }, format='json')
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            [tally['artist_slug'] for tally in res.data],
+            ['test-artist-0', 'test-artist-1']
+        )
+
+        res = self.client.post(CREATE_LINEUP_URL, {
+            'artists': ['test-artist-1', 'test-artist-2'],
+            'event': self.event.pk
+        }, format='json')
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            [tally['artist_slug'] for tally in res.data], ['test-artist-2']
+        )
+        self.assertEqual(self.event.lineup.count(), 3)
+
+    def test_create_lineup_invalid(self, email):
+        """Test that empty lineups and unknown artists are rejected."""
+        for artists in ([], ['test-artist-0', 'nobody']):
+            res = self.client.post(CREATE_LINEUP_URL, {
+                'artists': artists, 'event': self.event.pk
+            }, format='json')
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(self.event.lineup.exists())
+
+    def test_create_ticket_types(self, email):
+        """Test that several ticket types are created at once."""
+        res = self.client.post(CREATE_TICKET_TYPES_URL, {
+            'ticket_types': [
+                {'name': 'early bird', 'price': '3.00'},
+                {'name': 'vip', 'price': '10.00', 'tickets_remaining': 20},
+            ],
+            'event': self.event.pk
+        }, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            [ticket_type['slug'] for ticket_type in res.data],
+            [f'{self.event.pk}-early-bird', f'{self.event.pk}-vip']
+        )
+        self.assertEqual(self.event.ticket_types.count(), 3)
+
+    def test_create_ticket_types_invalid(self, email):
+        """Test that empty, repeated and existing names are rejected."""
+        for ticket_types in (
+            [],
+            [{'name': 'vip', 'price': '10.00'}] * 2,
+            [{'name': 'vip', 'price': '10.00'},
+             {'name': 'standard', 'price': '5.00'}],
+        ):
+            res = self.client.post(CREATE_TICKET_TYPES_URL, {
+                'ticket_types': ticket_types, 'event': self.event.pk
+            }, format='json')
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.event.ticket_types.count(), 1)
+
+
+@patch('core.models.Email')
+class EventAnalyticsApiTests(TestCase):
+    """Test the promoter's event analytics."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.promoter = create_promoter()
+        self.event = create_event(self.promoter.promoter)
+        self.ticket_type = TicketType.objects.get(event=self.event)
+        with patch('core.models.Email'):
+            artist = Artist.objects.create_artist(
+                email='artist@test.com', password='testpass', name='artist'
+            )
+        self.tally = Tally.objects.create(
+            artist=artist, event=self.event, slug='artist'
+        )
+        self.user = create_user()
+        CreditEntry.objects.record([CreditEntry(
+            user=self.user, amount=Decimal('20.00'), kind=CreditEntry.PAYMENT
+        )])
+        self.client.force_authenticate(user=self.promoter)
+
+    def test_analytics_requires_promoter(self, email):
+        """Test that only the event's promoter may see its analytics."""
+        url = analytics_url(self.event.pk)
+        self.client.force_authenticate(user=None)
+        res = self.client.get(url)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.client.force_authenticate(user=self.user)
+        res = self.client.get(url)
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+        self.client.force_authenticate(
+            user=create_promoter(email='other@test.com')
+        )
+        res = self.client.get(url)
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_analytics(self, email):
+        """Test that sales, revenue and votes come from the rollups."""
+        Ticket.objects.create_tickets(
+            self.ticket_type, 2, owner=self.user, vote=self.tally
+        )
+
+        res = self.client.get(analytics_url(self.event.pk))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data['sales']), 1)
+        self.assertEqual(res.data['sales'][0]['tickets'], 2)
+        self.assertEqual(res.data['sales'][0]['revenue'], Decimal('10.00'))
+        self.assertEqual(res.data['ticket_types'], [{
+            'ticket_type': 'standard',
+            'ticket_type_slug': self.ticket_type.slug,
+            'tickets': 2,
+            'revenue': Decimal('10.00'),
+        }])
+        self.assertEqual(res.data['votes'], [{
+            'artist': 'artist',
+            'tally': 'artist',
+            'votes': 2,
+            'points': Decimal('10.00'),
+        }])
+
+    def test_analytics_period(self, email):
+        """Test that the sales can be limited to a period."""
+        Ticket.objects.create_ticket(self.ticket_type, owner=self.user)
+        hour = SalesRollup.objects.get().hour
+
+        res = self.client.get(
+            analytics_url(self.event.pk), {'from': hour.isoformat()}
+        )
+        self.assertEqual(len(res.data['sales']), 1)
+        res = self.client.get(
+            analytics_url(self.event.pk), {'to': '2000-01-01T00:00:00'}
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['sales'], [])
+
+    def test_analytics_invalid_period(self, email):
+        """Test that a period that is not a datetime is rejected."""
+        for params in ({'from': 'notadate'}, {'to': '2020-13-45T99:00'}):
+            res = self.client.get(analytics_url(self.event.pk), params)
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn('error', res.data)
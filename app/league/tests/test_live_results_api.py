@@ -0,0 +1,125 @@
+import json
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from core.models import Artist, Tally, VoteRollup
+
+from league.tests.test_ticket_api import create_event, create_promoter
+
+
+def live_results_url(event_pk):
+    """Return the live results URL for an event."""
+    return reverse(
+        'league:live-results', kwargs={'version': 'v1', 'pk': event_pk}
+    )
+
+
+def live_results_stream_url(event_pk):
+    """Return the live results stream URL for an event."""
+    return reverse(
+        'league:live-results-stream', kwargs={'version': 'v1', 'pk': event_pk}
+    )
+
+
+class LiveResultsApiTests(TestCase):
+    """Test the live vote results (public)."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.event = create_event(create_promoter().promoter)
+        with patch('core.models.Email'):
+            artist = Artist.objects.create_artist(
+                email='artist@test.com', password='testpass', name='artist'
+            )
+        self.tally = Tally.objects.create(
+            artist=artist, event=self.event, slug='artist'
+        )
+
+    def vote(self):
+        """Record a vote and publish the results, as a commit would."""
+        VoteRollup.objects.record_vote(self.tally, 5)
+        VoteRollup.objects.publish_results(self.event.pk)
+
+    def test_live_results(self):
+        """Test that anyone can read an event's results."""
+        res = self.client.get(live_results_url(self.event.pk))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res['Cache-Control'], 'no-cache')
+        self.assertEqual(res.data['event'], self.event.pk)
+        self.assertEqual(res.data['tallies'], [
+            {'tally': 'artist', 'artist': 'artist', 'votes': 0,
+             'points': '0.00'}
+        ])
+
+    def test_live_results_long_poll(self):
+        """Test that a long-poll answers once the results change."""
+        version = self.client.get(
+            live_results_url(self.event.pk)
+        ).data['version']
+
+        with patch('league.views.time.sleep') as sleep:
+            sleep.side_effect = lambda seconds: self.vote()
+            res = self.client.get(
+                live_results_url(self.event.pk),
+                {'version': version, 'wait': 10}
+            )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        sleep.assert_called_once()
+        self.assertGreater(res.data['version'], version)
+        self.assertEqual(res.data['tallies'][0]['votes'], 1)
+
+    def test_live_results_invalid(self):
+        """Test that a bad version or wait is rejected."""
+        for params in ({'version': 'abc'}, {'wait': 'abc'}):
+            res = self.client.get(live_results_url(self.event.pk), params)
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_live_results_unknown_event(self):
+        """Test that results for a missing event are not found."""
+        for url in (live_results_url(0), live_results_stream_url(0)):
+            res = self.client.get(url)
+            self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_live_results_stream(self):
+        """Test that the stream sends the results as they change."""
+        res = self.client.get(live_results_stream_url(self.event.pk))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res['Content-Type'], 'text/event-stream')
+        self.assertEqual(res['X-Accel-Buffering'], 'no')
+        stream = iter(res.streaming_content)
+        self.assertEqual(next(stream), b'retry: 1000\n\n')
+        first = next(stream).decode()
+        version = int(first.split('\n')[0][len('id: '):])
+        self.vote()
+        second = next(stream).decode().split('\n')
+        self.assertGreater(int(second[0][len('id: '):]), version)
+        results = json.loads(second[1][len('data: '):])
+        self.assertEqual(results['tallies'][0]['votes'], 1)
+        res.close()
+
+    def test_live_results_stream_resumes(self):
+        """Test that a reconnecting client skips results it has seen."""
+        version = VoteRollup.objects.live_results(self.event.pk)['version']
+
+        with patch('league.views.time.sleep') as sleep:
+            sleep.side_effect = lambda seconds: self.vote()
+            res = self.client.get(
+                live_results_stream_url(self.event.pk),
+                HTTP_LAST_EVENT_ID=str(version)
+            )
+            stream = iter(res.streaming_content)
+            next(stream)
+            event = next(stream).decode()
+
+        self.assertGreater(int(event.split('\n')[0][len('id: '):]), version)
+        res.close()
@@ -0,0 +1,112 @@
+from datetime import date, timedelta
+from unittest.mock import patch
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from core.models import Artist, Venue, Event, EventSeries
+
+from league.tests.test_ticket_api import create_promoter, create_user
+
+
+CREATE_SERIES_URL = reverse('league:create-series', kwargs={'version': 'v1'})
+
+
+def series_url(series_pk):
+    """Return the URL of an event series."""
+    return reverse('league:series', kwargs={'version': 'v1', 'pk': series_pk})
+
+
+@override_settings(EVENT_SERIES_HORIZON=20)
+@patch('core.models.Email')
+class EventSeriesApiTests(TestCase):
+    """Test creating and retrieving event series."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.promoter = create_promoter()
+        with patch('core.models.Email'):
+            for i in range(2):
+                Artist.objects.create_artist(
+                    email=f'artist{i}@test.com',
+                    password='testpass',
+                    name=f'test artist {i}'
+                )
+        Venue.objects.create(name='test venue', slug='test-venue')
+        self.today = date.today()
+        self.payload = {
+            'end_time': '02:00',
+            'frequency': EventSeries.WEEKLY,
+            'lineup': ['test-artist-0', 'test-artist-1'],
+            'name': 'test night',
+            'start_time': '22:00',
+            'starts_on': self.today.isoformat(),
+            'ticket_types': [
+                {'name': 'entry', 'price': '5.00', 'tickets_remaining': 100}
+            ],
+            'venue': 'test-venue',
+        }
+        self.client.force_authenticate(user=self.promoter)
+
+    def test_create_series_requires_promoter(self, email):
+        """Test that only verified promoters may create a series."""
+        self.client.force_authenticate(user=None)
+        res = self.client.post(CREATE_SERIES_URL, self.payload, format='json')
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.client.force_authenticate(user=create_user())
+        res = self.client.post(CREATE_SERIES_URL, self.payload, format='json')
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertFalse(EventSeries.objects.exists())
+
+    def test_create_series(self, email):
+        """Test that a series is created with its events to the horizon."""
+        res = self.client.post(CREATE_SERIES_URL, self.payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        series = EventSeries.objects.get(pk=res.data['id'])
+        self.assertEqual(series.promoter.pk, self.promoter.pk)
+        self.assertEqual(
+            [event['start_date'] for event in res.data['events']],
+            [str(self.today + timedelta(weeks=n)) for n in range(3)]
+        )
+        event = Event.objects.get(pk=res.data['events'][0]['id'])
+        self.assertEqual(event.lineup.count(), 2)
+        self.assertEqual(event.ticket_types.get().name, 'entry')
+
+    def test_create_series_invalid(self, email):
+        """Test that an unknown frequency, venue or artist is rejected."""
+        for change in (
+            {'frequency': 'daily'},
+            {'interval': 0},
+            {'venue': 'nowhere'},
+            {'lineup': ['nobody']},
+        ):
+            res = self.client.post(
+                CREATE_SERIES_URL, dict(self.payload, **change), format='json'
+            )
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(EventSeries.objects.exists())
+
+    def test_retrieve_series(self, email):
+        """Test that anyone can retrieve a series and its events."""
+        pk = self.client.post(
+            CREATE_SERIES_URL, self.payload, format='json'
+        ).data['id']
+        self.client.force_authenticate(user=None)
+
+        res = self.client.get(series_url(pk))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['name'], 'test night')
+        self.assertEqual(res.data['promoter'], 'test promoter')
+        self.assertEqual(
+            res.data['lineup'], ['test-artist-0', 'test-artist-1']
+        )
+        self.assertEqual(len(res.data['events']), 3)
+        self.assertEqual(
+            self.client.get(series_url(0)).status_code,
+            status.HTTP_404_NOT_FOUND
+        )
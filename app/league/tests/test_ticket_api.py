@@ -0,0 +1,311 @@
+from datetime import date, time
+from decimal import Decimal
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from core.models import Promoter, Venue, Event, TicketType, Ticket, \
+                        CreditEntry, QueueToken
+
+
+CREATE_TICKET_URL = reverse('league:create-ticket', kwargs={'version': 'v1'})
+PAYMENT_INTENT_URL = reverse(
+    'league:webhook-payment-intent', kwargs={'version': 'v1'}
+)
+EXPORT_TICKETS_URL = reverse('league:export-tickets', kwargs={'version': 'v1'})
+
+
+def create_event(promoter, **params):
+    """Helper function to create an event with a ticket type."""
+    event = Event.objects.create(
+        end_date=date(2030, 1, 2),
+        end_time=time(2, 0, 0),
+        start_date=date(2030, 1, 1),
+        start_time=time(20, 0, 0),
+        name='test event',
+        promoter=promoter,
+        venue=Venue.objects.create(name='test venue', slug='test-venue'),
+        **params
+    )
+    TicketType.objects.create(
+        event=event,
+        name='standard',
+        price=Decimal('5.00'),
+        slug=f'{event.pk}-standard',
+        tickets_remaining=10
+    )
+    return event
+
+
+def create_promoter(email='promoter@test.com', **params):
+    """Helper function to create a verified promoter."""
+    with patch('core.models.Email'):
+        promoter = Promoter.objects.create_promoter(
+            email=email,
+            password='testpass',
+            name='test promoter',
+            phone='+442071234567',
+            **params
+        )
+    promoter.is_verified = True
+    promoter.save()
+    return get_user_model().objects.get(pk=promoter.pk)
+
+
+def create_user(email='test@test.com', **params):
+    """Helper function to create a new user."""
+    with patch('core.models.Email'):
+        return get_user_model().objects.create_user(
+            email=email, password='testpass', name='test user', **params
+        )
+
+
+@patch('core.models.Email')
+class CreateTicketApiTests(TestCase):
+    """Test buying a ticket with credit."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.event = create_event(create_promoter().promoter)
+        self.ticket_type = TicketType.objects.get(event=self.event)
+        self.user = create_user()
+        CreditEntry.objects.record([CreditEntry(
+            user=self.user, amount=Decimal('20.00'), kind=CreditEntry.PAYMENT
+        )])
+        self.client.force_authenticate(user=self.user)
+
+    def test_create_ticket_requires_login(self, email):
+        """Test that login is required to buy a ticket."""
+        self.client.force_authenticate(user=None)
+        res = self.client.post(
+            CREATE_TICKET_URL, {'ticket_type': self.ticket_type.slug}
+        )
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_create_ticket(self, email):
+        """Test that each ticket bought gets its own code."""
+        codes = []
+        for _ in range(3):
+            res = self.client.post(
+                CREATE_TICKET_URL, {'ticket_type': self.ticket_type.slug}
+            )
+            self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+            codes.append(res.data['code'])
+
+        self.assertEqual(len(set(codes)), 3)
+        self.assertTrue(all(len(code) == 6 for code in codes))
+        self.assertEqual(
+            sorted(Ticket.objects.filter(owner=self.user).values_list(
+                'code', flat=True
+            )),
+            sorted(codes)
+        )
+        self.ticket_type.refresh_from_db()
+        self.assertEqual(self.ticket_type.tickets_remaining, 7)
+
+    def test_create_ticket_invalid_ticket_type(self, email):
+        """Test that an unknown ticket type is rejected."""
+        res = self.client.post(CREATE_TICKET_URL, {'ticket_type': 'nope'})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('ticket_type', res.data)
+        self.assertFalse(Ticket.objects.exists())
+
+
+class PromoterTicketApiTests(TestCase):
+    """Base for the promoter's ticket API tests (authenticated)."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.promoter = create_promoter()
+        self.event = create_event(self.promoter.promoter)
+        self.ticket_type = TicketType.objects.get(event=self.event)
+        self.user = create_user()
+        for code in ('aaaaaa', 'bbbbbb'):
+            Ticket.objects.create(
+                code=code, owner=self.user, ticket_type=self.ticket_type
+            )
+        self.client.force_authenticate(user=self.promoter)
+
+
+class ExportTicketApiTests(PromoterTicketApiTests):
+    """Test the ticket sales export."""
+
+    def test_export_requires_promoter(self):
+        """Test that only verified promoters may export tickets."""
+        self.client.force_authenticate(user=None)
+        res = self.client.get(EXPORT_TICKETS_URL)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.client.force_authenticate(user=self.user)
+        res = self.client.get(EXPORT_TICKETS_URL)
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_export_tickets(self):
+        """Test that the promoter's tickets are streamed as CSV."""
+        other = create_promoter(email='other@test.com')
+        other_event = create_event(other.promoter)
+        Ticket.objects.create(
+            code='cccccc', ticket_type=other_event.ticket_types.get()
+        )
+
+        res = self.client.get(EXPORT_TICKETS_URL, {'event': self.event.pk})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res['Content-Type'], 'text/csv')
+        lines = b''.join(res.streaming_content).decode().splitlines()
+        self.assertTrue(lines[0].startswith('code,event_id,event,'))
+        self.assertEqual(
+            [line.split(',')[0] for line in lines[1:]], ['aaaaaa', 'bbbbbb']
+        )
+
+    def test_export_escapes_formulas(self):
+        """Test that buyer-chosen text cannot run as a spreadsheet formula."""
+        self.user.name = '=HYPERLINK("http://evil")'
+        self.user.save()
+
+        res = self.client.get(EXPORT_TICKETS_URL)
+
+        content = b''.join(res.streaming_content).decode()
+        self.assertIn("'=HYPERLINK", content)
+        self.assertNotIn(',"=HYPERLINK', content)
+
+    def test_export_invalid_event(self):
+        """Test that a non-numeric event is rejected."""
+        res = self.client.get(EXPORT_TICKETS_URL, {'event': 'abc'})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('event', res.data)
+
+
+@patch('core.models.Email')
+class PaymentIntentWebhookTests(TestCase):
+    """Test the Stripe payment intent webhook."""
+
+    def setUp(self):
+        self.client = APIClient()
+        with patch('core.models.Email'):
+            self.promoter = Promoter.objects.create_promoter(
+                email='promoter@test.com',
+                password='testpass',
+                name='test promoter',
+                phone='+442071234567'
+            )
+            self.user = get_user_model().objects.create_user(
+                email='test@test.com',
+                password='testpass',
+                name='test user',
+                stripe_customer_id='cus_test'
+            )
+        self.event = create_event(self.promoter)
+
+    def payload(self, quantity, amount, queue_token=None):
+        cart = [{
+            'slug': f'{self.event.pk}-standard',
+            'quantity': quantity,
+            'vote': None,
+            'queue_token': queue_token,
+        }]
+        return {'data': {'object': {
+            'customer': 'cus_test',
+            'description': repr(cart),
+            'transfer_group': 'group_test',
+            'charges': {'data': [{'id': 'ch_test', 'amount': amount}]},
+        }}}
+
+    def post(self, payload):
+        """Posts a delivery, then runs its on_commit callbacks."""
+        with patch('django.db.transaction.on_commit') as on_commit:
+            res = self.client.post(PAYMENT_INTENT_URL, payload, format='json')
+        for args, kwargs in on_commit.call_args_list:
+            args[0]()
+        return res
+
+    @patch('league.views.get_stripe')
+    def test_paid_intent_issues_tickets(self, get_stripe, email):
+        """Test that a paid intent credits the buyer and issues tickets."""
+        res = self.post(self.payload(2, 1000))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            Ticket.objects.filter(owner=self.user).count(), 2
+        )
+        self.user.refresh_from_db()
+        self.promoter.refresh_from_db()
+        self.assertEqual(self.user.credit, 0)
+        self.assertEqual(self.promoter.credit, Decimal('10.00'))
+        self.assertEqual(
+            CreditEntry.objects.filter(
+                user=self.user, kind=CreditEntry.PAYMENT
+            ).get().amount,
+            Decimal('10.00')
+        )
+        get_stripe().Transfer.create.assert_called_once()
+
+    @patch('league.views.get_stripe')
+    def test_transfer_waits_for_commit(self, get_stripe, email):
+        """Test that the promoter is only paid once the tickets commit."""
+        with patch('django.db.transaction.on_commit'):
+            self.client.post(
+                PAYMENT_INTENT_URL, self.payload(2, 1000), format='json'
+            )
+
+        get_stripe().Transfer.create.assert_not_called()
+
+    @patch('league.views.get_stripe')
+    def test_retried_intent_is_recorded_once(self, get_stripe, email):
+        """Test that a redelivered charge credits and pays nothing twice."""
+        self.post(self.payload(2, 1000))
+        res = self.post(self.payload(2, 1000))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(Ticket.objects.filter(owner=self.user).count(), 2)
+        self.assertEqual(
+            CreditEntry.objects.filter(kind=CreditEntry.PAYMENT).count(), 1
+        )
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.credit, 0)
+        get_stripe().Transfer.create.assert_called_once()
+
+    @patch('league.views.get_stripe')
+    def test_failed_issue_keeps_payment_as_credit(self, get_stripe, email):
+        """Test that a line that cannot be issued leaves the buyer credit."""
+        res = self.post(self.payload(20, 10000))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertFalse(Ticket.objects.exists())
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.credit, Decimal('100.00'))
+        get_stripe().Transfer.create.assert_not_called()
+
+    @patch('league.views.get_stripe')
+    def test_underpaid_intent_issues_nothing(self, get_stripe, email):
+        """Test that a charge short of the cart issues no tickets."""
+        res = self.client.post(
+            PAYMENT_INTENT_URL, self.payload(2, 500), format='json'
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertFalse(Ticket.objects.exists())
+        self.assertFalse(CreditEntry.objects.exists())
+
+    @patch('league.views.get_stripe')
+    def test_queued_intent_uses_admission(self, get_stripe, email):
+        """Test that a queued cart line uses its admission once."""
+        ticket_type = TicketType.objects.get()
+        ticket_type.queue_enabled = True
+        ticket_type.save()
+        queue_token = QueueToken.objects.join_queue(ticket_type, self.user)
+        QueueToken.objects.admit_queue_tokens(ticket_type, 1)
+
+        res = self.client.post(
+            PAYMENT_INTENT_URL, self.payload(2, 1000, queue_token.token),
+            format='json'
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(Ticket.objects.filter(owner=self.user).count(), 2)
+        queue_token.refresh_from_db()
+        self.assertIsNotNone(queue_token.used_at)
@@ -16,6 +16,18 @@ urlpatterns = [
         name='webhook-charge'
     ),
     path('prizes/', views.prizes, name='prizes'),
+    path('queue/<token>/', views.queue_status, name='queue-status'),
+    path('search/suggest/', views.search_suggest, name='search-suggest'),
+    path(
+        'live/event/<int:pk>/',
+        views.LiveResultsView.as_view(),
+        name='live-results'
+    ),
+    path(
+        'live/event/<int:pk>/stream/',
+        views.LiveResultsStreamView.as_view(),
+        name='live-results-stream'
+    ),
     path(
         'create/venue/',
         views.CreateVenueView.as_view(),
@@ -26,12 +38,32 @@ urlpatterns = [
         views.CreateEventView.as_view(),
         name='create-event'
     ),
+    path(
+        'create/series/',
+        views.CreateEventSeriesView.as_view(),
+        name='create-series'
+    ),
     path('create/tally/', views.CreateTallyView.as_view(), name='create-tally'),
+    path(
+        'create/lineup/',
+        views.CreateLineupView.as_view(),
+        name='create-lineup'
+    ),
     path(
         'create/ticket-type/',
         views.CreateTicketTypeView.as_view(),
         name='create-ticket-type'
     ),
+    path(
+        'create/ticket-types/',
+        views.CreateTicketTypesView.as_view(),
+        name='create-ticket-types'
+    ),
+    path(
+        'create/queue-token/',
+        views.CreateQueueTokenView.as_view(),
+        name='create-queue-token'
+    ),
     path(
         'create/ticket/',
         views.CreateTicketView.as_view(),
@@ -56,8 +88,31 @@ urlpatterns = [
         views.VoteTicketView.as_view(),
         name='vote-ticket'
     ),
+    path(
+        'check-in/tickets/',
+        views.CheckInTicketsView.as_view(),
+        name='check-in-tickets'
+    ),
+    path(
+        'check-in/ticket/<code>/',
+        views.CheckInTicketView.as_view(),
+        name='check-in-ticket'
+    ),
+    path(
+        'door-list/<pk>/',
+        views.DoorListView.as_view(),
+        name='door-list'
+    ),
+    path(
+        'door-list/<pk>/scans/',
+        views.DoorListScansView.as_view(),
+        name='door-list-scans'
+    ),
     path('venue/<slug>/', views.RetrieveVenueView.as_view(), name='venue'),
     path('event/<pk>/', views.RetrieveEventView.as_view(), name='event'),
+    path(
+        'series/<pk>/', views.RetrieveEventSeriesView.as_view(), name='series'
+    ),
     path('tally/<slug>/', views.RetrieveTallyView.as_view(), name='tally'),
     path('ticket/<code>/', views.RetrieveTicketView.as_view(), name='ticket'),
     path(
@@ -87,6 +142,31 @@ urlpatterns = [
     path(
         'list/tickets/', views.ListTicketView.as_view(), name='list-tickets'
     ),
+    path(
+        'analytics/event/<pk>/',
+        views.EventAnalyticsView.as_view(),
+        name='event-analytics'
+    ),
+    path(
+        'export/tickets/',
+        views.ExportTicketView.as_view(),
+        name='export-tickets'
+    ),
+    path(
+        'ticket/<code>/pdf/',
+        views.TicketFileView.as_view(file_format='pdf'),
+        name='ticket-pdf'
+    ),
+    path(
+        'ticket/<code>/qr/',
+        views.TicketFileView.as_view(file_format='png'),
+        name='ticket-png'
+    ),
+    path(
+        'render/event/<pk>/tickets/',
+        views.RenderEventTicketsView.as_view(),
+        name='render-event-tickets'
+    ),
     path(
         'list/table-rows/',
         views.ListTableRowView.as_view(),
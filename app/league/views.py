@@ -1,26 +1,44 @@
 from datetime import datetime
 from decimal import Decimal
+from itertools import chain
+from functools import lru_cache
 import ast
+import csv
+import json
 import os
+import time
+import zlib
 
 from django_filters import rest_framework as filters
+from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.db.models import Count, Sum, Q, F, Case, When, IntegerField
+from django.db import IntegrityError, connections, transaction
+from django.db.models import Count, Sum, Q, F, Case, When, IntegerField, \
+                             Prefetch
+from django.http import StreamingHttpResponse
+from django.shortcuts import get_object_or_404
 from django.template.defaultfilters import slugify
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 
 from rest_framework import filters as rest_filters
-from rest_framework import generics, authentication, serializers
+from rest_framework import generics, serializers, status
 from rest_framework.permissions import IsAuthenticated
-from rest_framework.decorators import api_view
+from rest_framework.decorators import api_view, authentication_classes, \
+                                      permission_classes
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-import stripe
-
 from app.keys import STRIPE_TEST_KEYS, STRIPE_LIVE_KEYS
-from core.models import User, Artist, Promoter, Venue, Event, Tally, \
-                        TicketType, Ticket
+from core.models import User, Artist, Promoter, Venue, Event, \
+                        EventSeries, Tally, TicketType, Ticket, QueueToken, \
+                        CreditEntry, SalesRollup, VoteRollup
+from core.authentication import CachedTokenAuthentication
 from core.email import Email
+from core.media import media_response
+from core.search import RankedSearchFilter
+from core.suggest import get_index
+from core.tickets import ticket_info, ticket_stem, valid_ticket_signature
 from league.permissions import IsVerifiedPromoter, IsPromoterOrReadOnly, \
                                IsOwner
 from league.serializers import CreateVenueSerializer, VenueSerializer, \
@@ -28,18 +46,32 @@ from league.serializers import CreateVenueSerializer, VenueSerializer, \
                                EventSerializer, TallySerializer, \
                                PublicTallySerializer, TicketTypeSerializer, \
                                TicketTypeEventSerializer, TicketSerializer, \
-                               TableRowSerializer
-
-if os.environ.get('DEV_ENV'):
-    stripe.api_key = STRIPE_TEST_KEYS['secret_key']
-else:
-    stripe.api_key = STRIPE_LIVE_KEYS['secret_key']
+                               TableRowSerializer, QueueTokenSerializer, \
+                               CheckInSerializer, DoorListScansSerializer, \
+                               EventSeriesSerializer, LineupSerializer, \
+                               BulkLineupSerializer, BulkTicketTypeSerializer
 
 PLATFORM_STRIPE_ID = 'acct_1EDWO8IZkWAHcQr8'
 
 
+@lru_cache(maxsize=None)
+def get_stripe():
+    """Imports and configures the Stripe SDK on first use."""
+    import stripe
+    if os.environ.get('DEV_ENV'):
+        stripe.api_key = STRIPE_TEST_KEYS['secret_key']
+    else:
+        stripe.api_key = STRIPE_LIVE_KEYS['secret_key']
+    return stripe
+
+
 class PaymentIntentWebhook(APIView):
-    """Handle checkout payments from customer to platform and promoter."""
+    """
+    Handle checkout payments from customer to platform and promoter.
+    Stripe retries deliveries, so a charge is only ever recorded once. A cart
+    line whose tickets cannot be issued leaves its payment with the buyer as
+    credit, and its promoter is only paid for lines that were issued.
+    """
     authentication_classes = ()
     permission_classes = ()
 
@@ -58,41 +90,79 @@ class PaymentIntentWebhook(APIView):
                 slug=item['slug']
             ).price * item['quantity']
             total_cart += cost
-        if Decimal(total_charge) - total_cart < 0.01 and len(charges) == 1:
+        # The charge has to cover the cart, not just fall short of it.
+        if abs(Decimal(total_charge) - total_cart) < Decimal('0.01') and \
+                len(charges) == 1:
             user = User.objects.get(
                 stripe_customer_id=request.data['data']['object']['customer']
             )
             charge_id = \
                 request.data['data']['object']['charges']['data'][0]['id']
-            user.credit += Decimal(total_charge)
-            user.save()
-            for item in cart:
-                ticket_type = TicketType.objects.get(slug=item['slug'])
-                if item['vote']:
-                    vote = Tally.objects.get(slug=item['vote'])
-                else:
-                    vote = None
-                transfer_amount = TicketType.objects.get(
-                    slug=item['slug']
-                ).price * item['quantity'] * 85
-                event_id = item['slug'].split('-')[0]
-                event = Event.objects.get(id=event_id)
-                promoter = Promoter.objects.get(slug=event.promoter.slug)
-                transfer = stripe.Transfer.create(
-                    amount=int(transfer_amount),
-                    currency='gbp',
-                    destination=promoter.stripe_account_id,
-                    source_transaction=charge_id,
-                    transfer_group=transfer_group
-                )
-                quantity = 0
-                while quantity < item['quantity']:
-                    Ticket.objects.create_ticket(
-                        ticket_type=ticket_type, owner=user, vote=vote
+            if CreditEntry.objects.filter(charge_id=charge_id).exists():
+                return Response({})
+            try:
+                with transaction.atomic():
+                    transfers = self.record_payment(
+                        user, cart, total_charge, charge_id
                     )
-                    quantity += 1
+                    transaction.on_commit(lambda: self.send_transfers(
+                        transfers, charge_id, transfer_group
+                    ))
+            except IntegrityError:
+                # A concurrent delivery of the same charge got there first.
+                pass
         return Response({})
 
+    def record_payment(self, user, cart, total_charge, charge_id):
+        """
+        Credits the buyer with the charge and spends it on the cart.
+        Returns the (promoter, amount) transfers owed for the issued lines.
+        """
+        CreditEntry.objects.record([CreditEntry(
+            user=user,
+            amount=Decimal(total_charge).quantize(Decimal('0.01')),
+            kind=CreditEntry.PAYMENT,
+            description=charge_id,
+            charge_id=charge_id
+        )])
+        transfers = []
+        for item in cart:
+            ticket_type = TicketType.objects.get(slug=item['slug'])
+            if item['vote']:
+                vote = Tally.objects.get(slug=item['vote'])
+            else:
+                vote = None
+            transfer_amount = ticket_type.price * item['quantity'] * 85
+            event_id = item['slug'].split('-')[0]
+            event = Event.objects.get(id=event_id)
+            promoter = Promoter.objects.get(slug=event.promoter.slug)
+            try:
+                # One purchase per cart line, using its queue token once.
+                with transaction.atomic():
+                    Ticket.objects.create_tickets(
+                        ticket_type=ticket_type,
+                        quantity=item['quantity'],
+                        owner=user,
+                        queue_token=item.get('queue_token'),
+                        vote=vote
+                    )
+            except ValueError:
+                # Sold out or not admitted: the payment stays as credit.
+                continue
+            transfers.append((promoter, int(transfer_amount)))
+        return transfers
+
+    def send_transfers(self, transfers, charge_id, transfer_group):
+        """Pays promoters their share once the tickets are committed."""
+        for promoter, amount in transfers:
+            get_stripe().Transfer.create(
+                amount=amount,
+                currency='gbp',
+                destination=promoter.stripe_account_id,
+                source_transaction=charge_id,
+                transfer_group=transfer_group
+            )
+
 
 class ChargeWebhook(APIView):
     """Handle tickets created in dashboard, paid for by the promoter."""
@@ -115,8 +185,12 @@ class ChargeWebhook(APIView):
             if Decimal(total_charge) - total_cart < 0.01:
                 stripe_account = source['id']
                 promoter = User.objects.get(stripe_account_id=stripe_account)
-                promoter.credit += Decimal(total_charge)
-                promoter.save()
+                CreditEntry.objects.record([CreditEntry(
+                    user=promoter,
+                    amount=Decimal(total_charge).quantize(Decimal('0.01')),
+                    kind=CreditEntry.PAYMENT,
+                    description=request.data['data']['object']['id']
+                )])
                 for item in cart:
                     ticket_type = TicketType.objects.get(slug=item['slug'])
                     if item['vote']:
@@ -143,16 +217,50 @@ def prizes(request, version):
     return Response({'total': total})
 
 
+@api_view(['GET'])
+@authentication_classes(())
+@permission_classes(())
+def queue_status(request, version, token):
+    """
+    Retrieve a queue token's position.
+    Answered from the cache so that polling does not hit the database.
+    """
+    try:
+        return Response(QueueToken.objects.queue_status(token))
+    except QueueToken.DoesNotExist:
+        return Response(
+            {'error': 'Queue token does not exist.'},
+            status=status.HTTP_404_NOT_FOUND
+        )
+
+
+@api_view(['GET'])
+@authentication_classes(())
+@permission_classes(())
+def search_suggest(request, version):
+    """
+    Suggest artists, promoters, venues and events for a search box.
+    Answered from the in-memory prefix index without touching the database.
+    """
+    try:
+        limit = min(int(request.query_params.get('limit', 10)), 20)
+    except ValueError:
+        limit = 10
+    return Response(
+        get_index().suggest(request.query_params.get('q', ''), limit)
+    )
+
+
 class CreateVenueView(generics.CreateAPIView):
     """Create a new venue."""
-    authentication_classes = (authentication.TokenAuthentication,)
+    authentication_classes = (CachedTokenAuthentication,)
     permission_classes = (IsAuthenticated, IsVerifiedPromoter,)
     serializer_class = CreateVenueSerializer
 
 
 class CreateEventView(generics.CreateAPIView):
     """Create a new event."""
-    authentication_classes = (authentication.TokenAuthentication,)
+    authentication_classes = (CachedTokenAuthentication,)
     permission_classes = (IsAuthenticated, IsVerifiedPromoter,)
     serializer_class = CreateEventSerializer
 
@@ -160,23 +268,96 @@ class CreateEventView(generics.CreateAPIView):
         serializer.save(promoter=self.request.user.promoter)
 
 
+class CreateEventSeriesView(generics.CreateAPIView):
+    """
+    Create a recurring event series.
+    Its events, lineups and ticket types are created in bulk up to
+    EVENT_SERIES_HORIZON days ahead, and extended by extend_series.
+    """
+    authentication_classes = (CachedTokenAuthentication,)
+    permission_classes = (IsAuthenticated, IsVerifiedPromoter,)
+    serializer_class = EventSeriesSerializer
+
+    def perform_create(self, serializer):
+        serializer.save(promoter=self.request.user.promoter)
+
+
 class CreateTallyView(generics.CreateAPIView):
     """Create a new tally."""
-    authentication_classes = (authentication.TokenAuthentication,)
+    authentication_classes = (CachedTokenAuthentication,)
     permission_classes = (IsAuthenticated, IsVerifiedPromoter)
     serializer_class = TallySerializer
 
 
 class CreateTicketTypeView(generics.CreateAPIView):
     """Create a new ticket type."""
-    authentication_classes = (authentication.TokenAuthentication,)
+    authentication_classes = (CachedTokenAuthentication,)
     permission_classes = (IsAuthenticated, IsVerifiedPromoter,)
     serializer_class = TicketTypeSerializer
 
 
+class CreateLineupView(APIView):
+    """
+    Add several artists to one of the promoter's events at once.
+    Artists already on the lineup are skipped. Nothing is added if any
+    artist is unknown.
+    """
+    authentication_classes = (CachedTokenAuthentication,)
+    permission_classes = (IsAuthenticated, IsVerifiedPromoter,)
+
+    def post(self, request, *args, **kwargs):
+        serializer = BulkLineupSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        event = get_object_or_404(
+            Event, pk=serializer.validated_data['event'],
+            promoter_id=request.user.pk
+        )
+        try:
+            tallies = Tally.objects.create_lineup(
+                event, serializer.validated_data['artists']
+            )
+        except ValueError as e:
+            return Response(
+                {'error': str(e)}, status=status.HTTP_400_BAD_REQUEST
+            )
+        return Response(
+            LineupSerializer(tallies, many=True).data,
+            status=status.HTTP_201_CREATED
+        )
+
+
+class CreateTicketTypesView(APIView):
+    """
+    Create several ticket types for one of the promoter's events at once.
+    Nothing is created if any name is already in use.
+    """
+    authentication_classes = (CachedTokenAuthentication,)
+    permission_classes = (IsAuthenticated, IsVerifiedPromoter,)
+
+    def post(self, request, *args, **kwargs):
+        serializer = BulkTicketTypeSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        event = get_object_or_404(
+            Event, pk=serializer.validated_data['event'],
+            promoter_id=request.user.pk
+        )
+        try:
+            ticket_types = TicketType.objects.create_ticket_types(
+                event, serializer.validated_data['ticket_types']
+            )
+        except ValueError as e:
+            return Response(
+                {'error': str(e)}, status=status.HTTP_400_BAD_REQUEST
+            )
+        return Response(
+            TicketTypeEventSerializer(ticket_types, many=True).data,
+            status=status.HTTP_201_CREATED
+        )
+
+
 class CreateTicketView(generics.CreateAPIView):
     """Create a new ticket."""
-    authentication_classes = (authentication.TokenAuthentication,)
+    authentication_classes = (CachedTokenAuthentication,)
     permission_classes = (IsAuthenticated,)
     serializer_class = CreateTicketSerializer
 
@@ -184,9 +365,19 @@ class CreateTicketView(generics.CreateAPIView):
         serializer.save(owner=self.request.user)
 
 
+class CreateQueueTokenView(generics.CreateAPIView):
+    """Join the queue for a ticket type."""
+    authentication_classes = (CachedTokenAuthentication,)
+    permission_classes = (IsAuthenticated,)
+    serializer_class = QueueTokenSerializer
+
+    def perform_create(self, serializer):
+        serializer.save(owner=self.request.user)
+
+
 class EditVenueView(generics.RetrieveUpdateDestroyAPIView):
     """Edit a venue."""
-    authentication_classes = (authentication.TokenAuthentication,)
+    authentication_classes = (CachedTokenAuthentication,)
     permission_classes = (IsAuthenticated, IsVerifiedPromoter,)
     serializer_class = VenueSerializer
     queryset = Venue.objects.all()
@@ -195,7 +386,7 @@ class EditVenueView(generics.RetrieveUpdateDestroyAPIView):
 
 class EditEventView(generics.RetrieveUpdateDestroyAPIView):
     """Edit an event."""
-    authentication_classes = (authentication.TokenAuthentication,)
+    authentication_classes = (CachedTokenAuthentication,)
     permission_classes = (
         IsAuthenticated, IsVerifiedPromoter, IsPromoterOrReadOnly,
     )
@@ -205,7 +396,7 @@ class EditEventView(generics.RetrieveUpdateDestroyAPIView):
 
 class DeleteTallyView(generics.RetrieveDestroyAPIView):
     """Delete a tally."""
-    authentication_classes = (authentication.TokenAuthentication,)
+    authentication_classes = (CachedTokenAuthentication,)
     permission_classes = (
         IsAuthenticated, IsVerifiedPromoter, IsPromoterOrReadOnly,
     )
@@ -221,7 +412,7 @@ class DeleteTallyView(generics.RetrieveDestroyAPIView):
 
 class EditTicketTypeView(generics.RetrieveUpdateDestroyAPIView):
     """Edit a ticket type."""
-    authentication_classes = (authentication.TokenAuthentication,)
+    authentication_classes = (CachedTokenAuthentication,)
     permission_classes = (
         IsAuthenticated, IsVerifiedPromoter, IsPromoterOrReadOnly,
     )
@@ -232,12 +423,14 @@ class EditTicketTypeView(generics.RetrieveUpdateDestroyAPIView):
 
 class VoteTicketView(generics.RetrieveUpdateAPIView):
     """Edit a ticket (vote)."""
-    authentication_classes = (authentication.TokenAuthentication,)
+    authentication_classes = (CachedTokenAuthentication,)
     permission_classes = (IsAuthenticated, IsOwner,)
     queryset = Ticket.objects.all()
     lookup_field = 'code'
 
     def get_serializer_class(self):
+        if getattr(self, 'swagger_fake_view', False):
+            return TicketSerializer
         ticket = Ticket.objects.filter(code=self.kwargs.get('code', '')).first()
         if ticket:
             event = ticket.ticket_type.event
@@ -266,14 +459,267 @@ class VoteTicketView(generics.RetrieveUpdateAPIView):
         return TicketSerializer
 
     def perform_update(self, serializer):
+        had_vote = serializer.instance.vote_id is not None
         instance = serializer.save(owner=self.request.user)
+        if not had_vote and instance.vote_id is not None:
+            VoteRollup.objects.record_vote(
+                instance.vote, instance.ticket_type.price
+            )
+            event_pk = instance.vote.event_id
+            transaction.on_commit(
+                lambda: VoteRollup.objects.publish_results(event_pk)
+            )
         owner = instance.owner
         if not owner.is_promoter:
             Email('vote', owner.email).send()
 
 
+def wait_for_results(event_pk, version, timeout):
+    """
+    Helper function to wait for an event's live results to move past a
+    version. Only the cache is read while waiting.
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        results = VoteRollup.objects.live_results(event_pk)
+        if results is None or results['version'] != version or \
+                time.monotonic() >= deadline:
+            return results
+        # Don't hold database connections while waiting on the cache.
+        for connection in connections.all():
+            if not connection.in_atomic_block:
+                connection.close()
+        time.sleep(settings.LIVE_RESULTS_POLL_INTERVAL)
+
+
+class LiveResultsView(APIView):
+    """
+    Retrieve an event's live vote results, served from the cache.
+    Long-poll by passing the last '?version=' seen and a '?wait=' in
+    seconds: the response is held until the results change or the wait
+    runs out.
+    """
+    authentication_classes = ()
+    permission_classes = ()
+
+    def get(self, request, *args, **kwargs):
+        try:
+            version = int(request.query_params.get('version', 0))
+            wait = min(
+                float(request.query_params.get('wait', 0)),
+                settings.LIVE_RESULTS_MAX_WAIT
+            )
+        except ValueError:
+            return Response(
+                {'error': 'Enter a valid version and wait.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        results = wait_for_results(kwargs['pk'], version, max(wait, 0))
+        if results is None:
+            return Response(
+                {'error': 'Event does not exist.'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        response = Response(results)
+        response['Cache-Control'] = 'no-cache'
+        return response
+
+
+class LiveResultsStreamView(APIView):
+    """
+    Stream an event's live vote results as server-sent events.
+    An event is sent with the current results and again on every change.
+    The stream closes after LIVE_RESULTS_STREAM_DURATION seconds and the
+    client reconnects, resuming from the Last-Event-ID header.
+    """
+    authentication_classes = ()
+    permission_classes = ()
+
+    def stream(self, event_pk, version):
+        yield 'retry: 1000\n\n'
+        deadline = time.monotonic() + settings.LIVE_RESULTS_STREAM_DURATION
+        while time.monotonic() < deadline:
+            # Waits are kept short so a comment line is sent regularly,
+            # which keeps proxies from timing the connection out.
+            results = wait_for_results(
+                event_pk, version, min(15, deadline - time.monotonic())
+            )
+            if results is None:
+                return
+            if results['version'] == version:
+                yield ': keep-alive\n\n'
+                continue
+            version = results['version']
+            yield f'id: {version}\ndata: {json.dumps(results)}\n\n'
+
+    def get(self, request, *args, **kwargs):
+        if VoteRollup.objects.live_results(kwargs['pk']) is None:
+            return Response(
+                {'error': 'Event does not exist.'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        try:
+            version = int(request.META.get('HTTP_LAST_EVENT_ID', 0))
+        except ValueError:
+            version = 0
+        response = StreamingHttpResponse(
+            self.stream(kwargs['pk'], version),
+            content_type='text/event-stream'
+        )
+        response['Cache-Control'] = 'no-cache'
+        # Stops nginx from buffering the stream.
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
+
+class CheckInTicketsView(APIView):
+    """
+    Check in a batch of scanned tickets at an event's door.
+    Each code is reported as admitted, already checked in, for the wrong
+    event or invalid.
+    """
+    authentication_classes = (CachedTokenAuthentication,)
+    permission_classes = (IsAuthenticated, IsVerifiedPromoter,)
+
+    def check_in(self, request, event, codes):
+        try:
+            event = Event.objects.get(
+                pk=event, promoter_id=request.user.pk
+            )
+        except Event.DoesNotExist:
+            return None
+        results = Ticket.objects.check_in(event, codes)
+        return [
+            {'code': code, 'status': result, 'checked_in_at': checked_in_at}
+            for code, (result, checked_in_at) in results.items()
+        ]
+
+    def post(self, request, *args, **kwargs):
+        serializer = CheckInSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        results = self.check_in(
+            request,
+            serializer.validated_data['event'],
+            serializer.validated_data['codes']
+        )
+        if results is None:
+            return Response(
+                {'error': 'Event does not exist.'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        return Response({'results': results})
+
+
+class CheckInTicketView(CheckInTicketsView):
+    """Check in a single scanned ticket at an event's door."""
+
+    def post(self, request, *args, **kwargs):
+        serializer = CheckInSerializer(data={
+            'codes': [kwargs['code']], 'event': request.data.get('event')
+        })
+        serializer.is_valid(raise_exception=True)
+        results = self.check_in(
+            request,
+            serializer.validated_data['event'],
+            serializer.validated_data['codes']
+        )
+        if results is None:
+            return Response(
+                {'error': 'Event does not exist.'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        result = results[0]
+        if result['status'] == Ticket.ADMITTED:
+            return Response(result)
+        elif result['status'] == Ticket.ALREADY_CHECKED_IN:
+            return Response(result, status=status.HTTP_409_CONFLICT)
+        return Response(result, status=status.HTTP_404_NOT_FOUND)
+
+
+def gzip_lines(lines):
+    """Helper function to gzip a stream of text lines as it is sent."""
+    compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16)
+    for line in lines:
+        chunk = compressor.compress(line.encode() + b'\n')
+        if chunk:
+            yield chunk
+    yield compressor.flush()
+
+
+class DoorListView(APIView):
+    """
+    Export an event's door list for offline scanning.
+    The response is a gzipped text file: a JSON header line followed by one
+    'code<TAB>checked_in' line per ticket, sorted by code so devices can
+    binary search it. Pass '?since=<version>' to download only the tickets
+    that changed since a previous export.
+    """
+    authentication_classes = (CachedTokenAuthentication,)
+    permission_classes = (IsAuthenticated, IsVerifiedPromoter,)
+
+    def get(self, request, *args, **kwargs):
+        event = get_object_or_404(
+            Event, pk=kwargs['pk'], promoter_id=request.user.pk
+        )
+        try:
+            since = int(request.query_params.get('since', 0))
+        except ValueError:
+            return Response(
+                {'error': 'Enter a valid version.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        version, rows = Ticket.objects.door_list(event, since)
+        header = json.dumps({
+            'event': event.pk,
+            'version': version,
+            'since': since or None,
+        })
+        lines = (
+            f'{code}\t{int(checked_in)}' for code, checked_in in rows
+        )
+        response = StreamingHttpResponse(
+            gzip_lines(chain([header], lines)),
+            content_type='application/gzip'
+        )
+        response['Content-Disposition'] = \
+            f'attachment; filename="door-list-{event.pk}-{version}.gz"'
+        response['X-Door-List-Version'] = str(version)
+        return response
+
+
+class DoorListScansView(APIView):
+    """Upload the ticket scans a door device made while offline."""
+    authentication_classes = (CachedTokenAuthentication,)
+    permission_classes = (IsAuthenticated, IsVerifiedPromoter,)
+
+    def post(self, request, *args, **kwargs):
+        event = get_object_or_404(
+            Event, pk=kwargs['pk'], promoter_id=request.user.pk
+        )
+        serializer = DoorListScansSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        # Scans are applied with the time they were made at the door, and a
+        # ticket scanned more than once keeps its first scan.
+        scans = {}
+        for scan in sorted(
+            serializer.validated_data['scans'],
+            key=lambda scan: scan['scanned_at']
+        ):
+            scans.setdefault(scan['code'], scan['scanned_at'])
+        checked_in = Ticket.objects.check_in(event, list(scans), scans)
+        return Response({'results': [
+            {
+                'code': code,
+                'status': result,
+                'checked_in_at': checked_in_at
+            }
+            for code, (result, checked_in_at) in checked_in.items()
+        ]})
+
+
 class RetrieveVenueView(generics.RetrieveAPIView):
     """Retrieve a venue."""
+    read_replica = True
     queryset = Venue.objects.all()
     serializer_class = VenueSerializer
     lookup_field = 'slug'
@@ -281,6 +727,7 @@ class RetrieveVenueView(generics.RetrieveAPIView):
 
 class RetrieveEventView(generics.RetrieveAPIView):
     """Retrieve an event."""
+    read_replica = True
     serializer_class = EventSerializer
 
     def get_queryset(self):
@@ -298,8 +745,21 @@ class RetrieveEventView(generics.RetrieveAPIView):
         )
 
 
+class RetrieveEventSeriesView(generics.RetrieveAPIView):
+    """Retrieve an event series."""
+    read_replica = True
+    serializer_class = EventSeriesSerializer
+    queryset = EventSeries.objects.select_related(
+        'promoter', 'venue'
+    ).prefetch_related(
+        'artists', 'ticket_types',
+        Prefetch('events', queryset=Event.objects.order_by('start_date'))
+    )
+
+
 class RetrieveTallyView(generics.RetrieveAPIView):
     """Retrieve a tally."""
+    read_replica = True
     serializer_class = PublicTallySerializer
     lookup_field = 'slug'
 
@@ -330,7 +790,7 @@ class RetrieveTallyView(generics.RetrieveAPIView):
 
 class RetrieveTicketView(generics.RetrieveAPIView):
     """Retrieve a ticket."""
-    authentication_classes = (authentication.TokenAuthentication,)
+    authentication_classes = (CachedTokenAuthentication,)
     permission_classes = (IsOwner,)
     queryset = Ticket.objects.all()
     serializer_class = TicketSerializer
@@ -339,6 +799,7 @@ class RetrieveTicketView(generics.RetrieveAPIView):
 
 class RetrieveTicketTypeView(generics.RetrieveAPIView):
     """Retrieve a ticket type."""
+    read_replica = True
     queryset = TicketType.objects.all()
     serializer_class = TicketTypeEventSerializer
     lookup_field = 'slug'
@@ -346,13 +807,14 @@ class RetrieveTicketTypeView(generics.RetrieveAPIView):
 
 class RetrieveTableRowView(generics.RetrieveAPIView):
     """Retrieve a table row."""
+    read_replica = True
     serializer_class = TableRowSerializer
     lookup_field = 'slug'
 
     def get_queryset(self):
         today = datetime.today()
         time = datetime.now().time()
-        return Artist.objects.all().annotate(
+        return Artist.objects.only('name', 'slug').annotate(
             event_count=Count(
                 Case(
                     When(Q(tallies__event__start_date__lt=today) | (
@@ -591,17 +1053,18 @@ class TableRowFilter(filters.FilterSet):
 
 class ListVenueView(generics.ListAPIView):
     """List venues."""
+    read_replica = True
     queryset = Venue.objects.all().order_by('name')
     serializer_class = VenueSerializer
     filter_backends = (
         filters.DjangoFilterBackend,
-        rest_filters.SearchFilter,
+        RankedSearchFilter,
         rest_filters.OrderingFilter,
     )
     filterset_class = VenueFilter
     search_fields = (
-        'address_city', 'address_country', 'address_line1', 'address_line2',
-        'address_state', 'address_zip', 'description', 'name'
+        'name', 'address_city', 'address_country', 'address_line1',
+        'address_line2', 'address_state', 'address_zip', 'description'
     )
     ordering_fields = (
         'address_city', 'address_country', 'address_line1', 'address_line2',
@@ -611,17 +1074,15 @@ class ListVenueView(generics.ListAPIView):
 
 class ListEventView(generics.ListAPIView):
     """List events."""
+    read_replica = True
     serializer_class = EventSerializer
     filter_backends = (
         filters.DjangoFilterBackend,
-        rest_filters.SearchFilter,
+        RankedSearchFilter,
         rest_filters.OrderingFilter,
     )
     filterset_class = EventFilter
-    search_fields = (
-        'description', 'end_date', 'end_time', 'name', 'start_date',
-        'start_time'
-    )
+    search_fields = ('name', 'description')
     ordering_fields = (
         'description', 'end_date', 'end_time', 'name', 'start_date',
         'start_time'
@@ -644,6 +1105,7 @@ class ListEventView(generics.ListAPIView):
 
 class ListTallyView(generics.ListAPIView):
     """List tallies."""
+    read_replica = True
     serializer_class = PublicTallySerializer
     filter_backends = (
         filters.DjangoFilterBackend,
@@ -679,7 +1141,7 @@ class ListTallyView(generics.ListAPIView):
 
 class ListTicketTypeView(generics.ListAPIView):
     """List ticket types."""
-    authentication_classes = (authentication.TokenAuthentication,)
+    authentication_classes = (CachedTokenAuthentication,)
     permission_classes = (IsAuthenticated, IsVerifiedPromoter,)
     serializer_class = TicketTypeSerializer
     filter_backends = (
@@ -692,6 +1154,8 @@ class ListTicketTypeView(generics.ListAPIView):
     ordering_fields = ('name', 'price', 'tickets_remaining')
 
     def get_queryset(self):
+        if getattr(self, 'swagger_fake_view', False):
+            return TicketType.objects.none()
         return TicketType.objects.filter(
             event__promoter=self.request.user.promoter
         ).order_by('pk')
@@ -699,7 +1163,7 @@ class ListTicketTypeView(generics.ListAPIView):
 
 class ListTicketView(generics.ListAPIView):
     """List tickets."""
-    authentication_classes = (authentication.TokenAuthentication,)
+    authentication_classes = (CachedTokenAuthentication,)
     permission_classes = (IsAuthenticated,)
     serializer_class = TicketSerializer
     filter_backends = (
@@ -710,6 +1174,8 @@ class ListTicketView(generics.ListAPIView):
     filterset_class = TicketFilter
 
     def get_queryset(self):
+        if getattr(self, 'swagger_fake_view', False):
+            return Ticket.objects.none()
         if self.request.user.is_promoter:
             return Ticket.objects.all().prefetch_related('ticket_type__event', 'vote__artist').filter(
                 ticket_type__event__promoter=self.request.user.promoter
@@ -718,8 +1184,208 @@ class ListTicketView(generics.ListAPIView):
             return Ticket.objects.prefetch_related('ticket_type__event', 'vote__artist').filter(owner=self.request.user)
 
 
+class EventAnalyticsView(APIView):
+    """
+    Retrieve sales over time, revenue by ticket type and the vote
+    distribution for one of the promoter's events.
+    Answered from the hourly rollups rather than by scanning tickets.
+    Pass '?from=<datetime>&to=<datetime>' to limit the sales period.
+    """
+    authentication_classes = (CachedTokenAuthentication,)
+    permission_classes = (IsAuthenticated, IsVerifiedPromoter,)
+
+    def get(self, request, *args, **kwargs):
+        event = get_object_or_404(
+            Event, pk=kwargs['pk'], promoter_id=request.user.pk
+        )
+        rollups = SalesRollup.objects.filter(event=event)
+        for param, lookup in (('from', 'hour__gte'), ('to', 'hour__lte')):
+            value = request.query_params.get(param)
+            if not value:
+                continue
+            try:
+                when = parse_datetime(value)
+            except ValueError:
+                when = None
+            if when is None:
+                return Response(
+                    {'error': 'Enter a valid from and to datetime.'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            if timezone.is_naive(when):
+                when = timezone.make_aware(when)
+            rollups = rollups.filter(**{lookup: when})
+        sales = rollups.values('hour').annotate(
+            tickets=Sum('tickets'), revenue=Sum('revenue')
+        ).order_by('hour')
+        ticket_types = rollups.values(
+            'ticket_type__name', 'ticket_type__slug'
+        ).annotate(
+            tickets=Sum('tickets'), revenue=Sum('revenue')
+        ).order_by('-revenue')
+        votes = VoteRollup.objects.filter(event=event).values(
+            'tally__slug', 'tally__artist__name', 'votes', 'points'
+        ).order_by('-points')
+        return Response({
+            'sales': list(sales),
+            'ticket_types': [
+                {
+                    'ticket_type': row['ticket_type__name'],
+                    'ticket_type_slug': row['ticket_type__slug'],
+                    'tickets': row['tickets'],
+                    'revenue': row['revenue'],
+                }
+                for row in ticket_types
+            ],
+            'votes': [
+                {
+                    'artist': row['tally__artist__name'],
+                    'tally': row['tally__slug'],
+                    'votes': row['votes'],
+                    'points': row['points'],
+                }
+                for row in votes
+            ],
+        })
+
+
+class Echo(object):
+    """A file-like object that returns what is written, for csv.writer."""
+
+    def write(self, value):
+        return value
+
+
+def csv_cell(value):
+    """
+    Quotes text that a spreadsheet would run as a formula, as names and
+    emails in an export are chosen by buyers.
+    """
+    if isinstance(value, str) and value.startswith(
+        ('=', '+', '-', '@', '\t', '\r')
+    ):
+        return "'" + value
+    return value
+
+
+class TicketExportFilter(filters.FilterSet):
+    """Defines the filter fields for ExportTicketView."""
+    event = filters.NumberFilter(field_name='ticket_type__event_id')
+
+    class Meta:
+        model = Ticket
+        fields = ('event',)
+
+
+class ExportTicketView(APIView):
+    """
+    Export a promoter's ticket sales as CSV.
+    Rows are streamed from a single joined query, so memory use stays flat
+    however many tickets an event has. Pass '?event=<id>' for one event.
+    """
+    authentication_classes = (CachedTokenAuthentication,)
+    permission_classes = (IsAuthenticated, IsVerifiedPromoter,)
+    columns = (
+        ('code', 'code'),
+        ('event_id', 'ticket_type__event_id'),
+        ('event', 'ticket_type__event__name'),
+        ('ticket_type', 'ticket_type__name'),
+        ('price', 'ticket_type__price'),
+        ('owner', 'owner__name'),
+        ('owner_email', 'owner__email'),
+        ('vote', 'vote__artist__name'),
+        ('created_at', 'created_at'),
+        ('checked_in_at', 'checked_in_at'),
+    )
+
+    def get(self, request, *args, **kwargs):
+        tickets = TicketExportFilter(
+            request.query_params,
+            queryset=Ticket.objects.filter(
+                ticket_type__event__promoter_id=request.user.pk
+            )
+        )
+        if not tickets.is_valid():
+            return Response(
+                tickets.errors, status=status.HTTP_400_BAD_REQUEST
+            )
+        rows = tickets.qs.order_by('pk').values_list(
+            *[field for name, field in self.columns]
+        ).iterator(chunk_size=2000)
+        writer = csv.writer(Echo())
+        lines = chain([[name for name, field in self.columns]], rows)
+        response = StreamingHttpResponse(
+            (writer.writerow([csv_cell(v) for v in line]) for line in lines),
+            content_type='text/csv'
+        )
+        response['Content-Disposition'] = \
+            'attachment; filename="tickets.csv"'
+        return response
+
+
+class TicketFileView(APIView):
+    """
+    Download a ticket as a printable PDF, or its QR code as a PNG.
+    Files are rendered by the render_tickets worker: until they are ready
+    this answers 202 with Retry-After, then nginx serves the stored file.
+    Open to the ticket's owner and the event's promoter, or anyone with
+    the '?signature=' from the ticket email.
+    """
+    authentication_classes = (CachedTokenAuthentication,)
+    permission_classes = ()
+    file_format = None
+
+    def has_access(self, request, ticket):
+        signature = request.query_params.get('signature')
+        if signature and valid_ticket_signature(ticket.code, signature):
+            return True
+        # An expired or mangled link still works for a signed in holder.
+        user = request.user
+        return user.is_authenticated and (user.is_staff or user.pk in (
+            ticket.owner_id, ticket.ticket_type.event.promoter_id
+        ))
+
+    def get(self, request, *args, **kwargs):
+        ticket = get_object_or_404(
+            Ticket.objects.select_related('ticket_type__event__venue'),
+            code=kwargs['code']
+        )
+        if not self.has_access(request, ticket):
+            return Response(status=status.HTTP_403_FORBIDDEN)
+        stem = ticket_stem(ticket_info(ticket))
+        if ticket.rendered == stem:
+            filename = None
+            if self.file_format == 'pdf':
+                filename = f'ticket-{ticket.code}.pdf'
+            return media_response(f'{stem}.{self.file_format}', filename)
+        Ticket.objects.request_render(Ticket.objects.filter(pk=ticket.pk))
+        return Response(
+            {'status': 'rendering'}, status=status.HTTP_202_ACCEPTED,
+            headers={'Retry-After': '1'}
+        )
+
+
+class RenderEventTicketsView(APIView):
+    """
+    Queue every ticket for one of the promoter's events for rendering,
+    ahead of the ticket downloads before doors open.
+    """
+    authentication_classes = (CachedTokenAuthentication,)
+    permission_classes = (IsAuthenticated, IsVerifiedPromoter,)
+
+    def post(self, request, *args, **kwargs):
+        event = get_object_or_404(
+            Event, pk=kwargs['pk'], promoter_id=request.user.pk
+        )
+        queued = Ticket.objects.request_render(
+            Ticket.objects.filter(ticket_type__event=event)
+        )
+        return Response({'queued': queued}, status=status.HTTP_202_ACCEPTED)
+
+
 class ListTableRowView(generics.ListAPIView):
     """List table rows."""
+    read_replica = True
     serializer_class = TableRowSerializer
     filter_backends = (
         filters.DjangoFilterBackend,
@@ -733,7 +1399,7 @@ class ListTableRowView(generics.ListAPIView):
     def get_queryset(self):
         today = datetime.today()
         time = datetime.now().time()
-        return Artist.objects.all().annotate(
+        return Artist.objects.only('name', 'slug').annotate(
             event_count=Count(
                 Case(
                     When(Q(tallies__event__start_date__lt=today) | (
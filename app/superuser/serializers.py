@@ -3,7 +3,7 @@ from django.utils.translation import ugettext_lazy as _
 
 from rest_framework import serializers
 
-from core.models import Promoter
+from core.models import Promoter, CreditEntry
 
 
 class PasswordSerializer(serializers.ModelSerializer):
@@ -30,6 +30,17 @@ class CreditSerializer(serializers.ModelSerializer):
         model = get_user_model()
         fields = ('credit',)
 
+    def update(self, instance, validated_data):
+        """Record a credit adjustment and return the user."""
+        if 'credit' in validated_data:
+            CreditEntry.objects.adjust_credit(
+                instance,
+                validated_data['credit'],
+                description=self.context['request'].user.email
+            )
+            instance.refresh_from_db(fields=['credit'])
+        return instance
+
 
 class IsVerifiedSerializer(serializers.ModelSerializer):
     """Serializer for a user's credit."""
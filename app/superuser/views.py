@@ -4,11 +4,12 @@ from hashlib import sha256
 from django.contrib.auth import get_user_model
 from django.conf import settings
 
-from rest_framework import generics, authentication, permissions
+from rest_framework import generics, permissions
 from rest_framework.decorators import api_view, authentication_classes, \
                                       permission_classes
 from rest_framework.response import Response
 
+from core.authentication import CachedTokenAuthentication
 from core.email import Email
 from core.models import Promoter
 from superuser.permissions import IsSuperuserAndStaff
@@ -16,7 +17,7 @@ from superuser.serializers import PasswordSerializer, CreditSerializer, \
                                   IsVerifiedSerializer, StripeSerializer
 
 @api_view(['POST'])
-@authentication_classes((authentication.TokenAuthentication,))
+@authentication_classes((CachedTokenAuthentication,))
 @permission_classes((permissions.IsAuthenticated, IsSuperuserAndStaff,))
 def create_secret(request):
     """
@@ -39,7 +40,7 @@ def create_secret(request):
 
 class ManagePassword(generics.RetrieveUpdateAPIView):
     """Manage a user's password."""
-    authentication_classes = (authentication.TokenAuthentication,)
+    authentication_classes = (CachedTokenAuthentication,)
     permission_classes = (permissions.IsAuthenticated, IsSuperuserAndStaff,)
     serializer_class = PasswordSerializer
     lookup_field = 'email'
@@ -50,7 +51,7 @@ class ManagePassword(generics.RetrieveUpdateAPIView):
 
 class ManageCreditView(generics.RetrieveUpdateAPIView):
     """Manage a user's credit."""
-    authentication_classes = (authentication.TokenAuthentication,)
+    authentication_classes = (CachedTokenAuthentication,)
     permission_classes = (permissions.IsAuthenticated, IsSuperuserAndStaff,)
     serializer_class = CreditSerializer
 
@@ -60,7 +61,7 @@ class ManageCreditView(generics.RetrieveUpdateAPIView):
 
 class ManageVerificationView(generics.RetrieveUpdateAPIView):
     """Manage a promoter's verification status."""
-    authentication_classes = (authentication.TokenAuthentication,)
+    authentication_classes = (CachedTokenAuthentication,)
     permission_classes = (permissions.IsAuthenticated, IsSuperuserAndStaff,)
     serializer_class = IsVerifiedSerializer
 
@@ -70,7 +71,7 @@ class ManageVerificationView(generics.RetrieveUpdateAPIView):
 
 class ManageStripeView(generics.RetrieveUpdateAPIView):
     """Retrieve a user's Stripe IDs."""
-    authentication_classes = (authentication.TokenAuthentication,)
+    authentication_classes = (CachedTokenAuthentication,)
     permission_classes = (permissions.IsAuthenticated, IsSuperuserAndStaff,)
     serializer_class = StripeSerializer
 
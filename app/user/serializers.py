@@ -5,7 +5,9 @@ from django.template.defaultfilters import slugify
 from rest_framework import serializers
 from rest_framework.response import Response
 
-from core.models import Artist, Promoter, Message, ReadFlag, Ticket
+from core.images import ImageVariantsField
+from core.models import Artist, Promoter, Message, ReadFlag, Ticket, \
+                        PublicProfile
 
 
 class TokenSerializer(serializers.Serializer):
@@ -34,6 +36,7 @@ class TokenSerializer(serializers.Serializer):
 
 class UserSerializer(serializers.ModelSerializer):
     """Serializer for the user object."""
+    image_variants = ImageVariantsField()
 
     class Meta:
         model = get_user_model()
@@ -42,7 +45,8 @@ class UserSerializer(serializers.ModelSerializer):
             'is_artist', 'is_promoter', 'is_temporary', 'address_city',
             'address_country', 'address_line1', 'address_line2',
             'address_state', 'address_zip', 'facebook', 'instagram', 'phone',
-            'soundcloud', 'spotify', 'twitter', 'website', 'youtube', 'image'
+            'soundcloud', 'spotify', 'twitter', 'website', 'youtube', 'image',
+            'image_variants'
         )
         extra_kwargs = {
             'slug': {'read_only': True},
@@ -86,6 +90,7 @@ class TemporaryUserSerializer(serializers.ModelSerializer):
 
 class ArtistSerializer(serializers.ModelSerializer):
     """Serializer for the artist object."""
+    image_variants = ImageVariantsField()
 
     class Meta:
         model = Artist
@@ -93,7 +98,7 @@ class ArtistSerializer(serializers.ModelSerializer):
             'credit', 'email', 'id', 'password', 'name', 'slug',
             'is_artist', 'is_promoter', 'description', 'facebook', 'instagram',
             'phone', 'soundcloud', 'spotify', 'twitter', 'website', 'youtube',
-            'image'
+            'image', 'image_variants'
         )
         extra_kwargs = {
             'slug': {'read_only': True},
@@ -143,18 +148,20 @@ class PublicArtistSerializer(serializers.ModelSerializer):
     """Public serializer for the artist object."""
     event_count = serializers.IntegerField(read_only=True)
     points = serializers.IntegerField(read_only=True)
+    image_variants = ImageVariantsField()
 
     class Meta:
         model = Artist
         fields = (
             'name', 'slug', 'description', 'event_count', 'id', 'points',
             'facebook', 'instagram', 'soundcloud', 'spotify', 'twitter',
-            'website', 'youtube', 'image'
+            'website', 'youtube', 'image', 'image_variants'
         )
 
 
 class PromoterSerializer(serializers.ModelSerializer):
     """Serializer for the promoter object."""
+    image_variants = ImageVariantsField()
 
     class Meta:
         model = Promoter
@@ -164,7 +171,7 @@ class PromoterSerializer(serializers.ModelSerializer):
             'address_country', 'address_line1', 'address_line2',
             'address_state', 'address_zip', 'description', 'facebook',
             'instagram', 'phone', 'soundcloud', 'spotify', 'twitter',
-            'website', 'youtube', 'image'
+            'website', 'youtube', 'image', 'image_variants'
         )
         extra_kwargs = {
             'slug': {'read_only': True},
@@ -191,12 +198,28 @@ class PromoterSerializer(serializers.ModelSerializer):
 
 class PublicPromoterSerializer(serializers.ModelSerializer):
     """Public serializer for the promoter object."""
+    image_variants = ImageVariantsField()
 
     class Meta:
         model = Promoter
         fields = (
             'name', 'slug', 'description', 'id', 'facebook', 'instagram',
-            'soundcloud', 'spotify', 'twitter', 'website', 'youtube', 'image'
+            'soundcloud', 'spotify', 'twitter', 'website', 'youtube', 'image',
+            'image_variants'
+        )
+
+
+class PublicProfileSerializer(serializers.ModelSerializer):
+    """Public serializer for the artist and promoter profiles."""
+    id = serializers.IntegerField(source='pk', read_only=True)
+    image_variants = ImageVariantsField()
+
+    class Meta:
+        model = PublicProfile
+        fields = (
+            'name', 'slug', 'description', 'id', 'facebook', 'instagram',
+            'soundcloud', 'spotify', 'twitter', 'website', 'youtube', 'image',
+            'image_variants'
         )
 
 
@@ -206,7 +229,10 @@ class MessageSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Message
-        fields = ('created_date', 'created_time', 'sender', 'subject', 'text')
+        fields = (
+            'created_at', 'created_date', 'created_time', 'sender', 'subject',
+            'text'
+        )
         extra_kwargs = {
             'sender': {'read_only': True},
         }
@@ -0,0 +1,90 @@
+from datetime import datetime
+from unittest.mock import patch
+
+import pytz
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from core.models import Message, ReadFlag
+
+
+LIST_MESSAGES_URL = reverse(
+    'user:list-messages', kwargs={'version': 'v1', 'filter': 'all'}
+)
+
+
+class PrivateMessageApiTests(TestCase):
+    """Test the message API (private)."""
+
+    def setUp(self):
+        with patch('core.models.Email'):
+            self.user = get_user_model().objects.create_user(
+                email='test@test.com', password='testpass', name='test user'
+            )
+        for subject, created_at in (
+            ('before', datetime(2020, 1, 1, 23, 59, 59)),
+            ('during', datetime(2020, 1, 2, 0, 0, 0)),
+            ('late', datetime(2020, 1, 2, 23, 59, 59)),
+            ('after', datetime(2020, 1, 3, 0, 0, 0)),
+        ):
+            message = Message.objects.create_message(
+                subject=subject, text='test text'
+            )
+            Message.objects.filter(pk=message.pk).update(
+                created_at=pytz.utc.localize(created_at)
+            )
+            ReadFlag.objects.create(message=message, recipient=self.user)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def subjects(self, params):
+        res = self.client.get(LIST_MESSAGES_URL, params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return [message['subject'] for message in res.data]
+
+    def test_filter_created_date(self):
+        """Test that the legacy date filters match whole days."""
+        self.assertEqual(
+            self.subjects({'created_date': '2020-01-02'}), ['during', 'late']
+        )
+        self.assertEqual(
+            self.subjects({'created_date__gt': '2020-01-02'}), ['after']
+        )
+        self.assertEqual(
+            self.subjects({'created_date__lt': '2020-01-02'}), ['before']
+        )
+
+    def test_filter_created_date_invalid(self):
+        """Test that a date that is not a date is rejected."""
+        res = self.client.get(LIST_MESSAGES_URL, {'created_date': 'abc'})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_filter_created_date_range(self):
+        """Test that the legacy date range matches whole days."""
+        self.assertEqual(
+            self.subjects({
+                'created_date__range_after': '2020-01-01',
+                'created_date__range_before': '2020-01-02',
+            }),
+            ['before', 'during', 'late']
+        )
+        self.assertEqual(
+            self.subjects({'created_date__range_after': '2020-01-03'}),
+            ['after']
+        )
+
+    def test_ordering_created_date(self):
+        """Test that the legacy ordering fields sort by 'created_at'."""
+        self.assertEqual(
+            self.subjects({'ordering': '-created_date'}),
+            ['after', 'late', 'during', 'before']
+        )
+        self.assertEqual(
+            self.subjects({'ordering': 'created_time'}),
+            ['before', 'during', 'late', 'after']
+        )
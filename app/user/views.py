@@ -1,23 +1,27 @@
-from datetime import datetime
+from datetime import datetime, timedelta
 
 from django_filters import rest_framework as filters
 from django.contrib.auth import get_user_model
 from django.db.models import Count, Sum, Q, F, Case, When, IntegerField
+from django.utils import timezone
 
 from rest_framework import filters as rest_filters
-from rest_framework import generics, authentication, permissions, viewsets, \
+from rest_framework import generics, permissions, viewsets, \
                            mixins, status
 from rest_framework.authtoken.views import ObtainAuthToken
 from rest_framework.settings import api_settings
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 
-from core.models import Artist, Promoter, Message, ReadFlag, Event, Tally
+from core.authentication import CachedTokenAuthentication
+from core.models import PUBLIC_PROFILE_FIELDS, Artist, Message, ReadFlag, \
+                        Event, Tally, PublicProfile, Promoter
+from core.search import RankedSearchFilter
 from user.serializers import UserSerializer, TemporaryUserSerializer, \
                              TokenSerializer, ArtistSerializer, \
                              InviteArtistSerializer, PromoterSerializer, \
                              PublicArtistSerializer, \
-                             PublicPromoterSerializer, MessageSerializer, \
+                             PublicProfileSerializer, MessageSerializer, \
                              ReadFlagSerializer
 
 @api_view(['POST'])
@@ -74,7 +78,7 @@ class CreatePromoterView(generics.CreateAPIView):
 
 class CreateMessageView(generics.CreateAPIView):
     """Create a new message."""
-    authentication_classes = (authentication.TokenAuthentication,)
+    authentication_classes = (CachedTokenAuthentication,)
     permission_classes = (permissions.IsAuthenticated,)
     serializer_class = MessageSerializer
 
@@ -84,17 +88,19 @@ class CreateMessageView(generics.CreateAPIView):
 
 class CreateReadFlagView(generics.CreateAPIView):
     """Create a new read flag."""
-    authentication_classes = (authentication.TokenAuthentication,)
+    authentication_classes = (CachedTokenAuthentication,)
     permission_classes = (permissions.IsAuthenticated,)
     serializer_class = ReadFlagSerializer
 
 
 class ManageUserView(generics.RetrieveUpdateDestroyAPIView):
     """Manage the authenticated user."""
-    authentication_classes = (authentication.TokenAuthentication,)
+    authentication_classes = (CachedTokenAuthentication,)
     permission_classes = (permissions.IsAuthenticated,)
 
     def get_serializer_class(self):
+        if getattr(self, 'swagger_fake_view', False):
+            return UserSerializer
         if self.request.user.is_artist:
             serializer_class = ArtistSerializer
         elif self.request.user.is_promoter:
@@ -104,23 +110,26 @@ class ManageUserView(generics.RetrieveUpdateDestroyAPIView):
         return serializer_class
 
     def get_object(self):
+        # The authenticated user only has the fields authentication needs.
+        pk = self.request.user.pk
         if self.request.user.is_artist:
-            return self.request.user.artist
+            return Artist.objects.get(pk=pk)
         elif self.request.user.is_promoter:
-            return self.request.user.promoter
+            return Promoter.objects.get(pk=pk)
         else:
-            return self.request.user
+            return get_user_model().objects.get(pk=pk)
 
 
 class RetrieveArtistView(generics.RetrieveAPIView):
     """Retrieve an artist."""
+    read_replica = True
     serializer_class = PublicArtistSerializer
     lookup_field = 'slug'
 
     def get_queryset(self):
         today = datetime.today()
         time = datetime.now().time()
-        return Artist.objects.all().annotate(
+        return Artist.objects.only(*PUBLIC_PROFILE_FIELDS).annotate(
             event_count=Count(
                 Case(
                     When(Q(tallies__event__start_date__lt=today) | (
@@ -145,14 +154,17 @@ class RetrieveArtistView(generics.RetrieveAPIView):
 
 class RetrievePromoterView(generics.RetrieveAPIView):
     """Retrieve a promoter."""
-    queryset = Promoter.objects.filter(is_verified=True)
-    serializer_class = PublicPromoterSerializer
+    read_replica = True
+    queryset = PublicProfile.objects.filter(
+        is_promoter=True, is_verified=True
+    )
+    serializer_class = PublicProfileSerializer
     lookup_field = 'slug'
 
 
 class RetrieveMessageView(generics.RetrieveAPIView):
     """Retrieve a message."""
-    authentication_classes = (authentication.TokenAuthentication,)
+    authentication_classes = (CachedTokenAuthentication,)
     permission_classes = (permissions.IsAuthenticated,)
     serializer_class = MessageSerializer
 
@@ -171,10 +183,12 @@ class ArtistFilter(filters.FilterSet):
         field_name='description', lookup_expr='icontains'
     )
     name = filters.CharFilter(field_name='name', lookup_expr='icontains')
-    tallies = filters.ModelChoiceFilter(queryset=Tally.objects.all())
+    tallies = filters.ModelChoiceFilter(
+        field_name='user__artist__tallies', queryset=Tally.objects.all()
+    )
 
     class Meta:
-        model = Artist
+        model = PublicProfile
         fields = ['description', 'name', 'tallies']
 
 
@@ -183,27 +197,39 @@ class PromoterFilter(filters.FilterSet):
     description = filters.CharFilter(
         field_name='description', lookup_expr='icontains'
     )
-    events = filters.ModelChoiceFilter(queryset=Event.objects.all())
+    events = filters.ModelChoiceFilter(
+        field_name='user__promoter__events', queryset=Event.objects.all()
+    )
     name = filters.CharFilter(field_name='name', lookup_expr='icontains')
 
     class Meta:
-        model = Promoter
+        model = PublicProfile
         fields = ['description', 'name', 'events']
 
 
+def start_of_day(value):
+    """The first moment of a date in the current time zone."""
+    return timezone.make_aware(datetime.combine(value, datetime.min.time()))
+
+
 class MessageFilter(filters.FilterSet):
     """Defines the filter fields for ListMessageView."""
-    created_date = filters.DateFilter(
-        field_name='created_date', lookup_expr='exact'
+    created_at__gt = filters.IsoDateTimeFilter(
+        field_name='created_at', lookup_expr='gt'
     )
-    created_date__gt = filters.DateFilter(
-        field_name='created_date', lookup_expr='gt'
+    created_at__lt = filters.IsoDateTimeFilter(
+        field_name='created_at', lookup_expr='lt'
     )
-    created_date__lt = filters.DateFilter(
-        field_name='created_date', lookup_expr='lt'
+    created_at__range = filters.IsoDateTimeFromToRangeFilter(
+        field_name='created_at'
     )
-    created_date__range = filters.DateFilter(
-        field_name='created_date', lookup_expr='range'
+    # Legacy filters. Dates become ranges on the indexed 'created_at'; a
+    # time of day has no such range, so it stays on 'created_time'.
+    created_date = filters.DateFilter(method='filter_created_date')
+    created_date__gt = filters.DateFilter(method='filter_created_date')
+    created_date__lt = filters.DateFilter(method='filter_created_date')
+    created_date__range = filters.DateFromToRangeFilter(
+        method='filter_created_date_range'
     )
     created_time = filters.TimeFilter(
         field_name='created_time', lookup_expr='exact'
@@ -225,54 +251,107 @@ class MessageFilter(filters.FilterSet):
         field_name='text', lookup_expr='icontains'
     )
 
+    def filter_created_date(self, queryset, name, value):
+        """Filter by the day 'created_at' falls on, in the current zone."""
+        start = start_of_day(value)
+        end = start_of_day(value + timedelta(days=1))
+        if name.endswith('__gt'):
+            return queryset.filter(created_at__gte=end)
+        if name.endswith('__lt'):
+            return queryset.filter(created_at__lt=start)
+        return queryset.filter(created_at__gte=start, created_at__lt=end)
+
+    def filter_created_date_range(self, queryset, name, value):
+        """Filter by the days from 'after' to 'before', both included."""
+        if value.start is not None:
+            queryset = queryset.filter(
+                created_at__gte=start_of_day(value.start)
+            )
+        if value.stop is not None:
+            queryset = queryset.filter(
+                created_at__lt=start_of_day(value.stop + timedelta(days=1))
+            )
+        return queryset
+
     class Meta:
         model = Message
         fields = [
-            'created_date', 'created_time', 'sender', 'subject', 'text'
+            'created_at', 'created_date', 'created_time', 'sender', 'subject',
+            'text'
         ]
 
 
 class ListArtistView(generics.ListAPIView):
     """List artists."""
-    queryset = Artist.objects.all().order_by('name')
-    serializer_class = PublicArtistSerializer
+    read_replica = True
+    queryset = PublicProfile.objects.filter(is_artist=True).order_by('name')
+    serializer_class = PublicProfileSerializer
     filter_backends = (
         filters.DjangoFilterBackend,
-        rest_filters.SearchFilter,
+        RankedSearchFilter,
         rest_filters.OrderingFilter,
     )
     filterset_class = ArtistFilter
-    search_fields = ('description', 'name')
+    search_fields = ('name', 'description')
+    trigram_fields = ('name',)
     ordering_fields = ('description', 'name')
 
 
 class ListPromoterView(generics.ListAPIView):
     """List promoters."""
-    queryset = Promoter.objects.filter(is_verified=True).order_by('name')
-    serializer_class = PublicPromoterSerializer
+    read_replica = True
+    queryset = PublicProfile.objects.filter(
+        is_promoter=True, is_verified=True
+    ).order_by('name')
+    serializer_class = PublicProfileSerializer
     filter_backends = (
         filters.DjangoFilterBackend,
-        rest_filters.SearchFilter,
+        RankedSearchFilter,
         rest_filters.OrderingFilter,
     )
     filterset_class = PromoterFilter
-    search_fields = ('description', 'name')
+    search_fields = ('name', 'description')
+    trigram_fields = ('name',)
     ordering_fields = ('description', 'name')
 
 
+class MessageOrderingFilter(rest_filters.OrderingFilter):
+    """
+    Accepts the legacy 'created_date' and 'created_time' ordering fields,
+    which now sort by 'created_at'.
+    """
+    aliases = {'created_date': 'created_at', 'created_time': 'created_at'}
+
+    def get_ordering(self, request, queryset, view):
+        params = request.query_params.get(self.ordering_param)
+        if params:
+            fields = []
+            for param in params.split(','):
+                field = param.strip()
+                prefix = '-' if field.startswith('-') else ''
+                field = field.lstrip('-')
+                fields.append(prefix + self.aliases.get(field, field))
+            ordering = self.remove_invalid_fields(
+                queryset, fields, view, request
+            )
+            if ordering:
+                return ordering
+        return self.get_default_ordering(view)
+
+
 class ListMessageView(generics.ListAPIView):
     """List messages."""
-    authentication_classes = (authentication.TokenAuthentication,)
+    authentication_classes = (CachedTokenAuthentication,)
     permission_classes = (permissions.IsAuthenticated,)
     serializer_class = MessageSerializer
     filter_backends = (
         filters.DjangoFilterBackend,
         rest_filters.SearchFilter,
-        rest_filters.OrderingFilter,
+        MessageOrderingFilter,
     )
     filterset_class = MessageFilter
-    search_fields = ('created_date', 'created_time', 'subject', 'text')
-    ordering_fields = ('created_date', 'created_time', 'subject', 'text')
+    search_fields = ('subject', 'text')
+    ordering_fields = ('created_at', 'subject', 'text')
 
     def get_queryset(self):
         if self.kwargs['filter'] == 'read':
@@ -284,9 +363,9 @@ class ListMessageView(generics.ListAPIView):
         if filter is None:
             return Message.objects.filter(
                 readflags__recipient=self.request.user
-            ).order_by('pk')
+            ).order_by('created_at', 'pk')
         else:
             return Message.objects.filter(
                 readflags__opened=filter,
                 readflags__recipient=self.request.user
-            ).order_by('pk')
+            ).order_by('created_at', 'pk')
@@ -0,0 +1,37 @@
+#!/bin/bash
+# Compare request throughput of the old serving setup (one sync worker,
+# no preload, a new database connection per request) against the
+# settings in app/app/gunicorn.py.
+# Usage: ./bench-server.sh [path] [concurrency] [requests]
+# Run it where the app's database is reachable, e.g. inside the web
+# container: docker-compose exec web sh /home/bench-server.sh
+
+path=${1:-/v1/league/list/events/}
+concurrency=${2:-50}
+requests=${3:-2000}
+port=8099
+url="http://127.0.0.1:$port$path"
+
+cd "$(dirname "$0")/app" 2>/dev/null || cd /home/app
+
+bench() {
+  # Start gunicorn, wait for it to answer, then load test it.
+  gunicorn "$@" app.wsgi -b 127.0.0.1:$port > /tmp/bench-gunicorn.log 2>&1 &
+  pid=$!
+  for _ in $(seq 30); do
+    curl -s -o /dev/null "$url" && break
+    sleep 1
+  done
+  python manage.py loadtest "$url" --concurrency "$concurrency" --requests "$requests"
+  kill $pid
+  wait $pid 2>/dev/null
+}
+
+echo "Baseline: gunicorn app.wsgi (1 sync worker, CONN_MAX_AGE=0)"
+DB_CONN_MAX_AGE=0 bench --workers 1
+
+echo "Tuned: gunicorn -c app/gunicorn.py (gthread, persistent connections)"
+bench -c app/gunicorn.py
+
+echo "Tuned: gunicorn -c app/gunicorn.py (gevent, CONN_MAX_AGE=0)"
+GUNICORN_WORKER_CLASS=gevent bench -c app/gunicorn.py